@@ -63,6 +63,20 @@ class ProviderTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             'comments': 'New comments',
         }
 
+    def test_bulk_import_conflicting_rows(self):
+        csv_data = (
+            "name,slug",
+            "Provider 7,provider-7",
+            "Provider 7,provider-8",
+        )
+        self.add_permissions('circuits.add_provider')
+
+        # Rows which conflict with one another should be reported as they would be when saved individually
+        response = self.client.post(self._get_url('import'), {'csv': '\n'.join(csv_data)})
+        self.assertHttpStatus(response, 200)
+        self.assertIn('Row 2 name', response.content.decode())
+        self.assertFalse(Provider.objects.filter(name='Provider 7').exists())
+
 
 class CircuitTypeTestCase(ViewTestCases.OrganizationalObjectViewTestCase):
     model = CircuitType
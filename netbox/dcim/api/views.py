@@ -1,19 +1,25 @@
 import socket
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, transaction
 from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
 from drf_yasg.openapi import Parameter
 from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.routers import APIRootView
 from rest_framework.viewsets import ViewSet
 
 from circuits.models import Circuit
 from dcim import filtersets
+from dcim.choices import DeviceFaceChoices
 from dcim.models import *
+from dcim.provisioning import provision_devices
 from extras.api.views import ConfigContextQuerySetMixin
 from ipam.models import Prefix, VLAN
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
@@ -413,6 +419,80 @@ class DeviceViewSet(ConfigContextQuerySetMixin, NetBoxModelViewSet):
 
         return serializers.DeviceWithConfigContextSerializer
 
+    @swagger_auto_schema(
+        request_body=serializers.DeviceSerializer(many=True),
+        responses={'201': serializers.DeviceSerializer(many=True)}
+    )
+    @action(detail=False, methods=['post'])
+    def provision(self, request):
+        """
+        Create many Devices at once, along with the components defined by their DeviceTypes. Accepts a list of Devices
+        in the same format as a bulk creation request.
+        """
+        serializer = serializers.DeviceSerializer(data=request.data, many=True, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+
+        # Devices are validated independently, so check for any conflicts among them
+        self._validate_provision_conflicts(serializer.validated_data)
+
+        devices = []
+        tags = []
+        for data in serializer.validated_data:
+            data = dict(data)
+            tags.append(data.pop('tags', None) or [])
+            devices.append(Device(**data))
+
+        try:
+            with transaction.atomic():
+                devices = provision_devices(devices, tags=tags)
+                self._validate_objects(devices)
+        except IntegrityError as e:
+            raise ValidationError(str(e))
+        except ObjectDoesNotExist:
+            raise PermissionDenied()
+
+        serializer = serializers.DeviceSerializer(devices, many=True, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @staticmethod
+    def _validate_provision_conflicts(validated_data):
+        """
+        Check that no two of the Devices being provisioned share a name, occupy the same rack units, or claim the
+        same virtual chassis position.
+        """
+        names = set()
+        rack_units = defaultdict(set)
+        vc_positions = set()
+
+        for data in validated_data:
+            key = (data['site'], data.get('tenant'), data.get('name'))
+            if key[2] and key in names:
+                raise ValidationError(f"Duplicate device name: {key[2]}")
+            names.add(key)
+
+            rack, position, device_type = data.get('rack'), data.get('position'), data['device_type']
+            if rack and position and device_type.u_height:
+                # Full-depth devices occupy both faces of the rack
+                if device_type.is_full_depth:
+                    faces = (DeviceFaceChoices.FACE_FRONT, DeviceFaceChoices.FACE_REAR)
+                else:
+                    faces = (data.get('face'),)
+                units = set(range(position, position + device_type.u_height))
+                for face in faces:
+                    if rack_units[(rack.pk, face)] & units:
+                        raise ValidationError(
+                            f"U{position} of rack {rack} is occupied by another device in this request"
+                        )
+                    rack_units[(rack.pk, face)] |= units
+
+            if data.get('virtual_chassis') and data.get('vc_position') is not None:
+                key = (data['virtual_chassis'].pk, data['vc_position'])
+                if key in vc_positions:
+                    raise ValidationError(
+                        f"Duplicate position {data['vc_position']} in virtual chassis {data['virtual_chassis']}"
+                    )
+                vc_positions.add(key)
+
     @swagger_auto_schema(
         manual_parameters=[
             Parameter(
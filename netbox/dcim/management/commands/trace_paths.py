@@ -1,10 +1,12 @@
+import multiprocessing
+
 from django.core.management.base import BaseCommand
 from django.core.management.color import no_style
-from django.db import connection
+from django.db import connection, connections
 from django.db.models import Q
 
 from dcim.models import CablePath, ConsolePort, ConsoleServerPort, Interface, PowerFeed, PowerOutlet, PowerPort
-from dcim.signals import create_cablepath
+from dcim.tracing import PathTracer
 
 ENDPOINT_MODELS = (
     ConsolePort,
@@ -15,6 +17,19 @@ ENDPOINT_MODELS = (
     PowerPort
 )
 
+# Number of origins traced per batch
+BATCH_SIZE = 1000
+
+
+def trace_batch(batch):
+    """
+    Trace and save the CablePaths for a batch of origins, given as a (model, PKs) tuple. Return the number of origins
+    processed.
+    """
+    model, pks = batch
+    PathTracer(model.objects.filter(pk__in=pks)).save()
+    return len(pks)
+
 
 class Command(BaseCommand):
     help = "Generate any missing cable paths among all cable termination objects in NetBox"
@@ -28,6 +43,10 @@ class Command(BaseCommand):
             "--no-input", action='store_true', dest='no_input',
             help="Do not prompt user for any input/confirmation"
         )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Number of worker processes to use for tracing paths (default: 1)"
+        )
 
     def draw_progress_bar(self, percentage):
         """
@@ -36,6 +55,20 @@ class Command(BaseCommand):
         bar_size = int(percentage / 5)
         self.stdout.write(f"\r  [{'#' * bar_size}{' ' * (20-bar_size)}] {int(percentage)}%", ending='')
 
+    def trace_batches(self, batches, workers):
+        """
+        Trace each batch of origins, yielding the number of origins processed as each batch completes.
+        """
+        if workers <= 1 or len(batches) <= 1:
+            for batch in batches:
+                yield trace_batch(batch)
+            return
+
+        # Close the database connection prior to forking so that each worker opens its own
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            yield from pool.imap_unordered(trace_batch, batches)
+
     def handle(self, *model_names, **options):
 
         # If --force was passed, first delete all existing CablePaths
@@ -74,17 +107,21 @@ class Command(BaseCommand):
             origins = model.objects.filter(params)
             if not options['force']:
                 origins = origins.filter(_path__isnull=True)
-            origins_count = origins.count()
+            origin_ids = list(origins.order_by('pk').values_list('pk', flat=True))
+            origins_count = len(origin_ids)
             if not origins_count:
                 self.stdout.write(f'Found no missing {model._meta.verbose_name} paths; skipping')
                 continue
             self.stdout.write(f'Retracing {origins_count} cabled {model._meta.verbose_name_plural}...')
+
+            # Trace paths in batches, optionally distributed among multiple worker processes
+            batches = [
+                (model, origin_ids[i:i + BATCH_SIZE]) for i in range(0, origins_count, BATCH_SIZE)
+            ]
             i = 0
-            for i, obj in enumerate(origins, start=1):
-                create_cablepath(obj)
-                if not i % 100:
-                    self.draw_progress_bar(i * 100 / origins_count)
-            self.draw_progress_bar(100)
+            for count in self.trace_batches(batches, options['workers']):
+                i += count
+                self.draw_progress_bar(i * 100 / origins_count)
             self.stdout.write(self.style.SUCCESS(f'\n  Retraced {i} {model._meta.verbose_name_plural}'))
 
         self.stdout.write(self.style.SUCCESS('Finished.'))
@@ -0,0 +1,19 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Build the index without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ('dcim', '0153_created_datetimefield'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='cablepath',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['path'], name='dcim_cablepath_path_gin'),
+        ),
+    ]
@@ -2,6 +2,7 @@ from collections import defaultdict
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db import models
 from django.db.models import Sum
@@ -10,7 +11,7 @@ from django.urls import reverse
 from dcim.choices import *
 from dcim.constants import *
 from dcim.fields import PathField
-from dcim.utils import decompile_path_node, object_to_path_node, path_node_to_object
+from dcim.utils import compile_path_node, decompile_path_node, object_to_path_node, path_node_to_object
 from netbox.models import NetBoxModel
 from utilities.fields import ColorField
 from utilities.utils import to_meters
@@ -357,6 +358,10 @@ class CablePath(models.Model):
 
     class Meta:
         unique_together = ('origin_type', 'origin_id')
+        indexes = (
+            # Enables efficient lookup of all paths which traverse a given object (path__contains)
+            GinIndex(fields=['path'], name='dcim_cablepath_path_gin'),
+        )
 
     def __str__(self):
         status = ' (active)' if self.is_active else ' (split)' if self.is_split else ''
@@ -466,9 +471,9 @@ class CablePath(models.Model):
         Return the path as a list of prefetched objects.
         """
         # Compile a list of IDs to prefetch for each type of model in the path
+        nodes = [decompile_path_node(node) for node in self.path]
         to_prefetch = defaultdict(list)
-        for node in self.path:
-            ct_id, object_id = decompile_path_node(node)
+        for ct_id, object_id in nodes:
             to_prefetch[ct_id].append(object_id)
 
         # Prefetch path objects using one query per model type. Prefetch related devices where appropriate.
@@ -483,12 +488,7 @@ class CablePath(models.Model):
             }
 
         # Replicate the path using the prefetched objects.
-        path = []
-        for node in self.path:
-            ct_id, object_id = decompile_path_node(node)
-            path.append(prefetched[ct_id][object_id])
-
-        return path
+        return [prefetched[ct_id][object_id] for ct_id, object_id in nodes]
 
     @property
     def last_node(self):
@@ -501,15 +501,12 @@ class CablePath(models.Model):
         """
         Return all Cable IDs within the path.
         """
-        cable_ct = ContentType.objects.get_for_model(Cable).pk
-        cable_ids = []
-
-        for node in self.path:
-            ct, id = decompile_path_node(node)
-            if ct == cable_ct:
-                cable_ids.append(id)
+        # Match nodes on their content type prefix (<ContentType ID>:) rather than decompiling each node
+        prefix = compile_path_node(ContentType.objects.get_for_model(Cable).pk, '')
 
-        return cable_ids
+        return [
+            int(node[len(prefix):]) for node in self.path if node.startswith(prefix)
+        ]
 
     def get_total_length(self):
         """
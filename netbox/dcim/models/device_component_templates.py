@@ -283,12 +283,11 @@ class PowerOutletTemplate(ModularComponentTemplateModel):
                     f"Parent power port ({self.power_port}) must belong to the same module type"
                 )
 
-    def instantiate(self, **kwargs):
-        if self.power_port:
+    def instantiate(self, power_port=None, **kwargs):
+        # Retrieve the assigned PowerPort, unless it has been provided
+        if power_port is None and self.power_port:
             power_port_name = self.power_port.resolve_name(kwargs.get('module'))
             power_port = PowerPort.objects.get(name=power_port_name, **kwargs)
-        else:
-            power_port = None
         return self.component_model(
             name=self.resolve_name(kwargs.get('module')),
             label=self.resolve_label(kwargs.get('module')),
@@ -394,12 +393,11 @@ class FrontPortTemplate(ModularComponentTemplateModel):
         except RearPortTemplate.DoesNotExist:
             pass
 
-    def instantiate(self, **kwargs):
-        if self.rear_port:
+    def instantiate(self, rear_port=None, **kwargs):
+        # Retrieve the assigned RearPort, unless it has been provided
+        if rear_port is None and self.rear_port:
             rear_port_name = self.rear_port.resolve_name(kwargs.get('module'))
             rear_port = RearPort.objects.get(name=rear_port_name, **kwargs)
-        else:
-            rear_port = None
         return self.component_model(
             name=self.resolve_name(kwargs.get('module')),
             label=self.resolve_label(kwargs.get('module')),
@@ -555,13 +553,13 @@ class InventoryItemTemplate(MPTTModel, ComponentTemplateModel):
         ordering = ('device_type__id', 'parent__id', '_name')
         unique_together = ('device_type', 'parent', 'name')
 
-    def instantiate(self, **kwargs):
-        parent = InventoryItem.objects.get(name=self.parent.name, **kwargs) if self.parent else None
-        if self.component:
+    def instantiate(self, parent=None, component=None, **kwargs):
+        # Retrieve the parent InventoryItem and assigned component, unless they have been provided
+        if parent is None and self.parent:
+            parent = InventoryItem.objects.get(name=self.parent.name, **kwargs)
+        if component is None and self.component:
             model = self.component.component_model
             component = model.objects.get(name=self.component.name, **kwargs)
-        else:
-            component = None
         return self.component_model(
             parent=parent,
             name=self.name,
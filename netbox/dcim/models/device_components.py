@@ -489,6 +489,9 @@ class BaseInterface(models.Model):
         verbose_name='Bridge interface'
     )
 
+    # Fields on which the side effects of save() depend (see netbox.bulk.supports_bulk_update())
+    bulk_update_unsafe_fields = ('mode', 'untagged_vlan')
+
     class Meta:
         abstract = True
 
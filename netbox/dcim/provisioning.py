@@ -0,0 +1,156 @@
+from collections import defaultdict
+
+from django.db.models import Max
+
+from netbox.bulk import BULK_BATCH_SIZE, bulk_create_objects
+from .models import DeviceType, InventoryItem, InventoryItemTemplate, PowerPort, RearPort
+
+__all__ = (
+    'instantiate_components',
+    'provision_devices',
+)
+
+# The relations from DeviceType to each type of component template, in the order in which their components are created.
+# (PowerPorts and RearPorts must be created before the PowerOutlets and FrontPorts which reference them.)
+COMPONENT_TEMPLATES = (
+    'consoleporttemplates',
+    'consoleserverporttemplates',
+    'powerporttemplates',
+    'poweroutlettemplates',
+    'interfacetemplates',
+    'rearporttemplates',
+    'frontporttemplates',
+    'modulebaytemplates',
+    'devicebaytemplates',
+)
+
+
+def get_component_templates(device_type_ids):
+    """
+    Retrieve the component templates belonging to the specified DeviceTypes, using a single query per type of
+    template. Returns a dictionary mapping each relation in COMPONENT_TEMPLATES (and 'inventoryitemtemplates') to a
+    dictionary of templates by DeviceType ID.
+    """
+    templates = {}
+    for relation in COMPONENT_TEMPLATES:
+        model = DeviceType._meta.get_field(relation).related_model
+        queryset = model.objects.filter(device_type__in=device_type_ids)
+        if relation == 'poweroutlettemplates':
+            queryset = queryset.select_related('power_port')
+        elif relation == 'frontporttemplates':
+            queryset = queryset.select_related('rear_port')
+        templates[relation] = defaultdict(list)
+        for template in queryset:
+            templates[relation][template.device_type_id].append(template)
+
+    templates['inventoryitemtemplates'] = defaultdict(list)
+    queryset = InventoryItemTemplate.objects.filter(device_type__in=device_type_ids).prefetch_related('component')
+    for template in queryset:
+        templates['inventoryitemtemplates'][template.device_type_id].append(template)
+
+    return templates
+
+
+def _instantiate_inventory_item(template, device, parent, children, components, tree_id, level, lft, items):
+    """
+    Instantiate an InventoryItem and (recursively) its children from an InventoryItemTemplate, numbering the MPTT
+    attributes of each item depth-first. Returns the `rght` value of the item.
+    """
+    component = None
+    if template.component is not None:
+        component = components[(template.component.component_model, device.pk, template.component.name)]
+    item = template.instantiate(device=device, parent=parent, component=component)
+    item.tree_id = tree_id
+    item.level = level
+    item.lft = lft
+    items[level].append(item)
+
+    rght = lft + 1
+    for child in children[template.pk]:
+        rght = _instantiate_inventory_item(
+            child, device, item, children, components, tree_id, level + 1, rght, items
+        ) + 1
+    item.rght = rght
+
+    return rght
+
+
+def _instantiate_inventory_items(devices, templates, components):
+    """
+    Create the InventoryItems for each device from its DeviceType's InventoryItemTemplates. Rather than saving each
+    item individually, the MPTT attributes of each item are computed in advance and the items are created in bulk, one
+    level of the trees at a time (so that each item's parent has been created before it). As when saving each item, an
+    ObjectChange is recorded and webhooks are enqueued for each.
+    """
+    next_tree_id = (InventoryItem.objects.aggregate(Max('tree_id'))['tree_id__max'] or 0) + 1
+    items = defaultdict(list)
+
+    for device in devices:
+        # Templates are ordered by name within each parent
+        children = defaultdict(list)
+        for template in templates[device.device_type_id]:
+            children[template.parent_id].append(template)
+
+        # Each root item begins a new tree
+        for template in children[None]:
+            _instantiate_inventory_item(template, device, None, children, components, next_tree_id, 0, 1, items)
+            next_tree_id += 1
+
+    # Record an ObjectChange and enqueue webhooks for each item, as saving it would
+    for level in sorted(items):
+        bulk_create_objects(items[level])
+
+
+def instantiate_components(devices):
+    """
+    Create all components of newly created Devices per their DeviceTypes' component templates. The templates of each
+    DeviceType are retrieved only once, and each type of component is created for all the devices at once.
+
+    :param devices: A list of Devices which have been saved but do not yet have any components
+    """
+    if not devices:
+        return
+    templates = get_component_templates({device.device_type_id for device in devices})
+
+    # Map created components by model, device, and name for reference by subsequent components and inventory items
+    components = {}
+
+    for relation in COMPONENT_TEMPLATES:
+        instances = []
+        for device in devices:
+            for template in templates[relation][device.device_type_id]:
+                kwargs = {}
+                if getattr(template, 'power_port_id', None):
+                    kwargs['power_port'] = components[(PowerPort, device.pk, template.power_port.name)]
+                elif getattr(template, 'rear_port_id', None):
+                    kwargs['rear_port'] = components[(RearPort, device.pk, template.rear_port.name)]
+                instances.append(template.instantiate(device=device, **kwargs))
+        if not instances:
+            continue
+
+        model = instances[0]._meta.model
+        for instance in model.objects.bulk_create(instances, batch_size=BULK_BATCH_SIZE):
+            components[(model, instance.device_id, instance.name)] = instance
+
+    _instantiate_inventory_items(devices, templates['inventoryitemtemplates'], components)
+
+
+def provision_devices(devices, tags=None):
+    """
+    Create many new Devices at once, along with all their components. This has the same effect as saving each Device
+    individually, but the Devices and their components are created in bulk.
+
+    Returns the list of created Devices.
+
+    :param devices: A list of new Devices, which must already have been validated
+    :param tags: A list of the tags to be assigned to each Device, in the same order as the Devices (optional)
+    """
+    # Inherit the airflow attribute from the DeviceType if not set (see Device.save())
+    for device in devices:
+        if not device.airflow:
+            device.airflow = device.device_type.airflow
+
+    devices = bulk_create_objects(devices, tags=tags)
+    instantiate_components(devices)
+
+    return devices
@@ -1,9 +1,9 @@
 import logging
 
-from django.contrib.contenttypes.models import ContentType
 from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 
+from extras.context_cache import invalidate_objects, invalidate_on_commit
 from .choices import LinkStatusChoices
 from .models import Cable, CablePath, Device, PathEndpoint, PowerPanel, Rack, Location, VirtualChassis
 from .utils import create_cablepath, rebuild_paths
@@ -24,6 +24,8 @@ def handle_location_site_change(instance, created, **kwargs):
         locations = instance.get_descendants(include_self=True).values_list('pk', flat=True)
         Rack.objects.filter(location__in=locations).update(site=instance.site)
         Device.objects.filter(location__in=locations).update(site=instance.site)
+        # Devices' cached config contexts are keyed on their last_updated time, which update() does not change
+        invalidate_on_commit(invalidate_objects, Device.objects.filter(location__in=locations))
         PowerPanel.objects.filter(location__in=locations).update(site=instance.site)
 
 
@@ -34,6 +36,7 @@ def handle_rack_site_change(instance, created, **kwargs):
     """
     if not created:
         Device.objects.filter(rack=instance).update(site=instance.site, location=instance.location)
+        invalidate_on_commit(invalidate_objects, Device.objects.filter(rack=instance))
 
 
 #
@@ -125,16 +128,5 @@ def nullify_connected_endpoints(instance, **kwargs):
         model = instance.termination_b._meta.model
         model.objects.filter(pk=instance.termination_b.pk).update(_link_peer_type=None, _link_peer_id=None)
 
-    # Delete and retrace any dependent cable paths
-    for cablepath in CablePath.objects.filter(path__contains=instance):
-        cp = CablePath.from_origin(cablepath.origin)
-        if cp:
-            CablePath.objects.filter(pk=cablepath.pk).update(
-                path=cp.path,
-                destination_type=ContentType.objects.get_for_model(cp.destination) if cp.destination else None,
-                destination_id=cp.destination.pk if cp.destination else None,
-                is_active=cp.is_active,
-                is_split=cp.is_split
-            )
-        else:
-            cablepath.delete()
+    # Retrace any dependent cable paths (paths which no longer originate from a connected endpoint are deleted)
+    rebuild_paths(instance)
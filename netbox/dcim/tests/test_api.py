@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
@@ -6,6 +7,8 @@ from rest_framework import status
 from dcim.choices import *
 from dcim.constants import *
 from dcim.models import *
+from extras.choices import ObjectChangeActionChoices
+from extras.models import ObjectChange
 from ipam.models import ASN, RIR, VLAN, VRF
 from utilities.testing import APITestCase, APIViewTestCases, create_test_device
 from virtualization.models import Cluster, ClusterType
@@ -1156,6 +1159,57 @@ class DeviceTest(APIViewTestCases.APIViewTestCase):
 
         self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
 
+    def test_provision_devices(self):
+        """
+        Check that Devices are created along with their components when provisioned in bulk.
+        """
+        device_type = DeviceType.objects.get(slug='device-type-2')
+        InterfaceTemplate.objects.create(device_type=device_type, name='Interface 1', type='1000base-t')
+        InventoryItemTemplate.objects.create(device_type=device_type, name='Chassis')
+        self.add_permissions('dcim.add_device')
+        url = reverse('dcim-api:device-provision')
+
+        response = self.client.post(url, self.create_data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), len(self.create_data))
+        for device_data in response.data:
+            device = Device.objects.get(pk=device_data['id'])
+            self.assertEqual(device.name, device_data['name'])
+            self.assertTrue(device.interfaces.filter(name='Interface 1').exists())
+
+        # A change should be recorded for each inventory item
+        self.assertEqual(
+            ObjectChange.objects.filter(
+                changed_object_type=ContentType.objects.get_for_model(InventoryItem),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            ).count(),
+            len(self.create_data)
+        )
+
+        # Duplicate names within the request should be rejected
+        response = self.client.post(url, [self.create_data[0], self.create_data[0]], format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_provision_devices_rack_unit_conflict(self):
+        """
+        Check that Devices occupying the same rack units within a single request are rejected.
+        """
+        self.add_permissions('dcim.add_device')
+        url = reverse('dcim-api:device-provision')
+        data = [
+            {**self.create_data[0], 'face': DeviceFaceChoices.FACE_FRONT, 'position': 1},
+            {**self.create_data[1], 'face': DeviceFaceChoices.FACE_REAR, 'position': 1},
+        ]
+
+        # Full-depth devices occupy both faces of the rack
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Device.objects.filter(name__in=['Test Device 4', 'Test Device 5']).exists())
+
+        DeviceType.objects.filter(slug='device-type-2').update(is_full_depth=False)
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
 
 class ModuleTest(APIViewTestCases.APIViewTestCase):
     model = Module
@@ -4,6 +4,7 @@ from django.test import TestCase
 from circuits.models import *
 from dcim.choices import LinkStatusChoices
 from dcim.models import *
+from dcim.tracing import PathTracer
 from dcim.utils import object_to_path_node
 
 
@@ -15,6 +16,7 @@ class CablePathTestCase(TestCase):
         1XX: Test direct connections between different endpoint types
         2XX: Test different cable topologies
         3XX: Test responses to changes in existing objects
+        4XX: Test bulk tracing of paths
     """
     @classmethod
     def setUpTestData(cls):
@@ -1175,3 +1177,111 @@ class CablePathTestCase(TestCase):
             is_active=True
         )
         self.assertEqual(CablePath.objects.count(), 2)
+
+    def test_401_trace_multiple_origins(self):
+        """
+        [IF1] --C1-- [FP1:1] [RP1] --C3-- [RP2] [FP2:1] --C4-- [IF3]
+        [IF2] --C2-- [FP1:2]                    [FP2:2] --C5-- [IF4]
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+        interface3 = Interface.objects.create(device=self.device, name='Interface 3')
+        interface4 = Interface.objects.create(device=self.device, name='Interface 4')
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=4)
+        rearport2 = RearPort.objects.create(device=self.device, name='Rear Port 2', positions=4)
+        frontport1_1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:1', rear_port=rearport1, rear_port_position=1
+        )
+        frontport1_2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:2', rear_port=rearport1, rear_port_position=2
+        )
+        frontport2_1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 2:1', rear_port=rearport2, rear_port_position=1
+        )
+        frontport2_2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 2:2', rear_port=rearport2, rear_port_position=2
+        )
+
+        cable1 = Cable(termination_a=interface1, termination_b=frontport1_1)
+        cable1.save()
+        cable2 = Cable(termination_a=interface2, termination_b=frontport1_2)
+        cable2.save()
+        cable3 = Cable(termination_a=rearport1, termination_b=rearport2)
+        cable3.save()
+        cable4 = Cable(termination_a=frontport2_1, termination_b=interface3)
+        cable4.save()
+        cable5 = Cable(termination_a=frontport2_2, termination_b=interface4)
+        cable5.save()
+        self.assertEqual(CablePath.objects.count(), 4)
+
+        # Compare the results of bulk tracing with those of tracing each origin individually
+        interfaces = Interface.objects.filter(pk__in=(interface1.pk, interface2.pk, interface3.pk, interface4.pk))
+        for origin, cablepath in PathTracer(interfaces).trace():
+            expected = CablePath.from_origin(origin)
+            self.assertEqual(cablepath.path, expected.path)
+            self.assertEqual(cablepath.destination, expected.destination)
+            self.assertEqual(cablepath.is_active, expected.is_active)
+            self.assertEqual(cablepath.is_split, expected.is_split)
+
+        # Delete all paths and recreate them in bulk
+        CablePath.objects.all().delete()
+        self.assertEqual(len(PathTracer(interfaces).save()), 4)
+        self.assertEqual(CablePath.objects.count(), 4)
+        path1 = self.assertPathExists(
+            origin=interface1,
+            destination=interface3,
+            path=(cable1, frontport1_1, rearport1, cable3, rearport2, frontport2_1, cable4),
+            is_active=True
+        )
+        path2 = self.assertPathExists(
+            origin=interface2,
+            destination=interface4,
+            path=(cable2, frontport1_2, rearport1, cable3, rearport2, frontport2_2, cable5),
+            is_active=True
+        )
+        interface1.refresh_from_db()
+        interface2.refresh_from_db()
+        self.assertPathIsSet(interface1, path1)
+        self.assertPathIsSet(interface2, path2)
+        self.assertEqual(path1.get_cable_ids(), [cable1.pk, cable3.pk, cable4.pk])
+        self.assertEqual(
+            path1.get_path(),
+            [cable1, frontport1_1, rearport1, cable3, rearport2, frontport2_1, cable4]
+        )
+
+        # Deleting the trunk cable should retrace all four paths, updating them in place
+        path_ids = set(CablePath.objects.values_list('pk', flat=True))
+        cable3.delete()
+        self.assertEqual(set(CablePath.objects.values_list('pk', flat=True)), path_ids)
+        self.assertPathExists(
+            origin=interface1,
+            destination=None,
+            path=(cable1, frontport1_1, rearport1),
+            is_active=False
+        )
+        self.assertPathExists(
+            origin=interface4,
+            destination=None,
+            path=(cable5, frontport2_2, rearport2),
+            is_active=False
+        )
+
+    def test_402_trace_missing_link_peer(self):
+        """
+        [IF1] --C1-- (missing)
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+        cable1 = Cable(termination_a=interface1, termination_b=interface2)
+        cable1.save()
+
+        # Reference a far-end termination which no longer exists
+        Interface.objects.filter(pk=interface1.pk).update(_link_peer_id=interface2.pk + 1000)
+        interface1.refresh_from_db()
+
+        origin, cablepath = PathTracer([interface1]).trace()[0]
+        expected = CablePath.from_origin(interface1)
+        self.assertEqual(cablepath.path, expected.path)
+        self.assertIsNone(cablepath.destination)
+        self.assertIsNone(expected.destination)
+        self.assertFalse(cablepath.is_active)
@@ -4,6 +4,7 @@ from django.test import TestCase
 from circuits.models import *
 from dcim.choices import *
 from dcim.models import *
+from dcim.provisioning import provision_devices
 from tenancy.models import Tenant
 
 
@@ -443,6 +444,47 @@ class DeviceTestCase(TestCase):
         device2.full_clean()
         device2.save()
 
+    def test_provision_devices(self):
+        """
+        Ensure that components and inventory items are created for each Device when provisioning Devices in bulk.
+        """
+        interface_template = InterfaceTemplate.objects.get(device_type=self.device_type, name='Interface 1')
+        parent_template = InventoryItemTemplate.objects.create(device_type=self.device_type, name='Chassis')
+        InventoryItemTemplate.objects.create(
+            device_type=self.device_type,
+            parent=parent_template,
+            name='Transceiver 1',
+            component=interface_template
+        )
+
+        devices = provision_devices([
+            Device(site=self.site, device_type=self.device_type, device_role=self.device_role, name=f'Device {i}')
+            for i in range(1, 4)
+        ])
+
+        for device in devices:
+            self.assertEqual(device.airflow, self.device_type.airflow)
+            pp = PowerPort.objects.get(device=device, name='Power Port 1')
+            PowerOutlet.objects.get(device=device, name='Power Outlet 1', power_port=pp)
+            rp = RearPort.objects.get(device=device, name='Rear Port 1')
+            FrontPort.objects.get(device=device, name='Front Port 1', rear_port=rp)
+            interface = Interface.objects.get(device=device, name='Interface 1')
+
+            # Validate the inventory item tree
+            parent = InventoryItem.objects.get(device=device, name='Chassis')
+            child = InventoryItem.objects.get(device=device, name='Transceiver 1')
+            self.assertEqual(child.parent, parent)
+            self.assertEqual(child.component, interface)
+            self.assertEqual(list(parent.get_descendants()), [child])
+            self.assertEqual((parent.lft, parent.rght, parent.level), (1, 4, 0))
+            self.assertEqual((child.lft, child.rght, child.level), (2, 3, 1))
+
+        # Each Device's inventory items form a separate tree
+        self.assertEqual(
+            InventoryItem.objects.filter(parent__isnull=True).values('tree_id').distinct().count(),
+            len(devices)
+        )
+
 
 class CableTestCase(TestCase):
 
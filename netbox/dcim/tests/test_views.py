@@ -769,7 +769,7 @@ inventory-items:
         # Test default YAML export
         response = self.client.get(f'{url}?export')
         self.assertEqual(response.status_code, 200)
-        data = list(yaml.load_all(response.content, Loader=yaml.SafeLoader))
+        data = list(yaml.load_all(b''.join(response.streaming_content), Loader=yaml.SafeLoader))
         self.assertEqual(len(data), 3)
         self.assertEqual(data[0]['manufacturer'], 'Manufacturer 1')
         self.assertEqual(data[0]['model'], 'Device Type 1')
@@ -1063,7 +1063,7 @@ front-ports:
         # Test default YAML export
         response = self.client.get(f'{url}?export')
         self.assertEqual(response.status_code, 200)
-        data = list(yaml.load_all(response.content, Loader=yaml.SafeLoader))
+        data = list(yaml.load_all(b''.join(response.streaming_content), Loader=yaml.SafeLoader))
         self.assertEqual(len(data), 3)
         self.assertEqual(data[0]['manufacturer'], 'Manufacturer 1')
         self.assertEqual(data[0]['model'], 'Module Type 1')
@@ -0,0 +1,302 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from circuits.models import CircuitTermination, ProviderNetwork
+from wireless.models import WirelessLink
+from .choices import LinkStatusChoices
+from .models import Cable, CablePath, FrontPort, RearPort, Site
+from .utils import object_to_path_node
+
+__all__ = (
+    'PathTracer',
+)
+
+# Maximum number of CablePaths written per query
+BULK_BATCH_SIZE = 500
+
+
+class Trace:
+    """
+    The state of a CablePath being traced from a single origin.
+    """
+    def __init__(self, origin):
+        self.origin = origin
+        self.node = origin
+        self.path = []
+        self.position_stack = []
+        self.destination = None
+        self.destination_type = None
+        self.destination_id = None
+        self.is_active = True
+        self.is_split = False
+
+    def set_destination(self, obj=None, model=None, pk=None):
+        if obj is not None:
+            self.destination = obj
+        else:
+            self.destination_type = ContentType.objects.get_for_model(model)
+            self.destination_id = pk
+
+    def to_cablepath(self):
+        """
+        Return an unsaved CablePath representing the completed trace, or None if the origin is not connected.
+        """
+        if not self.path:
+            return None
+
+        cablepath = CablePath(
+            origin=self.origin,
+            path=self.path,
+            is_split=self.is_split
+        )
+        if self.destination is not None:
+            cablepath.destination = self.destination
+        else:
+            cablepath.destination_type = self.destination_type
+            cablepath.destination_id = self.destination_id
+        cablepath.is_active = self.is_active and cablepath.destination_id is not None
+
+        return cablepath
+
+
+class PathTracer:
+    """
+    Trace the CablePaths originating from many PathEndpoints at once. Whereas CablePath.from_origin() queries the
+    database for each hop of a single path, the PathTracer advances all paths by one hop at a time, loading the links,
+    far-end terminations, and pass-through ports needed for each hop in bulk. Objects are cached for the lifetime of
+    the tracer, so that segments shared by many paths (e.g. a trunk between patch panels) are fetched only once.
+
+    The resulting CablePaths are written to the database by save(), updating existing paths in place.
+
+    :param origins: An iterable of PathEndpoint instances
+    """
+    def __init__(self, origins):
+        # Discard any duplicate origins
+        origins = {(origin._meta.model, origin.pk): origin for origin in origins}
+        self.traces = [Trace(origin) for origin in origins.values()]
+        self._objects = defaultdict(dict)
+        self._front_ports = {}
+        self._circuit_terminations = {}
+
+    #
+    # Object caching
+    #
+
+    def _fetch(self, model, pks):
+        """
+        Load all instances of the given model with the specified PKs which have not already been cached.
+        """
+        cache = self._objects[model]
+        missing = {pk for pk in pks if pk is not None and pk not in cache}
+        if missing:
+            for obj in model.objects.filter(pk__in=missing):
+                cache[obj.pk] = obj
+
+    def _get(self, model, pk):
+        return self._objects[model].get(pk)
+
+    def _fetch_front_ports(self, rear_port_ids):
+        """
+        Load and index all FrontPorts mapped to the specified RearPorts by (rear port ID, position).
+        """
+        missing = {pk for pk in rear_port_ids if pk not in self._front_ports}
+        if missing:
+            for rear_port_id in missing:
+                self._front_ports[rear_port_id] = {}
+            for front_port in FrontPort.objects.filter(rear_port_id__in=missing):
+                self._front_ports[front_port.rear_port_id][front_port.rear_port_position] = front_port
+                self._objects[FrontPort][front_port.pk] = front_port
+
+    def _fetch_circuit_terminations(self, circuit_ids):
+        """
+        Load and index all CircuitTerminations belonging to the specified Circuits by term side.
+        """
+        missing = {pk for pk in circuit_ids if pk not in self._circuit_terminations}
+        if missing:
+            for circuit_id in missing:
+                self._circuit_terminations[circuit_id] = {}
+            for termination in CircuitTermination.objects.filter(circuit_id__in=missing):
+                self._circuit_terminations[termination.circuit_id][termination.term_side] = termination
+
+    def _get_link(self, node):
+        """
+        Return the Cable or WirelessLink attached to the node (equivalent to node.link).
+        """
+        if node.cable_id:
+            return self._get(Cable, node.cable_id)
+        if getattr(node, 'wireless_link_id', None):
+            return self._get(WirelessLink, node.wireless_link_id)
+        return None
+
+    def _get_link_peer(self, node):
+        """
+        Return the far-end termination of the node's link (equivalent to node.get_link_peer()).
+        """
+        if node._link_peer_type_id is None:
+            return None
+        model = ContentType.objects.get_for_id(node._link_peer_type_id).model_class()
+        return self._get(model, node._link_peer_id)
+
+    #
+    # Tracing
+    #
+
+    def _step(self, traces):
+        """
+        Advance each of the given traces by one link. Return the traces which have not yet completed.
+        """
+        # Fetch the link attached to each node
+        self._fetch(Cable, [t.node.cable_id for t in traces])
+        self._fetch(WirelessLink, [getattr(t.node, 'wireless_link_id', None) for t in traces])
+
+        linked_traces = []
+        for t in traces:
+            link = self._get_link(t.node)
+            if link is None:
+                continue
+            if link.status != LinkStatusChoices.STATUS_CONNECTED:
+                t.is_active = False
+            t.path.append(object_to_path_node(link))
+            linked_traces.append(t)
+
+        # Fetch the far-end termination of each link
+        peer_ids = defaultdict(set)
+        for t in linked_traces:
+            if t.node._link_peer_type_id is not None:
+                peer_ids[t.node._link_peer_type_id].add(t.node._link_peer_id)
+        for ct_id, pks in peer_ids.items():
+            self._fetch(ContentType.objects.get_for_id(ct_id).model_class(), pks)
+        peers = [(t, self._get_link_peer(t.node)) for t in linked_traces]
+
+        # Fetch the ports and circuit terminations on the far side of any pass-through terminations
+        self._fetch(RearPort, [peer.rear_port_id for t, peer in peers if isinstance(peer, FrontPort)])
+        self._fetch_front_ports([peer.pk for t, peer in peers if isinstance(peer, RearPort)])
+        self._fetch_circuit_terminations([
+            peer.circuit_id for t, peer in peers if isinstance(peer, CircuitTermination)
+        ])
+
+        return [t for t, peer in peers if self._follow_peer(t, peer)]
+
+    def _follow_peer(self, t, peer):
+        """
+        Extend the trace through the far-end termination of its current link. Return True if the trace continues.
+        This mirrors the logic of CablePath.from_origin().
+        """
+        # Follow a FrontPort to its corresponding RearPort
+        if isinstance(peer, FrontPort):
+            t.path.append(object_to_path_node(peer))
+            t.node = self._get(RearPort, peer.rear_port_id)
+            if t.node.positions > 1:
+                t.position_stack.append(peer.rear_port_position)
+            t.path.append(object_to_path_node(t.node))
+            return True
+
+        # Follow a RearPort to its corresponding FrontPort (if any)
+        if isinstance(peer, RearPort):
+            t.path.append(object_to_path_node(peer))
+
+            # Determine the peer FrontPort's position
+            if peer.positions == 1:
+                position = 1
+            elif t.position_stack:
+                position = t.position_stack.pop()
+            else:
+                # No position indicated: path has split, so we stop at the RearPort
+                t.is_split = True
+                return False
+
+            front_port = self._front_ports[peer.pk].get(position)
+            if front_port is None:
+                # No corresponding FrontPort found for the RearPort
+                return False
+            t.node = front_port
+            t.path.append(object_to_path_node(front_port))
+            return True
+
+        # Follow a CircuitTermination to its corresponding CircuitTermination (A to Z or vice versa)
+        if isinstance(peer, CircuitTermination):
+            t.path.append(object_to_path_node(peer))
+            peer_side = 'Z' if peer.term_side == 'A' else 'A'
+            node = self._circuit_terminations[peer.circuit_id].get(peer_side)
+            if node is None:
+                # No peer CircuitTermination exists; halt the trace
+                return False
+            t.node = node
+            t.path.append(object_to_path_node(node))
+            if node.provider_network_id:
+                t.set_destination(model=ProviderNetwork, pk=node.provider_network_id)
+                return False
+            if node.site_id and not node.cable_id:
+                t.set_destination(model=Site, pk=node.site_id)
+                return False
+            return True
+
+        # Anything else marks the end of the path (a missing peer leaves the path without a destination, as with
+        # CablePath.from_origin())
+        if peer is not None:
+            t.set_destination(obj=peer)
+        return False
+
+    def trace(self):
+        """
+        Trace all paths. Return a list of (origin, CablePath) tuples, where the CablePath is None for unconnected
+        origins.
+        """
+        traces = self.traces
+        while traces:
+            traces = self._step(traces)
+
+        return [(t.origin, t.to_cablepath()) for t in self.traces]
+
+    def save(self):
+        """
+        Trace all paths and write the results to the database: Existing CablePaths for the origins are updated in place,
+        new ones are created, and those for origins which are no longer connected are deleted.
+        """
+        results = self.trace()
+
+        # Retrieve existing CablePaths for all origins
+        origin_ids = defaultdict(list)
+        for origin, cablepath in results:
+            origin_ids[ContentType.objects.get_for_model(origin)].append(origin.pk)
+        existing_paths = {}
+        for content_type, pks in origin_ids.items():
+            for cablepath in CablePath.objects.filter(origin_type=content_type, origin_id__in=pks):
+                existing_paths[(content_type.pk, cablepath.origin_id)] = cablepath
+
+        to_create = []
+        to_update = []
+        to_delete = []
+        for origin, cablepath in results:
+            existing = existing_paths.get((ContentType.objects.get_for_model(origin).pk, origin.pk))
+            if cablepath is None:
+                if existing is not None:
+                    to_delete.append(existing.pk)
+            elif existing is not None:
+                cablepath.pk = existing.pk
+                to_update.append(cablepath)
+            else:
+                to_create.append(cablepath)
+
+        with transaction.atomic():
+            if to_delete:
+                CablePath.objects.filter(pk__in=to_delete).delete()
+            CablePath.objects.bulk_update(
+                to_update,
+                fields=('path', 'destination_type', 'destination_id', 'is_active', 'is_split'),
+                batch_size=BULK_BATCH_SIZE
+            )
+            CablePath.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+
+            # Record a direct reference to each CablePath on its originating object
+            origins = defaultdict(list)
+            for cablepath in (*to_update, *to_create):
+                if cablepath.origin._path_id != cablepath.pk:
+                    cablepath.origin._path_id = cablepath.pk
+                    origins[cablepath.origin._meta.model].append(cablepath.origin)
+            for model, objects in origins.items():
+                model.objects.bulk_update(objects, fields=('_path',), batch_size=BULK_BATCH_SIZE)
+
+        return [cablepath for origin, cablepath in results if cablepath is not None]
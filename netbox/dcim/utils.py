@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 
@@ -33,11 +35,33 @@ def create_cablepath(node):
     """
     Create CablePaths for all paths originating from the specified node.
     """
+    from dcim.tracing import PathTracer
+
+    PathTracer([node]).save()
+
+
+def retrace_cablepaths(cable_paths):
+    """
+    Retrace the given CablePaths from their origins in bulk. Paths whose origin no longer exists are deleted.
+    """
     from dcim.models import CablePath
+    from dcim.tracing import PathTracer
+
+    # Fetch the origins of all paths using one query per origin type
+    origin_ids = defaultdict(list)
+    for cp in cable_paths:
+        origin_ids[cp.origin_type_id].append(cp.origin_id)
+    origins = []
+    for ct_id, object_ids in origin_ids.items():
+        model = ContentType.objects.get_for_id(ct_id).model_class()
+        origins.extend(model.objects.filter(pk__in=object_ids))
 
-    cp = CablePath.from_origin(node)
-    if cp:
-        cp.save()
+    with transaction.atomic():
+        found = {(ContentType.objects.get_for_model(origin).pk, origin.pk) for origin in origins}
+        orphaned = [cp.pk for cp in cable_paths if (cp.origin_type_id, cp.origin_id) not in found]
+        if orphaned:
+            CablePath.objects.filter(pk__in=orphaned).delete()
+        PathTracer(origins).save()
 
 
 def rebuild_paths(obj):
@@ -46,10 +70,5 @@ def rebuild_paths(obj):
     """
     from dcim.models import CablePath
 
-    cable_paths = CablePath.objects.filter(path__contains=obj)
-
-    with transaction.atomic():
-        for cp in cable_paths:
-            cp.delete()
-            if cp.origin:
-                create_cablepath(cp.origin)
+    cable_paths = CablePath.objects.filter(path__contains=obj).only('pk', 'origin_type', 'origin_id')
+    retrace_cablepaths(list(cable_paths))
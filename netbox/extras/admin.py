@@ -26,7 +26,7 @@ class ConfigRevisionAdmin(admin.ModelAdmin):
             'classes': ('monospace',),
         }),
         ('Pagination', {
-            'fields': ('PAGINATE_COUNT', 'MAX_PAGE_SIZE'),
+            'fields': ('PAGINATE_COUNT', 'MAX_PAGE_SIZE', 'PAGINATE_ESTIMATE_THRESHOLD'),
         }),
         ('Validation', {
             'fields': ('CUSTOM_VALIDATORS',),
@@ -1,5 +1,6 @@
 from django.contrib.contenttypes.models import ContentType
 from rest_framework.fields import Field
+from rest_framework.serializers import ListSerializer
 
 from extras.choices import CustomFieldTypeChoices
 from extras.models import CustomField
@@ -44,9 +45,26 @@ class CustomFieldsDataField(Field):
             self._custom_fields = CustomField.objects.filter(content_types=content_type)
         return self._custom_fields
 
+    def _prefetch_objects(self):
+        """
+        When representing a list of objects, retrieve the objects referenced by each object and multi-object field
+        for the entire list at once, rather than individually for each object.
+        """
+        self._objects_prefetched = True
+        list_serializer = self.parent.parent
+        if not isinstance(list_serializer, ListSerializer) or list_serializer.instance is None:
+            return
+        for cf in self._get_custom_fields():
+            if cf.type in (CustomFieldTypeChoices.TYPE_OBJECT, CustomFieldTypeChoices.TYPE_MULTIOBJECT):
+                cf.prefetch_objects(
+                    instance.custom_field_data.get(cf.name) for instance in list_serializer.instance
+                )
+
     def to_representation(self, obj):
         # TODO: Fix circular import
         from utilities.api import get_serializer_for_model
+        if not hasattr(self, '_objects_prefetched'):
+            self._prefetch_objects()
         data = {}
         for cf in self._get_custom_fields():
             value = cf.deserialize(obj.get(cf.name))
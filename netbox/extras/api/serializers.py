@@ -57,13 +57,14 @@ class WebhookSerializer(ValidatedModelSerializer):
         queryset=ContentType.objects.filter(FeatureQuery('webhooks').get_query()),
         many=True
     )
+    batch_mode = ChoiceField(choices=WebhookBatchModeChoices, required=False)
 
     class Meta:
         model = Webhook
         fields = [
             'id', 'url', 'display', 'content_types', 'name', 'type_create', 'type_update', 'type_delete', 'payload_url',
             'enabled', 'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret',
-            'conditions', 'ssl_verification', 'ca_file_path', 'created', 'last_updated',
+            'conditions', 'batch_mode', 'ssl_verification', 'ca_file_path', 'created', 'last_updated',
         ]
 
 
@@ -12,6 +12,7 @@ from rq import Worker
 
 from extras import filtersets
 from extras.choices import JobResultStatusChoices
+from extras.context_cache import prefetch_config_contexts
 from extras.models import *
 from extras.models import CustomField
 from extras.reports import get_report, get_reports, run_report
@@ -35,23 +36,23 @@ class ExtrasRootView(APIRootView):
 class ConfigContextQuerySetMixin:
     """
     Used by views that work with config context models (device and virtual machine).
-    Provides a get_queryset() method which deals with adding the config context
-    data annotation or not.
+    Loads the rendered config context of each object in the response from the cache
+    in bulk, rendering any which are missing with a single annotated query.
     """
-    def get_queryset(self):
+    @property
+    def include_config_context(self):
         """
-        Build the proper queryset based on the request context
-
-        If the `brief` query param equates to True or the `exclude` query param
-        includes `config_context` as a value, return the base queryset.
-
-        Else, return the queryset annotated with config context data
+        Return False if the `brief` query param equates to True or the `exclude` query param
+        includes `config_context` as a value.
         """
-        queryset = super().get_queryset()
         request = self.get_serializer_context()['request']
-        if self.brief or 'config_context' in request.query_params.get('exclude', []):
-            return queryset
-        return queryset.annotate_config_context_data()
+        return not (self.brief or 'config_context' in request.query_params.get('exclude', []))
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and self.include_config_context:
+            prefetch_config_contexts(page)
+        return page
 
 
 #
@@ -0,0 +1,116 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import ObjectChange
+
+__all__ = (
+    'ChangeLogBuffer',
+)
+
+# Maximum number of ObjectChange records written per INSERT
+CHANGELOG_BATCH_SIZE = 500
+
+
+class ChangeLogGroup:
+    """
+    A run of ObjectChange records created within the same transaction/savepoint. The group is considered committed
+    once its on_commit() callback has fired. If the enclosing transaction (or savepoint) is rolled back, Django discards
+    the callback and the group's records are never written.
+    """
+    def __init__(self, savepoint_ids):
+        self.savepoint_ids = savepoint_ids
+        self.records = []
+        self.committed = savepoint_ids is None
+
+        if not self.committed:
+            transaction.on_commit(self.mark_committed)
+
+    def mark_committed(self):
+        self.committed = True
+
+    @property
+    def pending(self):
+        """
+        Return True if the transaction which created this group is still open.
+        """
+        if self.committed:
+            return False
+        connection = transaction.get_connection()
+        return any(self.mark_committed in callback for callback in connection.run_on_commit)
+
+    @property
+    def valid(self):
+        """
+        Return True if the group's records should be written to the database.
+        """
+        return self.committed or self.pending
+
+
+class ChangeLogBuffer:
+    """
+    Collect the ObjectChange records generated while processing a request so that they can be written to the database
+    in bulk once the request has completed, rather than issuing an INSERT per change.
+    """
+    def __init__(self):
+        self.groups = []
+        self._index = defaultdict(list)
+
+    def __len__(self):
+        return sum(len(group.records) for group in self.groups)
+
+    def _get_group(self):
+        connection = transaction.get_connection()
+        savepoint_ids = tuple(connection.savepoint_ids) if connection.in_atomic_block else None
+
+        # Reuse the current group only if it was opened within the same (and still open) transaction/savepoint
+        if self.groups:
+            group = self.groups[-1]
+            if group.savepoint_ids == savepoint_ids and (savepoint_ids is None or group.pending):
+                return group
+
+        group = ChangeLogGroup(savepoint_ids)
+        self.groups.append(group)
+
+        return group
+
+    def append(self, objectchange):
+        """
+        Queue an ObjectChange for creation.
+        """
+        self._get_group().records.append(objectchange)
+        self._index[(objectchange.changed_object_type_id, objectchange.changed_object_id)].append(objectchange)
+
+    def update_postchange_data(self, content_type, object_id, postchange_data):
+        """
+        Update the post-change data of any queued ObjectChanges for the specified object (e.g. following the
+        assignment of tags to an object which has already been saved).
+        """
+        for objectchange in self._index.get((content_type.pk, object_id), []):
+            objectchange.postchange_data = postchange_data
+
+    def clear(self):
+        self.groups = []
+        self._index.clear()
+
+    def flush(self):
+        """
+        Write all queued ObjectChanges belonging to committed transactions to the database and reset the buffer.
+        """
+        objectchanges = []
+        for group in self.groups:
+            if not group.valid:
+                continue
+            for objectchange in group.records:
+                # Replicate ObjectChange.save(), which is bypassed by bulk_create()
+                if not objectchange.user_name:
+                    objectchange.user_name = objectchange.user.username
+                if not objectchange.object_repr:
+                    objectchange.object_repr = str(objectchange.changed_object)
+                objectchanges.append(objectchange)
+        self.clear()
+
+        if objectchanges:
+            ObjectChange.objects.bulk_create(objectchanges, batch_size=CHANGELOG_BATCH_SIZE)
+
+        return objectchanges
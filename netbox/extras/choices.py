@@ -165,3 +165,16 @@ class WebhookHttpMethodChoices(ChoiceSet):
         (METHOD_PATCH, 'PATCH'),
         (METHOD_DELETE, 'DELETE'),
     )
+
+
+class WebhookBatchModeChoices(ChoiceSet):
+
+    BATCH_DISABLED = 'disabled'
+    BATCH_SEPARATE = 'separate'
+    BATCH_ARRAY = 'array'
+
+    CHOICES = (
+        (BATCH_DISABLED, 'Disabled'),
+        (BATCH_SEPARATE, 'Separate requests'),
+        (BATCH_ARRAY, 'JSON array'),
+    )
@@ -60,12 +60,20 @@ class Condition:
         self.eval_func = getattr(self, f'eval_{op}')
         self.negate = negate
 
+        # Pre-split the attribute path and pre-compile regular expressions so that repeated evaluation is cheap
+        self.attr_path = attr.split('.')
+        if op == self.REGEX:
+            try:
+                self.regex = re.compile(value)
+            except re.error as e:
+                raise ValueError(f"Invalid regular expression: {value} ({e})")
+
     def eval(self, data):
         """
         Evaluate the provided data to determine whether it matches the condition.
         """
         try:
-            value = functools.reduce(dict.get, self.attr.split('.'), data)
+            value = functools.reduce(dict.get, self.attr_path, data)
         except TypeError:
             # Invalid key path
             value = None
@@ -108,7 +116,7 @@ class Condition:
     # Regular expressions
 
     def eval_regex(self, value):
-        return re.match(self.value, value) is not None
+        return self.regex.match(value) is not None
 
 
 class ConditionSet:
@@ -1,6 +1,9 @@
 # Webhook content types
 HTTP_CONTENT_TYPE_JSON = 'application/json'
 
+# Approximate number of characters sent per chunk when streaming rendered export templates
+EXPORT_CHUNK_SIZE = 64 * 1024
+
 # Registerable extras features
 EXTRAS_FEATURES = [
     'custom_fields',
@@ -0,0 +1,271 @@
+import uuid
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+
+__all__ = (
+    'ASSIGNMENT_PATHS',
+    'get_config_context',
+    'get_related_cache_keys',
+    'invalidate_all',
+    'invalidate_config_context',
+    'invalidate_objects',
+    'invalidate_on_commit',
+    'invalidate_related_objects',
+    'prefetch_config_contexts',
+    'prewarm_config_contexts',
+)
+
+# Number of seconds for which a rendered config context is cached
+CONFIG_CONTEXT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Number of objects rendered per query when prewarming the cache
+PREWARM_BATCH_SIZE = 500
+
+# For each model which supports config contexts, the path from the model to each type of object to which a ConfigContext
+# may be assigned. None indicates that the assignment does not apply to the model.
+ASSIGNMENT_PATHS = {
+    'dcim.device': {
+        'regions': 'site__region',
+        'site_groups': 'site__group',
+        'sites': 'site',
+        'device_types': 'device_type',
+        'roles': 'device_role',
+        'platforms': 'platform',
+        'cluster_types': 'cluster__type',
+        'cluster_groups': 'cluster__group',
+        'clusters': 'cluster',
+        'tenant_groups': 'tenant__group',
+        'tenants': 'tenant',
+        'tags': 'tags',
+    },
+    'virtualization.virtualmachine': {
+        'regions': 'cluster__site__region',
+        'site_groups': 'cluster__site__group',
+        'sites': 'cluster__site',
+        'device_types': None,
+        'roles': 'role',
+        'platforms': 'platform',
+        'cluster_types': 'cluster__type',
+        'cluster_groups': 'cluster__group',
+        'clusters': 'cluster',
+        'tenant_groups': 'tenant__group',
+        'tenants': 'tenant',
+        'tags': 'tags',
+    },
+}
+
+# Assignments to these models also apply to all of their descendants
+NESTED_ASSIGNMENTS = ('regions', 'site_groups')
+
+VERSION_KEY = 'config_context_version'
+
+
+def get_version():
+    """
+    Return the current version of the config context cache. Changing the version invalidates all cached contexts.
+    """
+    return cache.get_or_set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_cache_key(model, pk, last_updated, version):
+    # The object's last_updated time is included so that modifying the object itself invalidates its cached context
+    timestamp = last_updated.timestamp() if last_updated else ''
+    return f'config_context:{version}:{model._meta.label_lower}:{pk}:{timestamp}'
+
+
+def get_config_context(instance):
+    """
+    Return the rendered config context for a Device or VirtualMachine, rendering it only if it has not been cached.
+    """
+    # Use the context loaded by prefetch_config_contexts(), if any
+    if hasattr(instance, '_config_context'):
+        return instance._config_context
+
+    # Unsaved objects and querysets annotated with config_context_data are always rendered directly
+    if instance.pk is None or hasattr(instance, 'config_context_data'):
+        return instance.render_config_context()
+
+    key = get_cache_key(instance._meta.model, instance.pk, instance.last_updated, get_version())
+    data = cache.get(key)
+    if data is None:
+        data = instance.render_config_context()
+        cache.set(key, data, CONFIG_CONTEXT_CACHE_TIMEOUT)
+
+    return data
+
+
+def prefetch_config_contexts(instances):
+    """
+    Load the config contexts for a list of Devices or VirtualMachines (all of the same model) from the cache. Any which
+    have not been cached are rendered together using a single annotated query, and written back to the cache.
+    """
+    instances = [instance for instance in instances if instance.pk is not None]
+    if not instances:
+        return
+    model = instances[0]._meta.model
+    version = get_version()
+
+    keys = {
+        get_cache_key(model, instance.pk, instance.last_updated, version): instance for instance in instances
+    }
+    cached = cache.get_many(keys.keys())
+
+    missing = {}
+    for key, instance in keys.items():
+        if key in cached:
+            instance._config_context = cached[key]
+        else:
+            missing[key] = instance
+
+    if missing:
+        context_data = dict(
+            model.objects.filter(pk__in=[instance.pk for instance in missing.values()])
+            .annotate_config_context_data()
+            .order_by()
+            .values_list('pk', 'config_context_data')
+        )
+        for instance in missing.values():
+            instance.config_context_data = context_data.get(instance.pk)
+            instance._config_context = instance.render_config_context()
+            del instance.config_context_data
+        cache.set_many(
+            {key: instance._config_context for key, instance in missing.items()},
+            CONFIG_CONTEXT_CACHE_TIMEOUT
+        )
+
+
+def prewarm_config_contexts(models=None):
+    """
+    Render and cache the config context of every Device and VirtualMachine (or only those of the specified models).
+    Returns the number of objects processed.
+    """
+    count = 0
+    for label in models or ASSIGNMENT_PATHS:
+        model = apps.get_model(label)
+        batch = []
+        for instance in model.objects.only('pk', 'last_updated', 'local_context_data').iterator():
+            batch.append(instance)
+            if len(batch) >= PREWARM_BATCH_SIZE:
+                prefetch_config_contexts(batch)
+                count += len(batch)
+                batch = []
+        prefetch_config_contexts(batch)
+        count += len(batch)
+
+    return count
+
+
+#
+# Invalidation
+#
+
+def invalidate_all():
+    """
+    Invalidate the cached config contexts of all objects.
+    """
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_cache_keys(queryset):
+    """
+    Return the cache keys of all Devices or VirtualMachines in the given queryset.
+    """
+    version = get_version()
+    return [
+        get_cache_key(queryset.model, pk, last_updated, version)
+        for pk, last_updated in queryset.order_by().values_list('pk', 'last_updated').distinct()
+    ]
+
+
+def invalidate_on_commit(func, *args):
+    """
+    Call a cache invalidation function immediately, and again once the current transaction has been committed (in case
+    a context is cached by another process in the meantime).
+    """
+    func(*args)
+    transaction.on_commit(lambda: func(*args))
+
+
+def invalidate_objects(queryset):
+    """
+    Evict the cached config contexts of all Devices or VirtualMachines in the given queryset.
+    """
+    keys = get_cache_keys(queryset)
+    if keys:
+        cache.delete_many(keys)
+
+
+def _get_assigned_pks(field_name, related_objects):
+    """
+    Return the PKs of the given assigned objects, expanded to include their descendants if the assignment is nested.
+    """
+    if field_name in NESTED_ASSIGNMENTS:
+        model = related_objects.model
+        return model.objects.get_queryset_descendants(related_objects, include_self=True).values_list('pk', flat=True)
+    return related_objects.values_list('pk', flat=True)
+
+
+def invalidate_config_context(config_context):
+    """
+    Evict the cached contexts of all objects to which the ConfigContext currently applies. This should be called both
+    before and after the ConfigContext's assignments are modified.
+    """
+    if config_context.pk is None:
+        # The ConfigContext has since been deleted (its cached contexts were evicted beforehand)
+        return
+    querysets = []
+    for label, paths in ASSIGNMENT_PATHS.items():
+        queryset = apps.get_model(label).objects.all()
+        for field_name, path in paths.items():
+            related_objects = getattr(config_context, field_name).all()
+            if not related_objects.exists():
+                continue
+            if path is None:
+                # The ConfigContext is limited to objects which cannot be assigned to this model
+                queryset = None
+                break
+            queryset = queryset.filter(**{f'{path}__in': _get_assigned_pks(field_name, related_objects)})
+        if queryset is not None:
+            querysets.append(queryset)
+
+    # A ConfigContext with no assignments applies to every object
+    if any(not queryset.query.where for queryset in querysets):
+        invalidate_all()
+        return
+
+    for queryset in querysets:
+        invalidate_objects(queryset)
+
+
+def get_related_cache_keys(instance):
+    """
+    Return the cache keys of all Devices and VirtualMachines whose config context depends on an object to which
+    ConfigContexts may be assigned (e.g. a Site or Tenant).
+    """
+    from extras.models import ConfigContext
+
+    keys = []
+    for field_name in ASSIGNMENT_PATHS['dcim.device']:
+        if ConfigContext._meta.get_field(field_name).related_model is not instance._meta.model:
+            continue
+        related_objects = instance._meta.model.objects.filter(pk=instance.pk)
+        for label, paths in ASSIGNMENT_PATHS.items():
+            if paths[field_name] is None:
+                continue
+            queryset = apps.get_model(label).objects.filter(
+                **{f'{paths[field_name]}__in': _get_assigned_pks(field_name, related_objects)}
+            )
+            keys.extend(get_cache_keys(queryset))
+
+    return keys
+
+
+def invalidate_related_objects(instance):
+    """
+    Evict the cached contexts of all Devices and VirtualMachines related to the given object.
+    """
+    keys = get_related_cache_keys(instance)
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,124 @@
+import csv
+import logging
+import os
+
+from django.conf import settings
+
+from utilities.utils import Echo, iterate_in_chunks
+from .choices import JobResultStatusChoices
+
+__all__ = (
+    'get_export_kwargs',
+    'get_export_path',
+    'render_table_csv',
+    'render_yaml',
+    'run_export',
+)
+
+# Directory (relative to MEDIA_ROOT) in which the output of background export jobs is stored
+EXPORT_DIR = 'exports'
+
+logger = logging.getLogger('netbox.extras.exports')
+
+
+def render_table_csv(table, columns=None):
+    """
+    Render a table's data in CSV format, yielding one line at a time.
+
+    :param table: The Table instance to export
+    :param columns: A list of specific columns to include. If None, all columns will be exported.
+    """
+    exclude_columns = {'pk', 'actions'}
+    if columns:
+        all_columns = [col_name for col_name, _ in table.selected_columns + table.available_columns]
+        exclude_columns.update({
+            col for col in all_columns if col not in columns
+        })
+
+    writer = csv.writer(Echo())
+    for row in table.iter_values(exclude_columns):
+        yield writer.writerow(row)
+
+
+def render_yaml(queryset):
+    """
+    Render a queryset of objects as concatenated YAML documents, yielding one document at a time.
+    """
+    for i, obj in enumerate(iterate_in_chunks(queryset)):
+        yield obj.to_yaml() if not i else f'---\n{obj.to_yaml()}'
+
+
+def get_export_path(job_result):
+    """
+    Return the absolute path of the file to which the output of an export job is written.
+    """
+    return os.path.join(settings.MEDIA_ROOT, EXPORT_DIR, str(job_result.job_id))
+
+
+def get_export_kwargs(queryset):
+    """
+    Return the arguments with which run_export() reconstructs the given queryset. (A QuerySet cannot be passed to a job
+    directly, as pickling it would evaluate it.)
+    """
+    return {
+        'query': queryset.query,
+        'prefetch_related': [
+            lookup for lookup in queryset._prefetch_related_lookups if isinstance(lookup, str)
+        ],
+    }
+
+
+def run_export(job_result, query, prefetch_related=None, table_class=None, columns=None, ordering=None,
+               export_template=None, *args, **kwargs):
+    """
+    Background job which exports a queryset of objects to a file under MEDIA_ROOT. The output is rendered from a table
+    (CSV) if table_class is specified, from an ExportTemplate if export_template is specified, or as YAML otherwise. The
+    name and size of the file are recorded in the JobResult's data.
+
+    :param job_result: The JobResult representing the export (its obj_type identifies the model being exported)
+    :param query: The Query for the objects to export
+    :param prefetch_related: Lookups for related objects to be prefetched (optional)
+    :param table_class: The Table class with which to render CSV output (optional)
+    :param columns: The columns of the table to include (optional; defaults to all columns)
+    :param ordering: The ordering to apply to the table (optional)
+    :param export_template: The ExportTemplate with which to render the output (optional)
+    """
+    job_result.set_status(JobResultStatusChoices.STATUS_RUNNING)
+    job_result.save()
+
+    queryset = job_result.obj_type.model_class().objects.all()
+    queryset.query = query
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    if table_class is not None:
+        table = table_class(queryset, user=job_result.user)
+        if ordering:
+            table.order_by = ordering
+        output = render_table_csv(table, columns)
+    elif export_template is not None:
+        output = export_template.render_stream(queryset)
+    else:
+        output = render_yaml(queryset)
+
+    path = get_export_path(job_result)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            for chunk in output:
+                f.write(chunk)
+        job_result.data = {
+            'filename': job_result.name,
+            'size': os.path.getsize(path),
+        }
+        job_result.set_status(JobResultStatusChoices.STATUS_COMPLETED)
+    except Exception as e:
+        logger.error(f"Error during export {job_result.job_id}: {e}")
+        job_result.data = {
+            'error': str(e),
+        }
+        job_result.set_status(JobResultStatusChoices.STATUS_ERRORED)
+        if os.path.exists(path):
+            os.remove(path)
+
+    job_result.save()
@@ -36,12 +36,15 @@ class WebhookFilterSet(BaseFilterSet):
     http_method = django_filters.MultipleChoiceFilter(
         choices=WebhookHttpMethodChoices
     )
+    batch_mode = django_filters.MultipleChoiceFilter(
+        choices=WebhookBatchModeChoices
+    )
 
     class Meta:
         model = Webhook
         fields = [
             'id', 'content_types', 'name', 'type_create', 'type_update', 'type_delete', 'payload_url', 'enabled',
-            'http_method', 'http_content_type', 'secret', 'ssl_verification', 'ca_file_path',
+            'http_method', 'http_content_type', 'secret', 'batch_mode', 'ssl_verification', 'ca_file_path',
         ]
 
     def search(self, queryset, name, value):
@@ -134,6 +134,10 @@ class WebhookBulkEditForm(BulkEditForm):
     secret = forms.CharField(
         required=False
     )
+    batch_mode = forms.ChoiceField(
+        choices=add_blank_choice(WebhookBatchModeChoices),
+        required=False
+    )
     ca_file_path = forms.CharField(
         required=False,
         label='CA file path'
@@ -110,7 +110,7 @@ class ExportTemplateFilterForm(FilterForm):
 class WebhookFilterForm(FilterForm):
     fieldsets = (
         (None, ('q',)),
-        ('Attributes', ('content_types', 'http_method', 'enabled')),
+        ('Attributes', ('content_types', 'http_method', 'batch_mode', 'enabled')),
         ('Events', ('type_create', 'type_update', 'type_delete')),
     )
     content_types = ContentTypeMultipleChoiceField(
@@ -123,6 +123,11 @@ class WebhookFilterForm(FilterForm):
         required=False,
         label=_('HTTP method')
     )
+    batch_mode = MultipleChoiceField(
+        choices=WebhookBatchModeChoices,
+        required=False,
+        label=_('Batch mode')
+    )
     enabled = forms.NullBooleanField(
         required=False,
         widget=StaticSelect(
@@ -118,6 +118,7 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
             'payload_url', 'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret',
         )),
         ('Conditions', ('conditions',)),
+        ('Delivery', ('batch_mode',)),
         ('SSL', ('ssl_verification', 'ca_file_path')),
     )
 
@@ -131,6 +132,7 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
         }
         widgets = {
             'http_method': StaticSelect(),
+            'batch_mode': StaticSelect(),
             'additional_headers': forms.Textarea(attrs={'class': 'font-monospace'}),
             'body_template': forms.Textarea(attrs={'class': 'font-monospace'}),
         }
@@ -12,6 +12,7 @@ from packaging import version
 from extras.models import JobResult
 from extras.models import ObjectChange
 from netbox.config import Config
+from users.models import UserConfig
 
 
 class Command(BaseCommand):
@@ -91,6 +92,13 @@ class Command(BaseCommand):
                 f"\tSkipping: No retention period specified (JOBRESULT_RETENTION = {config.JOBRESULT_RETENTION})"
             )
 
+        # Write any deferred changes to user preferences
+        if options['verbosity']:
+            self.stdout.write("[*] Writing deferred user preferences")
+        flushed = sum(1 for userconfig in UserConfig.objects.all() if userconfig.flush())
+        if options['verbosity']:
+            self.stdout.write(f"\tUpdated preferences for {flushed} users.", self.style.SUCCESS)
+
         # Check for new releases (if enabled)
         if options['verbosity']:
             self.stdout.write("[*] Checking for latest release")
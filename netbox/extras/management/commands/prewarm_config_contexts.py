@@ -0,0 +1,32 @@
+import django_rq
+from django.core.management.base import BaseCommand, CommandError
+
+from extras.context_cache import ASSIGNMENT_PATHS, prewarm_config_contexts
+
+
+class Command(BaseCommand):
+    help = "Render and cache the config context of every device and virtual machine"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args', metavar='app_label.ModelName', nargs='*',
+            help=f"One or more specific models to prewarm ({', '.join(ASSIGNMENT_PATHS)})",
+        )
+        parser.add_argument(
+            "--background", action='store_true', dest='background',
+            help="Enqueue the task on the low-priority queue instead of running it immediately"
+        )
+
+    def handle(self, *model_names, **options):
+        models = [name.lower() for name in model_names] or None
+        for name in models or []:
+            if name not in ASSIGNMENT_PATHS:
+                raise CommandError(f"Invalid model: {name} does not support config contexts")
+
+        if options['background']:
+            job = django_rq.get_queue('low').enqueue(prewarm_config_contexts, models)
+            self.stdout.write(f"Enqueued job {job.id}", self.style.SUCCESS)
+            return
+
+        count = prewarm_config_contexts(models)
+        self.stdout.write(f"Cached the config contexts of {count} objects", self.style.SUCCESS)
@@ -0,0 +1,66 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from extras.models import CachedValue
+from extras.search import CACHE_BATCH_SIZE, get_cached_values, get_indexed_fields
+
+
+class Command(BaseCommand):
+    help = "Build the global search index for all searchable objects (or only those of the specified models)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args', metavar='app_label.ModelName', nargs='*',
+            help='One or more specific models (each prefixed with its app_label) to reindex',
+        )
+        parser.add_argument(
+            '--lazy', action='store_true',
+            help="For each model, build the index only if no cached values exist",
+        )
+
+    def _get_models(self, names):
+        indexed_models = get_indexed_fields()
+        if not names:
+            return list(indexed_models)
+
+        models = []
+        for name in names:
+            try:
+                model = apps.get_model(name)
+            except (LookupError, ValueError):
+                raise CommandError(f"Unknown model: {name}. Models must be specified in the form app_label.ModelName.")
+            if model not in indexed_models:
+                raise CommandError(f"Invalid model: {name} is not searchable")
+            models.append(model)
+
+        return models
+
+    def handle(self, *model_names, **options):
+        for model in self._get_models(model_names):
+            object_type = ContentType.objects.get_for_model(model)
+            cached_values = CachedValue.objects.filter(object_type=object_type)
+            if options['lazy'] and cached_values.exists():
+                if options['verbosity']:
+                    self.stdout.write(f"Skipping {model._meta.label} (already indexed)")
+                continue
+
+            if options['verbosity']:
+                self.stdout.write(f"Reindexing {model._meta.label}... ", ending='')
+                self.stdout.flush()
+
+            count = 0
+            with transaction.atomic():
+                cached_values.delete()
+                batch = []
+                for instance in model.objects.iterator(chunk_size=CACHE_BATCH_SIZE):
+                    batch.extend(get_cached_values(instance, object_type))
+                    count += 1
+                    if len(batch) >= CACHE_BATCH_SIZE:
+                        CachedValue.objects.bulk_create(batch)
+                        batch = []
+                CachedValue.objects.bulk_create(batch)
+
+            if options['verbosity']:
+                self.stdout.write(f"{count} objects", self.style.SUCCESS)
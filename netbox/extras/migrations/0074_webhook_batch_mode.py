@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0073_journalentry_tags_custom_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='batch_mode',
+            field=models.CharField(default='disabled', max_length=30),
+        ),
+    ]
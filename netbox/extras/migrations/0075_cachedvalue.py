@@ -0,0 +1,38 @@
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('extras', '0074_webhook_batch_mode'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='CachedValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('field', models.CharField(max_length=200)),
+                ('value', models.TextField()),
+                ('weight', models.PositiveSmallIntegerField(default=1000)),
+                ('object_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ('weight', 'object_type', 'object_id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cachedvalue',
+            index=models.Index(fields=['object_type', 'object_id'], name='extras_cachedvalue_object'),
+        ),
+        migrations.AddIndex(
+            model_name='cachedvalue',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['value'], name='extras_cachedvalue_value_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
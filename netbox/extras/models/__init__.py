@@ -2,9 +2,11 @@ from .change_logging import ObjectChange
 from .configcontexts import ConfigContext, ConfigContextModel
 from .customfields import CustomField
 from .models import *
+from .search import CachedValue
 from .tags import Tag, TaggedItem
 
 __all__ = (
+    'CachedValue',
     'ConfigContext',
     'ConfigContextModel',
     'ConfigRevision',
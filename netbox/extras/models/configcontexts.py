@@ -138,7 +138,15 @@ class ConfigContextModel(models.Model):
 
     def get_config_context(self):
         """
-        Return the rendered configuration context for a device or VM.
+        Return the rendered configuration context for a device or VM. Rendered contexts are cached until the object or
+        any ConfigContext applying to it is modified.
+        """
+        from extras.context_cache import get_config_context
+        return get_config_context(self)
+
+    def render_config_context(self):
+        """
+        Render the configuration context for a device or VM, bypassing the cache.
         """
 
         # Compile all config data, overwriting lower-weight values with higher-weight values where a collision occurs
@@ -265,16 +265,45 @@ class CustomField(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
             return [obj.pk for obj in value] or None
         return value
 
+    def prefetch_objects(self, values):
+        """
+        Retrieve all objects referenced by the given values of an object or multi-object field (e.g. for a page of
+        objects) using a single query. Subsequent calls to deserialize() for any of these values will return the
+        retrieved objects rather than querying the database.
+
+        :param values: An iterable of the field's JSON data for each object
+        """
+        pks = set()
+        for value in values:
+            if value is None:
+                continue
+            if self.type == CustomFieldTypeChoices.TYPE_MULTIOBJECT:
+                pks.update(value)
+            else:
+                pks.add(value)
+
+        model = self.object_type.model_class()
+        objects = model.objects.filter(pk__in=pks) if pks else []
+        # Retain the model's ordering for multi-object values
+        self._prefetched_objects = {obj.pk: (i, obj) for i, obj in enumerate(objects)}
+        self._prefetched_pks = pks
+
     def deserialize(self, value):
         """
         Convert JSON data to a Python object suitable for the field type.
         """
         if value is None:
             return value
+        prefetched_pks = getattr(self, '_prefetched_pks', ())
         if self.type == CustomFieldTypeChoices.TYPE_OBJECT:
+            if value in prefetched_pks:
+                return self._prefetched_objects.get(value, (None, None))[1]
             model = self.object_type.model_class()
             return model.objects.filter(pk=value).first()
         if self.type == CustomFieldTypeChoices.TYPE_MULTIOBJECT:
+            if prefetched_pks and set(value).issubset(prefetched_pks):
+                objects = sorted(self._prefetched_objects[pk] for pk in set(value) if pk in self._prefetched_objects)
+                return [obj for i, obj in objects]
             model = self.object_type.model_class()
             return model.objects.filter(pk__in=value)
         return value
@@ -1,3 +1,4 @@
+import itertools
 import json
 import uuid
 
@@ -8,7 +9,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.core.validators import ValidationError
 from django.db import models
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.formats import date_format
@@ -19,12 +20,13 @@ from extras.choices import *
 from extras.constants import *
 from extras.conditions import ConditionSet
 from extras.utils import FeatureQuery, image_upload
+from netbox.config import reset_config
 from netbox.models import ChangeLoggedModel
 from netbox.models.features import (
     CustomFieldsMixin, CustomLinksMixin, ExportTemplatesMixin, JobResultsMixin, TagsMixin, WebhooksMixin,
 )
 from utilities.querysets import RestrictedQuerySet
-from utilities.utils import render_jinja2
+from utilities.utils import generate_jinja2, render_jinja2
 
 __all__ = (
     'ConfigRevision',
@@ -115,6 +117,13 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         null=True,
         help_text="A set of conditions which determine whether the webhook will be generated."
     )
+    batch_mode = models.CharField(
+        max_length=30,
+        choices=WebhookBatchModeChoices,
+        default=WebhookBatchModeChoices.BATCH_DISABLED,
+        help_text="Deliver all events resulting from a single request in one background job, either as separate HTTP "
+                  "requests over a persistent connection or as a single request containing a JSON array."
+    )
     ssl_verification = models.BooleanField(
         default=True,
         verbose_name='SSL verification',
@@ -327,24 +336,56 @@ class ExportTemplate(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
 
         return output
 
+    def render_stream(self, queryset):
+        """
+        Render the contents of the template, yielding the output in chunks of approximately EXPORT_CHUNK_SIZE
+        characters.
+        """
+        context = {
+            'queryset': queryset
+        }
+        buffer = []
+        length = 0
+        for output in generate_jinja2(self.template_code, context):
+            buffer.append(output)
+            length += len(output)
+            if length >= EXPORT_CHUNK_SIZE:
+                output = ''.join(buffer)
+                buffer, length = [], 0
+                # Hold back a trailing CR in case the next piece begins with LF
+                if output.endswith('\r'):
+                    output, buffer, length = output[:-1], ['\r'], 1
+                yield output.replace('\r\n', '\n')
+        yield ''.join(buffer).replace('\r\n', '\n')
+
     def render_to_response(self, queryset):
         """
-        Render the template to an HTTP response, delivered as a named file attachment
+        Render the template to an HTTP response, delivered as a named file attachment. The output is streamed.
         """
-        output = self.render(queryset)
+        output = self.render_stream(queryset)
         mime_type = 'text/plain' if not self.mime_type else self.mime_type
 
+        # Render the first chunk immediately, so that any errors early in the template are raised before the
+        # response has begun
+        output = itertools.chain([next(output)], output)
+
         # Build the response
-        response = HttpResponse(output, content_type=mime_type)
+        response = StreamingHttpResponse(output, content_type=mime_type)
 
         if self.as_attachment:
-            basename = queryset.model._meta.verbose_name_plural.replace(' ', '_')
-            extension = f'.{self.file_extension}' if self.file_extension else ''
-            filename = f'netbox_{basename}{extension}'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            response['Content-Disposition'] = f'attachment; filename="{self.get_filename(queryset.model)}"'
 
         return response
 
+    def get_filename(self, model):
+        """
+        Return the name of the file to which the template's output is written when exporting objects of the given
+        model.
+        """
+        basename = model._meta.verbose_name_plural.replace(' ', '_')
+        extension = f'.{self.file_extension}' if self.file_extension else ''
+        return f'netbox_{basename}{extension}'
+
 
 class ImageAttachment(WebhooksMixin, ChangeLoggedModel):
     """
@@ -589,6 +630,10 @@ class ConfigRevision(models.Model):
         cache.set('config', self.data, None)
         cache.set('config_version', self.pk, None)
 
+        # Apply the new configuration immediately within this process (other processes will detect the change within
+        # CONFIG_CHECK_INTERVAL seconds)
+        reset_config()
+
     @admin.display(boolean=True)
     def is_active(self):
         return cache.get('config_version') == self.pk
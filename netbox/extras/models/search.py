@@ -0,0 +1,43 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+
+__all__ = (
+    'CachedValue',
+)
+
+
+class CachedValue(models.Model):
+    """
+    The normalized value of a searchable field on an object. CachedValues form the global search index, allowing
+    objects of all types to be searched using a single query. They are maintained automatically as objects are saved
+    and deleted.
+    """
+    object_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveBigIntegerField()
+    object = GenericForeignKey(
+        ct_field='object_type',
+        fk_field='object_id'
+    )
+    field = models.CharField(
+        max_length=200
+    )
+    value = models.TextField()
+    weight = models.PositiveSmallIntegerField(
+        default=1000
+    )
+
+    class Meta:
+        ordering = ('weight', 'object_type', 'object_id')
+        indexes = (
+            models.Index(fields=('object_type', 'object_id'), name='extras_cachedvalue_object'),
+            GinIndex(fields=['value'], name='extras_cachedvalue_value_trgm', opclasses=['gin_trgm_ops']),
+        )
+
+    def __str__(self):
+        return f'{self.object_type.name} {self.object_id}: {self.field}={self.value}'
@@ -0,0 +1,178 @@
+import netaddr
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Case, IntegerField, Q, Subquery, Value, When
+from netaddr.core import AddrFormatError
+
+from .models import CachedValue
+
+__all__ = (
+    'cache_object',
+    'get_cached_values',
+    'get_indexed_fields',
+    'remove_object',
+    'remove_stale_values',
+    'search',
+)
+
+# Maximum number of CachedValues written per query
+CACHE_BATCH_SIZE = 1000
+
+# Models which also match a search for any IP address or network they contain, by the indexed field holding the network
+NETWORK_FIELDS = {
+    'ipam.aggregate': 'prefix',
+    'ipam.prefix': 'prefix',
+}
+
+# Indexed fields for each searchable model, populated on first use
+_indexed_fields = {}
+
+
+def get_indexed_fields(model=None):
+    """
+    Return the indexed fields (as a sequence of (name, weight) tuples) for the given model, or a dictionary mapping all
+    searchable models to their indexed fields if no model is specified.
+    """
+    if not _indexed_fields:
+        from netbox.constants import SEARCH_TYPES
+        for search_type in SEARCH_TYPES.values():
+            _indexed_fields[search_type['queryset'].model] = search_type['fields']
+
+    if model is None:
+        return _indexed_fields
+    return _indexed_fields.get(model)
+
+
+def get_cached_values(instance, object_type=None):
+    """
+    Return a list of unsaved CachedValues representing the indexed fields of the given object.
+    """
+    object_type = object_type or ContentType.objects.get_for_model(instance)
+    values = []
+    for field_name, weight in get_indexed_fields(instance._meta.model) or []:
+        value = getattr(instance, field_name)
+        if value is None:
+            continue
+        value = str(value).strip().lower()
+        if value:
+            values.append(CachedValue(
+                object_type=object_type,
+                object_id=instance.pk,
+                field=field_name,
+                value=value,
+                weight=weight
+            ))
+    return values
+
+
+def cache_object(instance):
+    """
+    Update the search index to reflect the current state of the given object.
+    """
+    object_type = ContentType.objects.get_for_model(instance)
+    CachedValue.objects.filter(object_type=object_type, object_id=instance.pk).delete()
+    CachedValue.objects.bulk_create(get_cached_values(instance, object_type), batch_size=CACHE_BATCH_SIZE)
+
+
+def remove_object(instance):
+    """
+    Remove the given object from the search index.
+    """
+    object_type = ContentType.objects.get_for_model(instance)
+    CachedValue.objects.filter(object_type=object_type, object_id=instance.pk).delete()
+
+
+def remove_stale_values(results):
+    """
+    Remove from the search index all values of the objects represented by the given CachedValues, which have been
+    found to no longer exist.
+    """
+    stale = Q()
+    for result in results:
+        stale |= Q(object_type_id=result.object_type_id, object_id=result.object_id)
+    CachedValue.objects.filter(stale).delete()
+
+
+def _get_rank(value):
+    # Rank exact matches first, followed by matches at the beginning of a value, followed by all other matches
+    return Case(
+        When(value=value, then=Value(0)),
+        When(value__startswith=value, then=Value(1)),
+        default=Value(2),
+        output_field=IntegerField()
+    )
+
+
+def _get_network_matches(value, object_types=None):
+    """
+    If the search term is an IP address or network, return a Q object matching the indexed networks which contain it.
+    """
+    try:
+        network = str(netaddr.IPNetwork(value).cidr)
+    except (AddrFormatError, ValueError):
+        return None
+
+    matches = Q()
+    for label, field_name in NETWORK_FIELDS.items():
+        model = apps.get_model(label)
+        if object_types and model not in object_types:
+            continue
+        matches |= Q(
+            object_type=ContentType.objects.get_for_model(model),
+            field=field_name,
+            object_id__in=model.objects.filter(**{f'{field_name}__net_contains_or_equals': network}).values('pk')
+        )
+    return matches or None
+
+
+def search(value, user, object_types=None):
+    """
+    Search the global index for objects of any type matching the given value, limited to those which the user has
+    permission to view. Returns a QuerySet of CachedValues representing the best match for each object, ordered by
+    relevance. Values are matched by substring; an IP address or network also matches the prefixes and aggregates
+    which contain it.
+
+    :param value: The search term
+    :param user: The User performing the search
+    :param object_types: An iterable of models to which the search is limited (optional)
+    """
+    value = value.strip().lower()
+    if not value:
+        return CachedValue.objects.none()
+
+    # Limit the search to the objects of each type which the user is permitted to view
+    permitted = Q()
+    for model in object_types or get_indexed_fields():
+        queryset = model.objects.restrict(user, 'view')
+        if queryset.query.is_empty():
+            continue
+        object_type = ContentType.objects.get_for_model(model)
+        if queryset.query.where:
+            permitted |= Q(object_type=object_type, object_id__in=queryset.values('pk'))
+        else:
+            permitted |= Q(object_type=object_type)
+    if not permitted:
+        return CachedValue.objects.none()
+
+    # Select the most relevant match for each object
+    value_matches = Q(value__contains=value)
+    if network_matches := _get_network_matches(value, object_types):
+        value_matches |= network_matches
+    matches = CachedValue.objects.filter(
+        permitted,
+        value_matches
+    ).annotate(
+        rank=_get_rank(value)
+    ).order_by(
+        'object_type', 'object_id', 'rank', 'weight'
+    ).distinct(
+        'object_type', 'object_id'
+    )
+
+    return CachedValue.objects.filter(
+        pk__in=Subquery(matches.values('pk'))
+    ).annotate(
+        rank=_get_rank(value)
+    ).order_by(
+        'rank', 'weight', 'object_type', 'object_id'
+    )
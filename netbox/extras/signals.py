@@ -1,8 +1,11 @@
 import importlib
 import logging
+import os
 
+from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver, Signal
 from django_prometheus.models import model_deletes, model_inserts, model_updates
 
@@ -11,9 +14,19 @@ from netbox import thread_locals
 from netbox.config import get_config
 from netbox.request_context import get_request
 from netbox.signals import post_clean
+from utilities.utils import jinja2_cache
 from .choices import ObjectChangeActionChoices
-from .models import ConfigRevision, CustomField, ObjectChange
-from .webhooks import enqueue_object, get_snapshots, serialize_for_webhook
+from .context_cache import (
+    ASSIGNMENT_PATHS, get_related_cache_keys, invalidate_all, invalidate_config_context, invalidate_objects,
+    invalidate_on_commit, invalidate_related_objects,
+)
+from .exports import get_export_path
+from .models import (
+    ConfigContext, ConfigContextModel, ConfigRevision, CustomField, CustomLink, ExportTemplate, JobResult, TaggedItem,
+    Webhook,
+)
+from .search import cache_object, get_indexed_fields, remove_object
+from .webhooks import enqueue_object, get_snapshots, serialize_for_webhook, webhook_cache
 
 #
 # Change logging/webhooks
@@ -52,21 +65,20 @@ def handle_changed_object(sender, instance, **kwargs):
     else:
         return
 
-    # Record an ObjectChange if applicable
+    # Record an ObjectChange if applicable (ObjectChanges are written in bulk once the request has completed)
+    changelog_buffer = thread_locals.changelog_buffer
     if hasattr(instance, 'to_objectchange'):
         if m2m_changed:
-            ObjectChange.objects.filter(
-                changed_object_type=ContentType.objects.get_for_model(instance),
-                changed_object_id=instance.pk,
-                request_id=request.id
-            ).update(
+            changelog_buffer.update_postchange_data(
+                content_type=ContentType.objects.get_for_model(instance),
+                object_id=instance.pk,
                 postchange_data=instance.to_objectchange(action).postchange_data
             )
         else:
             objectchange = instance.to_objectchange(action)
             objectchange.user = request.user
             objectchange.request_id = request.id
-            objectchange.save()
+            changelog_buffer.append(objectchange)
 
     # If this is an M2M change, update the previously queued webhook (from post_save)
     webhook_queue = thread_locals.webhook_queue
@@ -98,7 +110,7 @@ def handle_deleted_object(sender, instance, **kwargs):
         objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_DELETE)
         objectchange.user = request.user
         objectchange.request_id = request.id
-        objectchange.save()
+        thread_locals.changelog_buffer.append(objectchange)
 
     # Enqueue webhooks
     webhook_queue = thread_locals.webhook_queue
@@ -119,6 +131,16 @@ def clear_webhook_queue(sender, **kwargs):
     webhook_queue.clear()
 
 
+@receiver((post_save, post_delete), sender=Webhook)
+@receiver(m2m_changed, sender=Webhook.content_types.through)
+def invalidate_webhook_cache(sender, **kwargs):
+    """
+    Invalidate the cached index of enabled webhooks whenever a Webhook is modified (and again once the change has been
+    committed).
+    """
+    webhook_cache.invalidate()
+
+
 #
 # Custom fields
 #
@@ -160,6 +182,150 @@ m2m_changed.connect(handle_cf_added_obj_types, sender=CustomField.content_types.
 m2m_changed.connect(handle_cf_removed_obj_types, sender=CustomField.content_types.through)
 
 
+#
+# Config context caching
+#
+
+# Models whose own relationships determine which ConfigContexts apply to a Device or VirtualMachine
+CONFIG_CONTEXT_DEPENDENCIES = (
+    'dcim.Region', 'dcim.SiteGroup', 'dcim.Site', 'tenancy.Tenant', 'virtualization.Cluster',
+)
+
+
+def handle_config_context_saved(sender, instance, created, **kwargs):
+    """
+    Evict the cached contexts of all objects to which a ConfigContext applies when it is modified.
+    """
+    if created:
+        # A new ConfigContext applies to all objects until it has been assigned
+        invalidate_on_commit(invalidate_all)
+    else:
+        invalidate_on_commit(invalidate_config_context, instance)
+
+
+def handle_config_context_deleted(sender, instance, **kwargs):
+    """
+    Evict the cached contexts of all objects to which a ConfigContext applies before it is deleted.
+    """
+    invalidate_config_context(instance)
+
+
+def handle_config_context_assignment(sender, instance, reverse, **kwargs):
+    """
+    Evict the cached contexts of all objects to which a ConfigContext applies both before and after its assignments
+    are changed.
+    """
+    if not reverse:
+        invalidate_on_commit(invalidate_config_context, instance)
+
+
+def handle_tags_changed(sender, instance, action, **kwargs):
+    """
+    Evict the cached context of a Device or VirtualMachine when its tags are changed.
+    """
+    if isinstance(instance, ConfigContextModel) and action.startswith('post_'):
+        invalidate_on_commit(invalidate_objects, instance._meta.model.objects.filter(pk=instance.pk))
+
+
+def handle_dependency_saved(sender, instance, created, **kwargs):
+    """
+    Evict the cached contexts of all objects related to a Site, Cluster, etc. when it is modified.
+    """
+    if not created:
+        invalidate_on_commit(invalidate_related_objects, instance)
+
+
+def handle_assigned_object_pre_delete(sender, instance, **kwargs):
+    """
+    Record the cached contexts which depend on an object to which ConfigContexts may be assigned, and the
+    ConfigContexts assigned to it, prior to its deletion.
+    """
+    instance._config_context_cache_keys = get_related_cache_keys(instance)
+    instance._config_contexts = [
+        config_context
+        for field in ConfigContext._meta.many_to_many if field.related_model is sender
+        for config_context in ConfigContext.objects.filter(**{field.name: instance})
+    ]
+
+
+def handle_assigned_object_deleted(sender, instance, **kwargs):
+    """
+    Evict the cached contexts recorded by handle_assigned_object_pre_delete() once the object has been deleted.
+    """
+    if keys := getattr(instance, '_config_context_cache_keys', None):
+        invalidate_on_commit(cache.delete_many, keys)
+    for config_context in getattr(instance, '_config_contexts', []):
+        invalidate_on_commit(invalidate_config_context, config_context)
+
+
+post_save.connect(handle_config_context_saved, sender=ConfigContext)
+pre_delete.connect(handle_config_context_deleted, sender=ConfigContext)
+m2m_changed.connect(handle_tags_changed, sender=TaggedItem)
+for field_name in ASSIGNMENT_PATHS['dcim.device']:
+    field = ConfigContext._meta.get_field(field_name)
+    m2m_changed.connect(handle_config_context_assignment, sender=field.remote_field.through)
+    pre_delete.connect(handle_assigned_object_pre_delete, sender=field.related_model)
+    post_delete.connect(handle_assigned_object_deleted, sender=field.related_model)
+for model_name in CONFIG_CONTEXT_DEPENDENCIES:
+    post_save.connect(handle_dependency_saved, sender=apps.get_model(model_name))
+
+
+#
+# Search index
+#
+
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """
+    Update the global search index when a searchable object is created or modified.
+    """
+    if not raw:
+        cache_object(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Remove a searchable object from the global search index when it is deleted.
+    """
+    remove_object(instance)
+
+
+# Receivers are connected only for searchable models, as a post_delete receiver prevents the fast deletion of objects
+for model in get_indexed_fields():
+    post_save.connect(update_search_index, sender=model)
+    post_delete.connect(remove_from_search_index, sender=model)
+
+
+#
+# Background exports
+#
+
+@receiver(post_delete, sender=JobResult)
+def delete_export_file(sender, instance, **kwargs):
+    """
+    Delete the output file (if any) of a background export job when its JobResult is deleted.
+    """
+    path = get_export_path(instance)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+#
+# Jinja2 templates
+#
+
+def clear_jinja2_cache(sender, **kwargs):
+    """
+    Discard compiled Jinja2 templates when an object defining templates is modified or deleted. (Compiled templates are
+    keyed by their source, so this only serves to release templates which are no longer in use sooner.)
+    """
+    jinja2_cache.clear()
+
+
+for model in (CustomLink, ExportTemplate, Webhook):
+    post_save.connect(clear_jinja2_cache, sender=model)
+    post_delete.connect(clear_jinja2_cache, sender=model)
+
+
 #
 # Custom validation
 #
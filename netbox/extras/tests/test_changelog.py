@@ -2,10 +2,13 @@ from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
 from rest_framework import status
 
+from circuits.models import Provider
 from dcim.choices import SiteStatusChoices
 from dcim.models import Site
 from extras.choices import *
 from extras.models import CustomField, ObjectChange, Tag
+from netbox.bulk import bulk_update_objects, supports_bulk_update
+from utilities.ordering import naturalize
 from utilities.testing import APITestCase
 from utilities.testing.utils import create_tags, post_data
 from utilities.testing.views import ModelViewTestCase
@@ -170,6 +173,84 @@ class ChangeLogViewTest(ModelViewTestCase):
         self.assertEqual(objectchange.postchange_data['status'], form_data['status'])
         self.assertEqual(objectchange.postchange_data['description'], form_data['description'])
 
+    def test_bulk_update_objects_natural_ordering(self):
+        site = Site.objects.create(name='Site 9', slug='site-9')
+        site.name = 'Site 10'
+        bulk_update_objects([site], ['name'])
+
+        # The naturalized name must be updated along with the name
+        site.refresh_from_db()
+        self.assertEqual(site._name, naturalize('Site 10', max_length=Site._meta.get_field('_name').max_length))
+
+    def test_bulk_update_objects_set_based(self):
+        # Provider does not override save(), so bulk edits are written without saving each object
+        self.assertTrue(supports_bulk_update(Provider, ['account']))
+        tags = create_tags('Tag 1', 'Tag 2', 'Tag 3')
+        providers = (
+            Provider(name='Provider 1', slug='provider-1'),
+            Provider(name='Provider 2', slug='provider-2'),
+            Provider(name='Provider 3', slug='provider-3'),
+        )
+        Provider.objects.bulk_create(providers)
+        for provider in providers:
+            provider.tags.set([tags[0], tags[1]])
+
+        form_data = {
+            'pk': [provider.pk for provider in providers],
+            '_apply': True,
+            'account': '1234',
+            'add_tags': [tags[2].pk],
+            'remove_tags': [tags[0].pk],
+        }
+
+        request = {
+            'path': reverse('circuits:provider_bulk_edit'),
+            'data': post_data(form_data),
+        }
+        self.add_permissions('circuits.view_provider', 'circuits.change_provider', 'extras.view_tag')
+        response = self.client.post(**request)
+        self.assertHttpStatus(response, 302)
+
+        for provider in providers:
+            provider.refresh_from_db()
+            self.assertEqual(provider.account, form_data['account'])
+            self.assertEqual(sorted(provider.tags.names()), ['Tag 2', 'Tag 3'])
+
+            objectchange = ObjectChange.objects.get(
+                changed_object_type=ContentType.objects.get_for_model(Provider),
+                changed_object_id=provider.pk
+            )
+            self.assertEqual(objectchange.action, ObjectChangeActionChoices.ACTION_UPDATE)
+            self.assertEqual(objectchange.prechange_data['account'], '')
+            self.assertEqual(objectchange.prechange_data['tags'], ['Tag 1', 'Tag 2'])
+            self.assertEqual(objectchange.postchange_data['account'], form_data['account'])
+            self.assertEqual(objectchange.postchange_data['tags'], ['Tag 2', 'Tag 3'])
+
+    def test_bulk_import_objects(self):
+        csv_data = (
+            "name,slug,account",
+            "Provider 1,provider-1,1001",
+            "Provider 2,provider-2,1002",
+            "Provider 3,provider-3,1003",
+        )
+
+        request = {
+            'path': reverse('circuits:provider_import'),
+            'data': {'csv': '\n'.join(csv_data)},
+        }
+        self.add_permissions('circuits.view_provider', 'circuits.add_provider')
+        response = self.client.post(**request)
+        self.assertHttpStatus(response, 200)
+
+        for provider in Provider.objects.all():
+            objectchange = ObjectChange.objects.get(
+                changed_object_type=ContentType.objects.get_for_model(Provider),
+                changed_object_id=provider.pk
+            )
+            self.assertEqual(objectchange.action, ObjectChangeActionChoices.ACTION_CREATE)
+            self.assertEqual(objectchange.postchange_data['name'], provider.name)
+            self.assertEqual(objectchange.postchange_data['account'], provider.account)
+
     def test_bulk_delete_objects(self):
         sites = (
             Site(name='Site 1', slug='site-1', status=SiteStatusChoices.STATUS_ACTIVE),
@@ -443,3 +524,58 @@ class ChangeLogAPITest(APITestCase):
         self.assertEqual(objectchange.prechange_data['name'], 'Site 1')
         self.assertEqual(objectchange.prechange_data['slug'], 'site-1')
         self.assertEqual(objectchange.postchange_data, None)
+
+    def test_bulk_edit_objects_rollback(self):
+        """
+        ObjectChanges for changes which were rolled back (e.g. due to a validation error) should not be recorded.
+        """
+        sites = (
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+            Site(name='Site 3', slug='site-3'),
+        )
+        Site.objects.bulk_create(sites)
+
+        data = (
+            {
+                'id': sites[0].pk,
+                'name': 'Site A',
+            },
+            {
+                'id': sites[1].pk,
+                'name': 'Site 3',  # Duplicate name
+            },
+        )
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.change_site')
+
+        response = self.client.patch(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Site.objects.filter(name='Site A').count(), 0)
+        self.assertEqual(ObjectChange.objects.count(), 0)
+
+    def test_changes_share_request_id(self):
+        data = (
+            {
+                'name': 'Site 1',
+                'slug': 'site-1',
+                'tags': [{'name': 'Tag 1'}],
+            },
+            {
+                'name': 'Site 2',
+                'slug': 'site-2',
+                'tags': [{'name': 'Tag 2'}],
+            },
+        )
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        objectchanges = ObjectChange.objects.order_by('time')
+        self.assertEqual(len(objectchanges), 2)
+        self.assertEqual(objectchanges[0].request_id, objectchanges[1].request_id)
+        self.assertEqual(objectchanges[0].user_name, self.user.username)
+        self.assertEqual(objectchanges[0].postchange_data['tags'], ['Tag 1'])
+        self.assertEqual(objectchanges[1].postchange_data['tags'], ['Tag 2'])
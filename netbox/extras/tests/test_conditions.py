@@ -30,6 +30,10 @@ class ConditionTestCase(TestCase):
             # dict type is unsupported
             Condition('x', 1, dict())
 
+    def test_invalid_regex(self):
+        with self.assertRaises(ValueError):
+            Condition('x', '[a-z', 'regex')
+
     def test_invalid_op_type(self):
         with self.assertRaises(ValueError):
             # 'gt' supports only numeric values
@@ -313,6 +313,35 @@ class CustomFieldTest(TestCase):
         instance.refresh_from_db()
         self.assertIsNone(instance.custom_field_data.get(cf.name))
 
+    def test_prefetch_objects(self):
+        vlans = (
+            VLAN(name='VLAN 1', vid=1),
+            VLAN(name='VLAN 2', vid=2),
+            VLAN(name='VLAN 3', vid=3),
+        )
+        VLAN.objects.bulk_create(vlans)
+        cf = CustomField.objects.create(
+            name='object_field',
+            type=CustomFieldTypeChoices.TYPE_MULTIOBJECT,
+            object_type=ContentType.objects.get_for_model(VLAN),
+            required=False
+        )
+        values = [[vlans[2].pk, vlans[0].pk], None, [vlans[1].pk]]
+
+        # Retrieve the referenced objects with a single query
+        with self.assertNumQueries(1):
+            cf.prefetch_objects(values)
+
+        # Deserialization of prefetched values should not require any further queries
+        with self.assertNumQueries(0):
+            self.assertEqual(cf.deserialize(values[0]), [vlans[0], vlans[2]])
+            self.assertIsNone(cf.deserialize(values[1]))
+            self.assertEqual(cf.deserialize(values[2]), [vlans[1]])
+
+        # Values which were not prefetched are retrieved from the database
+        vlan = VLAN.objects.create(name='VLAN 4', vid=4)
+        self.assertEqual(list(cf.deserialize([vlan.pk])), [vlan])
+
     def test_rename_customfield(self):
         obj_type = ContentType.objects.get_for_model(Site)
         FIELD_DATA = 'abc'
@@ -510,6 +539,24 @@ class CustomFieldAPITest(APITestCase):
             site2_cfvs['multiobject_field']
         )
 
+    def test_list_objects_with_custom_field_data(self):
+        """
+        Validate that object custom field values are resolved correctly when listing objects.
+        """
+        site2_cfvs = Site.objects.get(name='Site 2').custom_field_data
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.view_site')
+
+        response = self.client.get(f'{url}?ordering=name', **self.header)
+        site1_data, site2_data = response.data['results']
+        self.assertIsNone(site1_data['custom_fields']['object_field'])
+        self.assertIsNone(site1_data['custom_fields']['multiobject_field'])
+        self.assertEqual(site2_data['custom_fields']['object_field']['id'], site2_cfvs['object_field'])
+        self.assertEqual(
+            [obj['id'] for obj in site2_data['custom_fields']['multiobject_field']],
+            site2_cfvs['multiobject_field']
+        )
+
     def test_create_single_object_with_defaults(self):
         """
         Create a new site with no specified custom field values and check that it received the default values.
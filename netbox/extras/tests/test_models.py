@@ -1,7 +1,12 @@
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.test import TestCase
 
-from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Platform, Region, Site, SiteGroup
-from extras.models import ConfigContext, Tag
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Platform, Rack, Region, Site, SiteGroup
+from extras.context_cache import get_cache_key, get_version, prefetch_config_contexts
+from extras.models import ConfigContext, ExportTemplate, Tag
 from tenancy.models import Tenant, TenantGroup
 from virtualization.models import Cluster, ClusterGroup, ClusterType, VirtualMachine
 
@@ -15,6 +20,30 @@ class TagTest(TestCase):
         self.assertEqual(tag.slug, 'testing-unicode-台灣')
 
 
+class ExportTemplateTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)
+        ])
+
+    @mock.patch('extras.models.models.EXPORT_CHUNK_SIZE', 10)
+    def test_render_stream(self):
+        export_template = ExportTemplate(
+            content_type=ContentType.objects.get_for_model(Site),
+            name='Test',
+            template_code='{% for site in queryset %}{{ site.name }}\r\n{% endfor %}'
+        )
+        queryset = Site.objects.order_by('name')
+
+        response = export_template.render_to_response(queryset)
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(content, export_template.render(queryset))
+        self.assertEqual(content, ''.join(f'Site {i}\n' for i in range(1, 6)))
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="netbox_sites"')
+
+
 class ConfigContextTest(TestCase):
     """
     These test cases deal with the weighting, ordering, and deep merge logic of config context data.
@@ -378,3 +407,133 @@ class ConfigContextTest(TestCase):
         annotated_queryset = Device.objects.filter(name=device.name).annotate_config_context_data()
         self.assertEqual(ConfigContext.objects.get_for_object(device).count(), 2)
         self.assertEqual(device.get_config_context(), annotated_queryset[0].get_config_context())
+
+
+class ConfigContextCacheTest(TestCase):
+    """
+    Verify that cached config contexts are invalidated when the objects which determine them are modified.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        devicerole = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        cls.region = Region.objects.create(name='Region 1', slug='region-1')
+        cls.sites = (
+            Site.objects.create(name='Site 1', slug='site-1', region=cls.region),
+            Site.objects.create(name='Site 2', slug='site-2'),
+        )
+        cls.tag = Tag.objects.create(name='Tag 1', slug='tag-1')
+        cls.devices = (
+            Device.objects.create(name='Device 1', device_type=devicetype, device_role=devicerole, site=cls.sites[0]),
+            Device.objects.create(name='Device 2', device_type=devicetype, device_role=devicerole, site=cls.sites[1]),
+        )
+
+    def get_contexts(self):
+        return [device.get_config_context() for device in Device.objects.order_by('name')]
+
+    def test_context_modified(self):
+        context = ConfigContext.objects.create(name='Context 1', data={'a': 1})
+        context.sites.add(self.sites[0])
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {}])
+
+        context.data = {'a': 2}
+        context.save()
+        self.assertEqual(self.get_contexts(), [{'a': 2}, {}])
+
+        context.delete()
+        self.assertEqual(self.get_contexts(), [{}, {}])
+
+    def test_context_assignments_modified(self):
+        context = ConfigContext.objects.create(name='Context 1', data={'a': 1})
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {'a': 1}])
+
+        # Narrow the context to Site 1 (via its region)
+        context.regions.add(self.region)
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {}])
+
+        # Broaden the context to both sites
+        context.sites.add(*self.sites)
+        context.regions.clear()
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {'a': 1}])
+
+        # Move Site 2 into the assigned region
+        context.sites.clear()
+        context.regions.add(self.region)
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {}])
+        self.sites[1].region = self.region
+        self.sites[1].save()
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {'a': 1}])
+
+    def test_rack_site_modified(self):
+        rack = Rack.objects.create(name='Rack 1', site=self.sites[1])
+        Device.objects.filter(pk=self.devices[1].pk).update(rack=rack)
+        context = ConfigContext.objects.create(name='Context 1', data={'a': 1})
+        context.regions.add(self.region)
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {}])
+
+        # Moving the Rack to Site 1 also moves its Device into the assigned region
+        rack.site = self.sites[0]
+        rack.save()
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {'a': 1}])
+
+    def test_tenant_group_modified(self):
+        tenant_groups = (
+            TenantGroup.objects.create(name='Tenant Group 1', slug='tenant-group-1'),
+            TenantGroup.objects.create(name='Tenant Group 2', slug='tenant-group-2'),
+        )
+        tenant = Tenant.objects.create(name='Tenant 1', slug='tenant-1', group=tenant_groups[0])
+        Device.objects.filter(pk=self.devices[0].pk).update(tenant=tenant)
+        context = ConfigContext.objects.create(name='Context 1', data={'a': 1})
+        context.tenant_groups.add(tenant_groups[0])
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {}])
+
+        # Move the Tenant to another group
+        tenant.group = tenant_groups[1]
+        tenant.save()
+        self.assertEqual(self.get_contexts(), [{}, {}])
+
+    def test_invalidated_on_commit(self):
+        context = ConfigContext.objects.create(name='Context 1', data={'a': 1})
+        context.sites.add(self.sites[0])
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {}])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            context.data = {'a': 2}
+            context.save()
+
+            # Simulate another process caching the context prior to the commit
+            device = Device.objects.get(pk=self.devices[0].pk)
+            cache.set(get_cache_key(Device, device.pk, device.last_updated, get_version()), {'a': 1})
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {}])
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.get_contexts(), [{'a': 2}, {}])
+
+    def test_device_modified(self):
+        context = ConfigContext.objects.create(name='Context 1', data={'a': 1})
+        context.tags.add(self.tag)
+        self.assertEqual(self.get_contexts(), [{}, {}])
+
+        device = Device.objects.get(pk=self.devices[1].pk)
+        device.tags.add(self.tag)
+        self.assertEqual(self.get_contexts(), [{}, {'a': 1}])
+
+        device.local_context_data = {'b': 2}
+        device.save()
+        self.assertEqual(self.get_contexts(), [{}, {'a': 1, 'b': 2}])
+
+        # Deleting the tag removes the only assignment, so the context applies to all devices
+        self.tag.delete()
+        self.assertEqual(self.get_contexts(), [{'a': 1}, {'a': 1, 'b': 2}])
+
+    def test_prefetch_config_contexts(self):
+        context = ConfigContext.objects.create(name='Context 1', data={'a': 1})
+        context.sites.add(self.sites[1])
+
+        devices = list(Device.objects.order_by('name'))
+        self.devices[0].get_config_context()
+        prefetch_config_contexts(devices)
+        with self.assertNumQueries(0):
+            self.assertEqual([device.get_config_context() for device in devices], [{}, {'a': 1}])
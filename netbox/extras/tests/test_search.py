@@ -0,0 +1,76 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from netaddr import IPNetwork
+
+from dcim.models import Site
+from extras.models import CachedValue
+from extras.search import search
+from ipam.models import Prefix
+from tenancy.models import Tenant
+from users.models import ObjectPermission
+from utilities.testing import TestCase
+
+
+class SearchIndexTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create((
+            Site(name='Site 1', slug='site-1', description='foo'),
+            Site(name='Foo', slug='foo'),
+            Site(name='Foobar', slug='foobar'),
+            Site(name='Site 4', slug='site-4'),
+        ))
+        Tenant.objects.create(name='Tenant Foo', slug='tenant-foo')
+        call_command('reindex', verbosity=0)
+
+    def test_index_updated(self):
+        site = Site.objects.get(slug='site-4')
+        site.description = 'Description Foo'
+        site.save()
+        self.assertTrue(CachedValue.objects.filter(object_id=site.pk, value='description foo').exists())
+
+        site.delete()
+        self.assertFalse(CachedValue.objects.filter(
+            object_type=ContentType.objects.get_for_model(Site),
+            object_id=site.pk
+        ).exists())
+
+    def test_search_ranking(self):
+        self.add_permissions('dcim.view_site', 'tenancy.view_tenant')
+
+        results = list(search('FOO', self.user))
+        self.assertEqual([result.object for result in results], [
+            Site.objects.get(slug='foo'),           # Exact match on name
+            Site.objects.get(slug='site-1'),        # Exact match on description
+            Site.objects.get(slug='foobar'),        # Partial match at start of name
+            Tenant.objects.get(slug='tenant-foo'),  # Partial match
+        ])
+
+        results = search('foo', self.user, object_types=[Tenant])
+        self.assertEqual([result.object for result in results], [Tenant.objects.get(slug='tenant-foo')])
+
+    def test_search_permissions(self):
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints={'name__startswith': 'Foo'},
+            actions=['view']
+        )
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+
+        results = search('foo', self.user)
+        self.assertEqual(
+            sorted(result.object.slug for result in results),
+            ['foo', 'foobar']
+        )
+
+    def test_search_network(self):
+        prefix = Prefix.objects.create(prefix=IPNetwork('10.1.0.0/16'))
+        Prefix.objects.create(prefix=IPNetwork('10.2.0.0/16'))
+        self.add_permissions('ipam.view_prefix')
+
+        # Prefixes containing the searched address are matched
+        results = search('10.1.2.3', self.user, object_types=[Prefix])
+        self.assertEqual([result.object for result in results], [prefix])
@@ -1,12 +1,16 @@
+import os
 import urllib.parse
 import uuid
 
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
 from django.urls import reverse
 
 from dcim.models import Site
+from dcim.tables import SiteTable
 from extras.choices import *
+from extras.exports import get_export_kwargs, get_export_path, run_export
 from extras.models import *
 from utilities.testing import ViewTestCases, TestCase
 
@@ -338,3 +342,68 @@ class CustomLinkTest(TestCase):
         response = self.client.get(site.get_absolute_url(), follow=True)
         self.assertEqual(response.status_code, 200)
         self.assertIn(f'FOO {site.name} BAR', str(response.content))
+
+
+class ExportResultTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create((
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+        ))
+
+    def test_download_export(self):
+        job_result = JobResult.objects.create(
+            name='netbox_sites.csv',
+            obj_type=ContentType.objects.get_for_model(Site),
+            user=self.user,
+            job_id=uuid.uuid4()
+        )
+        run_export(
+            job_result,
+            **get_export_kwargs(Site.objects.order_by('name')),
+            table_class=SiteTable,
+            columns=['name', 'slug']
+        )
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_COMPLETED)
+
+        response = self.client.get(reverse('extras:export_result', kwargs={'job_result_pk': job_result.pk}))
+        self.assertHttpStatus(response, 200)
+
+        response = self.client.get(reverse('extras:export_download', kwargs={'job_result_pk': job_result.pk}))
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="netbox_sites.csv"')
+        self.assertEqual(b''.join(response.streaming_content), b'Name,Slug\r\nSite 1,site-1\r\nSite 2,site-2\r\n')
+        response.close()
+
+        # The table's ordering is applied to the exported objects
+        run_export(
+            job_result,
+            **get_export_kwargs(Site.objects.order_by('name')),
+            table_class=SiteTable,
+            columns=['name', 'slug'],
+            ordering=['-name']
+        )
+        with open(get_export_path(job_result), 'rb') as f:
+            self.assertEqual(f.read(), b'Name,Slug\r\nSite 2,site-2\r\nSite 1,site-1\r\n')
+
+        # Exports are available only to the user who initiated them
+        job_result.user = User.objects.create_user(username='otheruser')
+        job_result.save()
+        response = self.client.get(reverse('extras:export_download', kwargs={'job_result_pk': job_result.pk}))
+        self.assertHttpStatus(response, 404)
+
+        # Deleting the JobResult deletes the exported file
+        path = get_export_path(job_result)
+        job_result.delete()
+        self.assertFalse(os.path.exists(path))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'], LOGIN_REQUIRED=False)
+    def test_background_export_anonymous(self):
+        self.client.logout()
+
+        # Anonymous users cannot run background exports
+        response = self.client.get(f"{reverse('dcim:site_list')}?export=table&background=true")
+        self.assertHttpStatus(response, 302)
+        self.assertFalse(JobResult.objects.exists())
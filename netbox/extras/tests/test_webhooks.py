@@ -4,17 +4,21 @@ from unittest.mock import patch
 
 import django_rq
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from requests import Session
 from rest_framework import status
 
 from dcim.choices import SiteStatusChoices
 from dcim.models import Site
-from extras.choices import ObjectChangeActionChoices
+from extras.choices import ObjectChangeActionChoices, WebhookBatchModeChoices
 from extras.models import Tag, Webhook
-from extras.webhooks import enqueue_object, flush_webhooks, generate_signature, serialize_for_webhook
-from extras.webhooks_worker import eval_conditions, process_webhook
+from extras.webhooks import (
+    eval_conditions, enqueue_object, flush_webhooks, generate_signature, serialize_for_webhook, webhook_cache,
+)
+from extras.webhooks_worker import process_webhook, process_webhook_batch
 from utilities.testing import APITestCase
 
 
@@ -75,6 +79,24 @@ class WebhookTest(APITestCase):
         self.assertEqual(job.kwargs['snapshots']['postchange']['name'], 'Site 1')
         self.assertEqual(job.kwargs['snapshots']['postchange']['tags'], ['Bar', 'Foo'])
 
+    def test_webhook_cache(self):
+        # Simulate committing the test data, so that the index of webhooks may be cached by the process
+        with self.captureOnCommitCallbacks(execute=True):
+            webhook_cache.invalidate()
+        self.addCleanup(webhook_cache.invalidate)
+
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+        response = self.client.post(url, {'name': 'Site 1', 'slug': 'site-1'}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Webhooks should not be retrieved again for subsequent requests
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {'name': 'Site 2', 'slug': 'site-2'}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertFalse([query for query in queries.captured_queries if 'extras_webhook' in query['sql']])
+        self.assertEqual(self.queue.count, 2)
+
     def test_enqueue_webhook_bulk_create(self):
         # Create multiple objects via the REST API
         data = [
@@ -252,6 +274,57 @@ class WebhookTest(APITestCase):
             self.assertEqual(job.kwargs['snapshots']['prechange']['name'], sites[i].name)
             self.assertEqual(job.kwargs['snapshots']['prechange']['tags'], ['Bar', 'Foo'])
 
+    def test_enqueue_webhook_bulk_create_batched(self):
+        Webhook.objects.filter(type_create=True).update(batch_mode=WebhookBatchModeChoices.BATCH_SEPARATE)
+
+        # Create multiple objects via the REST API
+        data = [
+            {'name': 'Site 1', 'slug': 'site-1'},
+            {'name': 'Site 2', 'slug': 'site-2'},
+            {'name': 'Site 3', 'slug': 'site-3'},
+        ]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Verify that a single job was queued for all objects
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.func_name, 'extras.webhooks_worker.process_webhook_batch')
+        self.assertEqual(job.kwargs['webhook'], Webhook.objects.get(type_create=True))
+        self.assertEqual(len(job.kwargs['events']), 3)
+        for i, event in enumerate(job.kwargs['events']):
+            self.assertEqual(event['event'], ObjectChangeActionChoices.ACTION_CREATE)
+            self.assertEqual(event['model_name'], 'site')
+            self.assertEqual(event['data']['id'], response.data[i]['id'])
+            self.assertEqual(event['snapshots']['postchange']['name'], response.data[i]['name'])
+
+    def test_enqueue_object_without_webhooks(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        Webhook.objects.filter(type_create=True).delete()
+
+        # No webhooks exist for the creation of Sites, so the object should not be queued
+        webhooks_queue = []
+        enqueue_object(
+            webhooks_queue,
+            instance=site,
+            user=self.user,
+            request_id=uuid.uuid4(),
+            action=ObjectChangeActionChoices.ACTION_CREATE
+        )
+        self.assertEqual(len(webhooks_queue), 0)
+
+        # A webhook exists for updates
+        enqueue_object(
+            webhooks_queue,
+            instance=site,
+            user=self.user,
+            request_id=uuid.uuid4(),
+            action=ObjectChangeActionChoices.ACTION_UPDATE
+        )
+        self.assertEqual(len(webhooks_queue), 1)
+
     def test_webhook_conditions(self):
         # Create a conditional Webhook
         webhook = Webhook(
@@ -283,6 +356,56 @@ class WebhookTest(APITestCase):
         # Evaluate the conditions (status='active')
         self.assertTrue(eval_conditions(webhook, data))
 
+    def test_webhook_conditions_invalid_data(self):
+        # Define a numeric comparison, which cannot be evaluated against a null value
+        webhook = Webhook(
+            name='Conditional Webhook',
+            type_create=True,
+            type_update=True,
+            payload_url='http://localhost/',
+            conditions={
+                'and': [
+                    {
+                        'attr': 'latitude',
+                        'value': 10,
+                        'op': 'gt',
+                    }
+                ]
+            }
+        )
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        data = serialize_for_webhook(site)
+
+        # The conditions should be treated as not met, rather than raising an exception
+        with self.assertLogs('netbox.webhooks', level='ERROR'):
+            self.assertFalse(eval_conditions(webhook, data))
+
+    def test_enqueue_webhook_conditions(self):
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.conditions = {
+            'and': [
+                {
+                    'attr': 'status.value',
+                    'value': 'active',
+                }
+            ]
+        }
+        webhook.save()
+
+        # Create an active and a planned Site via the REST API
+        data = [
+            {'name': 'Site 1', 'slug': 'site-1', 'status': SiteStatusChoices.STATUS_ACTIVE},
+            {'name': 'Site 2', 'slug': 'site-2', 'status': SiteStatusChoices.STATUS_PLANNED},
+        ]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Verify that a job was queued only for the Site matching the webhook's conditions
+        self.assertEqual(self.queue.count, 1)
+        self.assertEqual(self.queue.jobs[0].kwargs['data']['name'], 'Site 1')
+
     def test_webhooks_worker(self):
 
         request_id = uuid.uuid4()
@@ -329,3 +452,38 @@ class WebhookTest(APITestCase):
         # Patch the Session object with our dummy_send() method, then process the webhook for sending
         with patch.object(Session, 'send', dummy_send) as mock_send:
             process_webhook(**job.kwargs)
+
+    def test_webhooks_worker_batch_array(self):
+        webhook = Webhook.objects.get(type_create=True)
+        webhook.batch_mode = WebhookBatchModeChoices.BATCH_ARRAY
+        webhook.save()
+        requests_sent = []
+
+        def dummy_send(_, request, **kwargs):
+            requests_sent.append(request)
+            return HttpResponse()
+
+        # Enqueue webhooks for processing
+        webhooks_queue = []
+        for i in range(1, 4):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}')
+            enqueue_object(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            )
+        flush_webhooks(webhooks_queue)
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+
+        with patch.object(Session, 'send', dummy_send):
+            process_webhook_batch(**job.kwargs)
+
+        # All events should have been delivered as a single JSON array
+        self.assertEqual(len(requests_sent), 1)
+        request = requests_sent[0]
+        self.assertEqual(request.headers['X-Hook-Signature'], generate_signature(request.body, webhook.secret))
+        body = json.loads(request.body)
+        self.assertEqual([event['data']['name'] for event in body], ['Site 1', 'Site 2', 'Site 3'])
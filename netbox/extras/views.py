@@ -1,7 +1,10 @@
+import os
+
 from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, Q
-from django.http import Http404, HttpResponseForbidden
+from django.http import FileResponse, Http404, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.generic import View
@@ -15,6 +18,7 @@ from utilities.utils import copy_safe_request, count_related, get_viewname, norm
 from utilities.views import ContentTypePermissionRequiredMixin
 from . import filtersets, forms, tables
 from .choices import JobResultStatusChoices
+from .exports import get_export_path
 from .models import *
 from .reports import get_report, get_reports, run_report
 from .scripts import get_scripts, run_script
@@ -296,7 +300,8 @@ class ConfigContextView(generic.ObjectView):
         if request.GET.get('format') in ['json', 'yaml']:
             format = request.GET.get('format')
             if request.user.is_authenticated:
-                request.user.config.set('data_format', format, commit=True)
+                if request.user.config.set('data_format', format):
+                    request.user.config.save_deferred()
         elif request.user.is_authenticated:
             format = request.user.config.get('data_format', 'json')
         else:
@@ -341,7 +346,8 @@ class ObjectConfigContextView(generic.ObjectView):
         if request.GET.get('format') in ['json', 'yaml']:
             format = request.GET.get('format')
             if request.user.is_authenticated:
-                request.user.config.set('data_format', format, commit=True)
+                if request.user.config.set('data_format', format):
+                    request.user.config.save_deferred()
         elif request.user.is_authenticated:
             format = request.user.config.get('data_format', 'json')
         else:
@@ -758,3 +764,53 @@ class ScriptResultView(ContentTypePermissionRequiredMixin, GetScriptMixin, View)
             'result': result,
             'class_name': script.__class__.__name__
         })
+
+
+#
+# Background exports
+#
+
+class ExportResultMixin:
+
+    def get_result(self, request, job_result_pk):
+        """
+        Return the JobResult for an export. Only the user who initiated an export (or a superuser) may access it.
+        """
+        result = get_object_or_404(JobResult.objects.all(), pk=job_result_pk)
+        if result.user != request.user and not request.user.is_superuser:
+            raise Http404
+        return result
+
+
+class ExportResultView(LoginRequiredMixin, ExportResultMixin, View):
+    """
+    Display the status of a background export job, and a link to download its output once completed.
+    """
+    def get(self, request, job_result_pk):
+        result = self.get_result(request, job_result_pk)
+
+        # If this is an HTMX request, return only the result HTML
+        if is_htmx(request):
+            response = render(request, 'extras/htmx/export_result.html', {
+                'result': result,
+            })
+            if result.completed:
+                response.status_code = 286
+            return response
+
+        return render(request, 'extras/export_result.html', {
+            'result': result,
+        })
+
+
+class ExportDownloadView(LoginRequiredMixin, ExportResultMixin, View):
+    """
+    Download the output of a completed background export job.
+    """
+    def get(self, request, job_result_pk):
+        result = self.get_result(request, job_result_pk)
+        path = get_export_path(result)
+        if result.status != JobResultStatusChoices.STATUS_COMPLETED or not os.path.exists(path):
+            raise Http404
+
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=result.data['filename'])
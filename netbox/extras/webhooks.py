@@ -1,17 +1,156 @@
 import hashlib
 import hmac
+import logging
+import uuid
 from collections import defaultdict
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.utils import timezone
 from django_rq import get_queue
+from prometheus_client import Counter, Gauge
 
 from utilities.api import get_serializer_for_model
 from utilities.utils import serialize_object
 from .choices import *
+from .conditions import ConditionSet
 from .models import Webhook
 from .registry import registry
 
+webhook_jobs_enqueued = Counter(
+    'netbox_webhook_jobs_enqueued',
+    'Number of webhook jobs placed into the background task queue',
+    ['batch_mode']
+)
+webhook_events_enqueued = Counter(
+    'netbox_webhook_events_enqueued',
+    'Number of webhook events placed into the background task queue',
+    ['batch_mode']
+)
+webhook_queue_depth = Gauge(
+    'netbox_webhook_queue_depth',
+    'Number of jobs pending in the webhook queue (as of the most recent flush)'
+)
+
+
+logger = logging.getLogger('netbox.webhooks')
+
+ACTION_FLAGS = {
+    ObjectChangeActionChoices.ACTION_CREATE: 'type_create',
+    ObjectChangeActionChoices.ACTION_UPDATE: 'type_update',
+    ObjectChangeActionChoices.ACTION_DELETE: 'type_delete',
+}
+
+
+class WebhookCache:
+    """
+    A process-local index of enabled Webhooks, mapped by content type and action. The index is invalidated locally when
+    a Webhook is modified; other processes detect the change by comparing the version stored in the shared cache, which
+    is checked at most once per request. While a modification to a Webhook has not yet been committed, any index loaded
+    may reflect the uncommitted change, so it is retained only for the current request.
+    """
+    def __init__(self):
+        self.webhooks = None
+        self.request_webhooks = None
+        self.version = None
+        self.request_id = None
+        self.uncommitted = False
+
+    def invalidate(self):
+        """
+        Discard the local index and signal other processes to do the same. Within a transaction, caching of the index
+        is suspended until the transaction has ended, whereupon the index is invalidated again.
+        """
+        self._discard()
+        if connection.in_atomic_block:
+            self.uncommitted = True
+            transaction.on_commit(self._committed)
+
+    def _discard(self):
+        self.webhooks = None
+        self.request_webhooks = None
+        cache.set('webhooks_version', uuid.uuid4().hex, None)
+
+    def _committed(self):
+        self.uncommitted = False
+        self._discard()
+
+    def _load(self):
+        webhooks = defaultdict(list)
+        for webhook in Webhook.objects.filter(enabled=True).prefetch_related('content_types'):
+            for content_type in webhook.content_types.all():
+                for action, action_flag in ACTION_FLAGS.items():
+                    if getattr(webhook, action_flag):
+                        webhooks[(content_type.pk, action)].append(webhook)
+        logger.debug(f"Loaded {len(webhooks)} webhook assignments")
+        return webhooks
+
+    def get(self, content_type, action, request_id=None):
+        """
+        Return all enabled Webhooks assigned to the given content type and action.
+        """
+        if self.uncommitted and not connection.in_atomic_block:
+            # The transaction in which a Webhook was modified has been rolled back
+            self.uncommitted = False
+
+        if request_id is None or request_id != self.request_id:
+            self.request_id = request_id
+            self.request_webhooks = None
+            version = cache.get('webhooks_version')
+            if version != self.version:
+                self.webhooks = None
+                self.version = version
+
+        webhooks = self.webhooks if self.webhooks is not None else self.request_webhooks
+        if webhooks is None:
+            webhooks = self._load()
+            if self.uncommitted:
+                self.request_webhooks = webhooks
+            else:
+                self.webhooks = webhooks
+
+        return webhooks.get((content_type.pk, action), [])
+
+
+webhook_cache = WebhookCache()
+
+
+# Compiled webhook conditions, mapped by webhook ID to a (revision, ConditionSet) tuple
+_condition_sets = {}
+
+
+def get_condition_set(webhook):
+    """
+    Return the compiled ConditionSet for a Webhook. The compiled instance is cached for as long as the webhook is not
+    modified (as indicated by its last_updated time).
+    """
+    if webhook.pk is None:
+        return ConditionSet(webhook.conditions)
+
+    revision, condition_set = _condition_sets.get(webhook.pk, (None, None))
+    if condition_set is None or revision != webhook.last_updated:
+        condition_set = ConditionSet(webhook.conditions)
+        _condition_sets[webhook.pk] = (webhook.last_updated, condition_set)
+
+    return condition_set
+
+
+def eval_conditions(webhook, data):
+    """
+    Test whether the given data meets the conditions of the webhook (if any). Return True
+    if met or no conditions are specified. Conditions which cannot be evaluated (e.g. a numeric
+    comparison with a null value) are logged and treated as not met.
+    """
+    if not webhook.conditions:
+        return True
+
+    try:
+        return get_condition_set(webhook).eval(data)
+    except (TypeError, ValueError) as e:
+        logger.error(f"Error evaluating conditions for webhook {webhook}: {e}")
+        return False
+
 
 def serialize_for_webhook(instance):
     """
@@ -56,8 +195,13 @@ def enqueue_object(queue, instance, user, request_id, action):
     if model_name not in registry['model_features']['webhooks'].get(app_label, []):
         return
 
+    # Skip serialization if no webhooks have been defined for this type of object and action
+    content_type = ContentType.objects.get_for_model(instance)
+    if not webhook_cache.get(content_type, action, request_id):
+        return
+
     queue.append({
-        'content_type': ContentType.objects.get_for_model(instance),
+        'content_type': content_type,
         'object_id': instance.pk,
         'event': action,
         'data': serialize_for_webhook(instance),
@@ -72,31 +216,33 @@ def flush_webhooks(queue):
     Flush a list of object representation to RQ for webhook processing.
     """
     rq_queue = get_queue('default')
-    webhooks_cache = {
-        'type_create': {},
-        'type_update': {},
-        'type_delete': {},
-    }
+    batches = {}
+    jobs_enqueued = 0
+    timestamp = str(timezone.now())
 
     for data in queue:
-
-        action_flag = {
-            ObjectChangeActionChoices.ACTION_CREATE: 'type_create',
-            ObjectChangeActionChoices.ACTION_UPDATE: 'type_update',
-            ObjectChangeActionChoices.ACTION_DELETE: 'type_delete',
-        }[data['event']]
         content_type = data['content_type']
-
-        # Cache applicable Webhooks
-        if content_type not in webhooks_cache[action_flag]:
-            webhooks_cache[action_flag][content_type] = Webhook.objects.filter(
-                **{action_flag: True},
-                content_types=content_type,
-                enabled=True
-            )
-        webhooks = webhooks_cache[action_flag][content_type]
+        webhooks = webhook_cache.get(content_type, data['event'], data['request_id'])
 
         for webhook in webhooks:
+
+            # Evaluate webhook conditions (if any) before queueing
+            if not eval_conditions(webhook, data['data']):
+                continue
+
+            # Defer batched webhooks until all events have been collected
+            if webhook.batch_mode != WebhookBatchModeChoices.BATCH_DISABLED:
+                batches.setdefault(webhook.pk, (webhook, []))[1].append({
+                    'model_name': content_type.model,
+                    'event': data['event'],
+                    'data': data['data'],
+                    'snapshots': data['snapshots'],
+                    'timestamp': timestamp,
+                    'username': data['username'],
+                    'request_id': data['request_id'],
+                })
+                continue
+
             rq_queue.enqueue(
                 "extras.webhooks_worker.process_webhook",
                 webhook=webhook,
@@ -108,3 +254,20 @@ def flush_webhooks(queue):
                 username=data['username'],
                 request_id=data['request_id']
             )
+            jobs_enqueued += 1
+            webhook_jobs_enqueued.labels(webhook.batch_mode).inc()
+            webhook_events_enqueued.labels(webhook.batch_mode).inc()
+
+    # Enqueue a single job for each batched webhook
+    for webhook, events in batches.values():
+        rq_queue.enqueue(
+            "extras.webhooks_worker.process_webhook_batch",
+            webhook=webhook,
+            events=events
+        )
+        jobs_enqueued += 1
+        webhook_jobs_enqueued.labels(webhook.batch_mode).inc()
+        webhook_events_enqueued.labels(webhook.batch_mode).inc(len(events))
+
+    if jobs_enqueued:
+        webhook_queue_depth.set(rq_queue.count)
@@ -1,43 +1,43 @@
 import logging
+from urllib.parse import urlsplit
 
 import requests
 from django.conf import settings
 from django_rq import job
 from jinja2.exceptions import TemplateError
+from prometheus_client import Counter
 
-from .choices import ObjectChangeActionChoices
-from .conditions import ConditionSet
+from .choices import ObjectChangeActionChoices, WebhookBatchModeChoices
 from .webhooks import generate_signature
 
 logger = logging.getLogger('netbox.webhooks_worker')
 
+webhook_deliveries = Counter(
+    'netbox_webhook_deliveries',
+    'Number of webhook HTTP requests sent, by outcome',
+    ['status']
+)
 
-def eval_conditions(webhook, data):
-    """
-    Test whether the given data meets the conditions of the webhook (if any). Return True
-    if met or no conditions are specified.
-    """
-    if not webhook.conditions:
-        return True
+# Persistent HTTP sessions, keyed by URL scheme and host
+_sessions = {}
 
-    logger.debug(f'Evaluating webhook conditions: {webhook.conditions}')
-    if ConditionSet(webhook.conditions).eval(data):
-        return True
 
-    return False
+def get_session(url):
+    """
+    Return a persistent HTTP session for the host of the given URL. Reusing the session allows consecutive requests to
+    the same receiver to be sent over a single keep-alive connection.
+    """
+    key = urlsplit(url)[:2]
+    if key not in _sessions:
+        _sessions[key] = requests.Session()
+    return _sessions[key]
 
 
-@job('default')
-def process_webhook(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
+def get_context(model_name, event, data, snapshots, timestamp, username, request_id):
     """
-    Make a POST request to the defined Webhook
+    Return the context data for rendering the headers & body templates of a webhook.
     """
-    # Evaluate webhook conditions (if any)
-    if not eval_conditions(webhook, data):
-        return
-
-    # Prepare context data for headers & body templates
-    context = {
+    return {
         'event': dict(ObjectChangeActionChoices)[event].lower(),
         'timestamp': timestamp,
         'model': model_name,
@@ -47,6 +47,11 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         'snapshots': snapshots,
     }
 
+
+def prepare_request(webhook, context, body=None):
+    """
+    Render and sign the HTTP request for a webhook. If a body is not provided, it is rendered from the given context.
+    """
     # Build the headers for the HTTP request
     headers = {
         'Content-Type': webhook.http_content_type,
@@ -58,11 +63,12 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         raise e
 
     # Render the request body
-    try:
-        body = webhook.render_body(context)
-    except TemplateError as e:
-        logger.error(f"Error rendering request body for webhook {webhook}: {e}")
-        raise e
+    if body is None:
+        try:
+            body = webhook.render_body(context)
+        except TemplateError as e:
+            logger.error(f"Error rendering request body for webhook {webhook}: {e}")
+            raise e
 
     # Prepare the HTTP request
     params = {
@@ -85,18 +91,69 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
     if webhook.secret != '':
         prepared_request.headers['X-Hook-Signature'] = generate_signature(prepared_request.body, webhook.secret)
 
-    # Send the request
-    with requests.Session() as session:
-        session.verify = webhook.ssl_verification
-        if webhook.ca_file_path:
-            session.verify = webhook.ca_file_path
-        response = session.send(prepared_request, proxies=settings.HTTP_PROXIES)
+    return prepared_request
+
+
+def send_request(webhook, prepared_request):
+    """
+    Send a prepared webhook request and raise an exception if the receiver does not indicate success.
+    """
+    session = get_session(prepared_request.url)
+    response = session.send(
+        prepared_request,
+        verify=webhook.ca_file_path or webhook.ssl_verification,
+        proxies=settings.HTTP_PROXIES
+    )
 
     if 200 <= response.status_code <= 299:
         logger.info(f"Request succeeded; response status {response.status_code}")
+        webhook_deliveries.labels('success').inc()
         return f"Status {response.status_code} returned, webhook successfully processed."
     else:
         logger.warning(f"Request failed; response status {response.status_code}: {response.content}")
+        webhook_deliveries.labels('failure').inc()
         raise requests.exceptions.RequestException(
             f"Status {response.status_code} returned with content '{response.content}', webhook FAILED to process."
         )
+
+
+@job('default')
+def process_webhook(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
+    """
+    Make a POST request to the defined Webhook. Webhook conditions are evaluated prior to queueing.
+    """
+    # Prepare context data for headers & body templates
+    context = get_context(model_name, event, data, snapshots, timestamp, username, request_id)
+
+    return send_request(webhook, prepare_request(webhook, context))
+
+
+@job('default')
+def process_webhook_batch(webhook, events):
+    """
+    Deliver all events queued for a batched Webhook by a single request. Depending on the webhook's batch mode, events
+    are sent either as separate HTTP requests over a persistent connection or as a single request with a JSON array of
+    the rendered bodies (in which case the URL and headers are rendered using the context of the first event).
+    """
+    contexts = [get_context(**event) for event in events]
+
+    if webhook.batch_mode == WebhookBatchModeChoices.BATCH_ARRAY:
+        try:
+            body = '[' + ', '.join(webhook.render_body(context) for context in contexts) + ']'
+        except TemplateError as e:
+            logger.error(f"Error rendering request body for webhook {webhook}: {e}")
+            raise e
+        return send_request(webhook, prepare_request(webhook, contexts[0], body=body))
+
+    failures = 0
+    for context in contexts:
+        try:
+            send_request(webhook, prepare_request(webhook, context))
+        except requests.exceptions.RequestException:
+            failures += 1
+
+    if failures:
+        raise requests.exceptions.RequestException(
+            f"{failures} of {len(contexts)} requests failed, webhook batch FAILED to process."
+        )
+    return f"{len(contexts)} requests sent, webhook batch successfully processed."
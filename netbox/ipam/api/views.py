@@ -1,3 +1,7 @@
+from contextlib import contextmanager
+from itertools import islice
+
+import netaddr
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db import transaction
 from django.shortcuts import get_object_or_404
@@ -11,6 +15,7 @@ from rest_framework.views import APIView
 from circuits.models import Provider
 from dcim.models import Site
 from ipam import filtersets
+from ipam.choices import PrefixStatusChoices
 from ipam.models import *
 from netbox.api.viewsets import NetBoxModelViewSet
 from netbox.api.viewsets.mixins import ObjectValidationMixin
@@ -20,6 +25,34 @@ from utilities.utils import count_related
 from . import serializers
 
 
+@contextmanager
+def vrf_advisory_lock(key, vrf, all_vrfs=False):
+    """
+    Serialize allocations of a type of object within a VRF (or the global table), so that allocations within different
+    VRFs may proceed concurrently. Each allocation holds a shared lock on the entire key, which is instead held
+    exclusively by allocations spanning all VRFs (i.e. within a container prefix in the global table).
+
+    :param key: The name of the advisory lock key (see ADVISORY_LOCK_KEYS)
+    :param vrf: The VRF within which objects are being allocated (None for the global table)
+    :param all_vrfs: True if the allocation considers objects within all VRFs
+    """
+    with advisory_lock(ADVISORY_LOCK_KEYS[key], shared=not all_vrfs):
+        if all_vrfs:
+            yield
+        else:
+            with advisory_lock((ADVISORY_LOCK_KEYS[key], vrf.pk if vrf else 0)):
+                yield
+
+
+def _spans_all_vrfs(parent):
+    """
+    Return True if the child objects of a Prefix or IPRange are drawn from all VRFs (see Prefix.get_child_ips()).
+    """
+    return (
+        isinstance(parent, Prefix) and parent.vrf is None and parent.status == PrefixStatusChoices.STATUS_CONTAINER
+    )
+
+
 class IPAMRootView(APIRootView):
     """
     IPAM API root view
@@ -167,9 +200,9 @@ class AvailablePrefixesView(ObjectValidationMixin, APIView):
     @swagger_auto_schema(responses={200: serializers.AvailablePrefixSerializer(many=True)})
     def get(self, request, pk):
         prefix = get_object_or_404(Prefix.objects.restrict(request.user), pk=pk)
-        available_prefixes = prefix.get_available_prefixes()
+        available_prefixes = list(prefix.iter_available_prefixes())
 
-        serializer = serializers.AvailablePrefixSerializer(available_prefixes.iter_cidrs(), many=True, context={
+        serializer = serializers.AvailablePrefixSerializer(available_prefixes, many=True, context={
             'request': request,
             'vrf': prefix.vrf,
         })
@@ -180,11 +213,15 @@ class AvailablePrefixesView(ObjectValidationMixin, APIView):
         request_body=serializers.PrefixLengthSerializer,
         responses={201: serializers.PrefixSerializer(many=True)}
     )
-    @advisory_lock(ADVISORY_LOCK_KEYS['available-prefixes'])
     def post(self, request, pk):
         self.queryset = self.queryset.restrict(request.user, 'add')
         prefix = get_object_or_404(Prefix.objects.restrict(request.user), pk=pk)
-        available_prefixes = prefix.get_available_prefixes()
+
+        # Lock only the prefix's VRF, so that allocations within other VRFs may proceed concurrently
+        with vrf_advisory_lock('available-prefixes', prefix.vrf, all_vrfs=_spans_all_vrfs(prefix)):
+            return self._allocate_prefixes(request, prefix)
+
+    def _allocate_prefixes(self, request, prefix):
 
         # Validate Requested Prefixes' length
         serializer = serializers.PrefixLengthSerializer(
@@ -202,26 +239,37 @@ class AvailablePrefixesView(ObjectValidationMixin, APIView):
             )
 
         requested_prefixes = serializer.validated_data
+
+        # Available prefixes are retrieved lazily (in order) and retained in a pool from which allocations are made
+        available_prefixes = prefix.iter_available_prefixes()
+        pool = []
+
         # Allocate prefixes to the requested objects based on availability within the parent
-        for i, requested_prefix in enumerate(requested_prefixes):
+        for requested_prefix in requested_prefixes:
 
             # Find the first available prefix equal to or larger than the requested size
-            for available_prefix in available_prefixes.iter_cidrs():
-                if requested_prefix['prefix_length'] >= available_prefix.prefixlen:
-                    allocated_prefix = '{}/{}'.format(available_prefix.network, requested_prefix['prefix_length'])
-                    requested_prefix['prefix'] = allocated_prefix
-                    requested_prefix['vrf'] = prefix.vrf.pk if prefix.vrf else None
+            i = 0
+            while True:
+                if i == len(pool):
+                    available_prefix = next(available_prefixes, None)
+                    if available_prefix is None:
+                        return Response(
+                            {
+                                "detail": "Insufficient space is available to accommodate the requested prefix size(s)"
+                            },
+                            status=status.HTTP_409_CONFLICT
+                        )
+                    pool.append(available_prefix)
+                if requested_prefix['prefix_length'] >= pool[i].prefixlen:
                     break
-            else:
-                return Response(
-                    {
-                        "detail": "Insufficient space is available to accommodate the requested prefix size(s)"
-                    },
-                    status=status.HTTP_409_CONFLICT
-                )
+                i += 1
+
+            allocated_prefix = netaddr.IPNetwork(f"{pool[i].network}/{requested_prefix['prefix_length']}")
+            requested_prefix['prefix'] = str(allocated_prefix)
+            requested_prefix['vrf'] = prefix.vrf.pk if prefix.vrf else None
 
-            # Remove the allocated prefix from the list of available prefixes
-            available_prefixes.remove(allocated_prefix)
+            # Remove the allocated prefix from the pool of available prefixes
+            pool[i:i + 1] = netaddr.cidr_exclude(pool[i], allocated_prefix)
 
         # Initialize the serializer with a list or a single object depending on what was requested
         context = {'request': request}
@@ -264,11 +312,7 @@ class AvailableIPAddressesView(ObjectValidationMixin, APIView):
             limit = min(limit, MAX_PAGE_SIZE)
 
         # Calculate available IPs within the parent
-        ip_list = []
-        for index, ip in enumerate(parent.get_available_ips(), start=1):
-            ip_list.append(ip)
-            if index == limit:
-                break
+        ip_list = list(islice(parent.iter_available_ips(), limit))
         serializer = serializers.AvailableIPSerializer(ip_list, many=True, context={
             'request': request,
             'parent': parent,
@@ -281,17 +325,22 @@ class AvailableIPAddressesView(ObjectValidationMixin, APIView):
         request_body=serializers.AvailableIPSerializer,
         responses={201: serializers.IPAddressSerializer(many=True)}
     )
-    @advisory_lock(ADVISORY_LOCK_KEYS['available-ips'])
     def post(self, request, pk):
         self.queryset = self.queryset.restrict(request.user, 'add')
         parent = self.get_parent(request, pk)
 
+        # Lock only the parent's VRF, so that allocations within other VRFs may proceed concurrently
+        with vrf_advisory_lock('available-ips', parent.vrf, all_vrfs=_spans_all_vrfs(parent)):
+            return self._allocate_ips(request, parent)
+
+    def _allocate_ips(self, request, parent):
+
         # Normalize to a list of objects
         requested_ips = request.data if isinstance(request.data, list) else [request.data]
 
         # Determine if the requested number of IPs is available
-        available_ips = parent.get_available_ips()
-        if available_ips.size < len(requested_ips):
+        available_ips = list(islice(parent.iter_available_ips(), len(requested_ips)))
+        if len(available_ips) < len(requested_ips):
             return Response(
                 {
                     "detail": f"An insufficient number of IP addresses are available within {parent} "
@@ -301,9 +350,8 @@ class AvailableIPAddressesView(ObjectValidationMixin, APIView):
             )
 
         # Assign addresses from the list of available IPs and copy VRF assignment from the parent
-        available_ips = iter(available_ips)
-        for requested_ip in requested_ips:
-            requested_ip['address'] = f'{next(available_ips)}/{parent.mask_length}'
+        for requested_ip, available_ip in zip(requested_ips, available_ips):
+            requested_ip['address'] = f'{available_ip}/{parent.mask_length}'
             requested_ip['vrf'] = parent.vrf.pk if parent.vrf else None
 
         # Initialize the serializer with a list or a single object depending on what was requested
@@ -234,6 +234,9 @@ class PrefixFilterSet(NetBoxModelFilterSet, TenancyFilterSet):
     children = MultiValueNumberFilter(
         field_name='_children'
     )
+    utilization = MultiValueNumberFilter(
+        field_name='_utilization'
+    )
     mask_length = MultiValueNumberFilter(
         field_name='prefix',
         lookup_expr='net_mask_length'
@@ -10,9 +10,6 @@ class Command(BaseCommand):
     def handle(self, *model_names, **options):
         self.stdout.write(f'Rebuilding {Prefix.objects.count()} prefixes...')
 
-        # Reset existing counts
-        Prefix.objects.update(_depth=0, _children=0)
-
         # Rebuild the global table
         global_count = Prefix.objects.filter(vrf__isnull=True).count()
         self.stdout.write(f'Global: {global_count} prefixes...')
@@ -0,0 +1,67 @@
+import sys
+
+from django.db import migrations, models
+from django.db.models.expressions import RawSQL
+
+# A copy of ipam.querysets.PREFIX_UTILIZATION_SQL as of this migration
+PREFIX_UTILIZATION_SQL = (
+    'CAST(CASE WHEN "ipam_prefix"."mark_utilized" THEN 100 WHEN "ipam_prefix"."status" = \'container\' THEN '
+    'LEAST(100, 100 * (SELECT COALESCE(SUM(POWER(2::numeric, (CASE FAMILY(U0."prefix") WHEN 4 THEN 32 '
+    'ELSE 128 END) - MASKLEN(U0."prefix"))), 0) FROM (SELECT DISTINCT U1."prefix" FROM "ipam_prefix" U1 '
+    'WHERE U1."prefix" << "ipam_prefix"."prefix" AND COALESCE(U1."vrf_id", 0) = '
+    'COALESCE("ipam_prefix"."vrf_id", 0) AND NOT EXISTS (SELECT 1 FROM "ipam_prefix" U2 WHERE U2."prefix" '
+    '<< "ipam_prefix"."prefix" AND U2."prefix" >> U1."prefix" AND COALESCE(U2."vrf_id", 0) = '
+    'COALESCE("ipam_prefix"."vrf_id", 0))) U0) / POWER(2::numeric, (CASE FAMILY("ipam_prefix"."prefix") '
+    'WHEN 4 THEN 32 ELSE 128 END) - MASKLEN("ipam_prefix"."prefix"))) ELSE LEAST(100, 100 * (WITH ranges '
+    'AS (SELECT CAST(HOST(U0."start_address") AS INET) AS "first", CAST(HOST(U0."end_address") AS INET) '
+    'AS "last" FROM "ipam_iprange" U0 WHERE COALESCE(U0."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", '
+    '0) AND CAST(HOST(U0."start_address") AS INET) <<= "ipam_prefix"."prefix" AND '
+    'CAST(HOST(U0."end_address") AS INET) <<= "ipam_prefix"."prefix"), islands AS (SELECT "first", '
+    '"last", SUM(CASE WHEN "prev_last" IS NULL OR "first" > "prev_last" THEN 1 ELSE 0 END) OVER (ORDER BY '
+    '"first", "last") AS "island" FROM (SELECT "first", "last", MAX("last") OVER (ORDER BY "first", '
+    '"last" ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS "prev_last" FROM ranges) U1) SELECT '
+    '(SELECT COALESCE(SUM("size"), 0) FROM (SELECT (SELECT SUM(GET_BYTE(V0."b", 4 + V1."j")::numeric * '
+    'POWER(256::numeric, GET_BYTE(V0."b", 3) - 1 - V1."j")) FROM (SELECT INET_SEND(U2."last") AS "b") V0, '
+    'GENERATE_SERIES(0, GET_BYTE(V0."b", 3) - 1) AS V1("j")) - (SELECT SUM(GET_BYTE(V0."b", 4 + '
+    'V1."j")::numeric * POWER(256::numeric, GET_BYTE(V0."b", 3) - 1 - V1."j")) FROM (SELECT '
+    'INET_SEND(U2."first") AS "b") V0, GENERATE_SERIES(0, GET_BYTE(V0."b", 3) - 1) AS V1("j")) + 1 AS '
+    '"size" FROM (SELECT MIN("first") AS "first", MAX("last") AS "last" FROM islands GROUP BY "island") '
+    'U2) U4) + (SELECT COUNT(DISTINCT CAST(HOST(U3."address") AS INET)) FROM "ipam_ipaddress" U3 WHERE '
+    'COALESCE(U3."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0) AND CAST(HOST(U3."address") AS INET) '
+    '<<= "ipam_prefix"."prefix" AND NOT EXISTS (SELECT 1 FROM ranges WHERE CAST(HOST(U3."address") AS '
+    'INET) BETWEEN ranges."first" AND ranges."last"))) / GREATEST(POWER(2::numeric, (CASE '
+    'FAMILY("ipam_prefix"."prefix") WHEN 4 THEN 32 ELSE 128 END) - MASKLEN("ipam_prefix"."prefix")) - '
+    'CASE WHEN FAMILY("ipam_prefix"."prefix") = 4 AND MASKLEN("ipam_prefix"."prefix") < 31 AND NOT '
+    '"ipam_prefix"."is_pool" THEN 2 ELSE 0 END, 1)) END AS DOUBLE PRECISION)'
+)
+
+
+def populate_prefix_utilization(apps, schema_editor):
+    """
+    Populate _utilization for all Prefixes.
+    """
+    Prefix = apps.get_model('ipam', 'Prefix')
+
+    if 'test' not in sys.argv:
+        print(f'\nUpdating utilization for {Prefix.objects.count()} prefixes...')
+
+    Prefix.objects.update(_utilization=RawSQL(PREFIX_UTILIZATION_SQL, ()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipam', '0057_created_datetimefield'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prefix',
+            name='_utilization',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            code=populate_prefix_utilization,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
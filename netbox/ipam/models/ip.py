@@ -1,9 +1,12 @@
+import heapq
+
 import netaddr
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import F
+from django.db.models.expressions import RawSQL
 from django.urls import reverse
 from django.utils.functional import cached_property
 
@@ -13,8 +16,9 @@ from netbox.models import OrganizationalModel, NetBoxModel
 from ipam.choices import *
 from ipam.constants import *
 from ipam.fields import IPNetworkField, IPAddressField
+from ipam.lookups import Host, Inet
 from ipam.managers import IPAddressManager
-from ipam.querysets import PrefixQuerySet
+from ipam.querysets import PREFIX_CHILD_IPS_SQL, PREFIX_CHILD_SPACE_SQL, PrefixQuerySet
 from ipam.validators import DNSValidator
 from netbox.config import get_config
 from virtualization.models import VirtualMachine
@@ -31,26 +35,51 @@ __all__ = (
 )
 
 
+def iter_gaps(first, last, occupied):
+    """
+    Yield each (start, end) interval of integers between first and last (inclusive) which is not covered by any of the
+    occupied (start, end) intervals. Occupied intervals must be ordered by their start value, and may overlap. The
+    occupied intervals are consumed lazily, so that iteration can stop as soon as enough gaps have been found.
+    """
+    cursor = first
+    for start, end in occupied:
+        if start > last:
+            break
+        if start > cursor:
+            yield cursor, start - 1
+        cursor = max(cursor, end + 1)
+        if cursor > last:
+            return
+    if cursor <= last:
+        yield cursor, last
+
+
 class GetAvailablePrefixesMixin:
 
+    def iter_available_prefixes(self):
+        """
+        Yield each available child prefix (as an IPNetwork) in order. Child prefixes are streamed from the database in
+        order, so that iteration can stop early without retrieving every child prefix.
+        """
+        child_prefixes = self.get_child_prefixes().order_by('prefix').values_list('prefix', flat=True)
+        occupied = ((p.first, p.last) for p in child_prefixes.iterator())
+        for start, end in iter_gaps(self.prefix.first, self.prefix.last, occupied):
+            yield from netaddr.iprange_to_cidrs(
+                netaddr.IPAddress(start, self.prefix.version),
+                netaddr.IPAddress(end, self.prefix.version)
+            )
+
     def get_available_prefixes(self):
         """
         Return all available Prefixes within this aggregate as an IPSet.
         """
-        prefix = netaddr.IPSet(self.prefix)
-        child_prefixes = netaddr.IPSet([child.prefix for child in self.get_child_prefixes()])
-        available_prefixes = prefix - child_prefixes
-
-        return available_prefixes
+        return netaddr.IPSet(self.iter_available_prefixes())
 
     def get_first_available_prefix(self):
         """
         Return the first available child prefix within the prefix (or None).
         """
-        available_prefixes = self.get_available_prefixes()
-        if not available_prefixes:
-            return None
-        return available_prefixes.iter_cidrs()[0]
+        return next(self.iter_available_prefixes(), None)
 
 
 class RIR(OrganizationalModel):
@@ -358,6 +387,12 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
         editable=False
     )
 
+    # Cached utilization (percentage)
+    _utilization = models.FloatField(
+        default=0,
+        editable=False
+    )
+
     objects = PrefixQuerySet.as_manager()
 
     clone_fields = [
@@ -428,6 +463,10 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
     def children(self):
         return self._children
 
+    @property
+    def utilization(self):
+        return self._utilization
+
     def _set_prefix_length(self, value):
         """
         Expose the IPNetwork object's prefixlen attribute on the parent model so that it can be manipulated directly,
@@ -493,6 +532,43 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
         else:
             return IPAddress.objects.filter(address__net_host_contained=str(self.prefix), vrf=self.vrf)
 
+    def _iter_available_ip_ranges(self):
+        """
+        Yield each (first, last) interval of available IPs within this prefix as integers. Child IPs and ranges are
+        streamed from the database in order.
+        """
+        if self.mark_utilized:
+            return
+
+        first, last = self.prefix.first, self.prefix.last
+
+        # For "normal" IPv4 prefixes, omit first and last addresses. IPv6, pool, or IPv4 /31-/32 sets are fully usable.
+        if not (self.family == 6 or self.is_pool or (self.family == 4 and self.prefix.prefixlen >= 31)):
+            first += 1
+            last -= 1
+
+        # Child IPs are ordered by host address (see IPAddressManager)
+        child_ips = (
+            (ip.ip.value, ip.ip.value) for ip in self.get_child_ips().values_list('address', flat=True).iterator()
+        )
+        child_ranges = self.get_child_ranges().order_by(Inet(Host('start_address'))).values_list(
+            'start_address', 'end_address'
+        )
+        child_ranges = (
+            (start_address.ip.value, end_address.ip.value) for start_address, end_address in child_ranges.iterator()
+        )
+
+        yield from iter_gaps(first, last, heapq.merge(child_ips, child_ranges))
+
+    def iter_available_ips(self):
+        """
+        Yield each available IP within this prefix (as an IPAddress) in order, without computing the full set of
+        available IPs.
+        """
+        for first, last in self._iter_available_ip_ranges():
+            for value in range(first, last + 1):
+                yield netaddr.IPAddress(value, self.family)
+
     def get_available_ips(self):
         """
         Return all available IPs within this prefix as an IPSet.
@@ -500,59 +576,49 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
         if self.mark_utilized:
             return list()
 
-        prefix = netaddr.IPSet(self.prefix)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.get_child_ips()])
-        child_ranges = netaddr.IPSet()
-        for iprange in self.get_child_ranges():
-            child_ranges.add(iprange.range)
-        available_ips = prefix - child_ips - child_ranges
-
-        # IPv6, pool, or IPv4 /31-/32 sets are fully usable
-        if self.family == 6 or self.is_pool or (self.family == 4 and self.prefix.prefixlen >= 31):
-            return available_ips
-
-        # For "normal" IPv4 prefixes, omit first and last addresses
-        available_ips -= netaddr.IPSet([
-            netaddr.IPAddress(self.prefix.first),
-            netaddr.IPAddress(self.prefix.last),
+        return netaddr.IPSet([
+            netaddr.IPRange(netaddr.IPAddress(first, self.family), netaddr.IPAddress(last, self.family))
+            for first, last in self._iter_available_ip_ranges()
         ])
 
-        return available_ips
-
     def get_first_available_ip(self):
         """
         Return the first available IP within the prefix (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        available_ip = next(self.iter_available_ips(), None)
+        if available_ip is None:
             return None
-        return '{}/{}'.format(next(available_ips.__iter__()), self.prefix.prefixlen)
+        return '{}/{}'.format(available_ip, self.prefix.prefixlen)
+
+    def _get_child_space(self, sql):
+        """
+        Evaluate the given child space aggregation (see ipam.querysets) for this Prefix within the database.
+        """
+        return Prefix.objects.filter(pk=self.pk).annotate(
+            child_space=RawSQL(sql, ())
+        ).values_list('child_space', flat=True).first() or 0
 
     def get_utilization(self):
         """
         Determine the utilization of the prefix and return it as a percentage. For Prefixes with a status of
-        "container", calculate utilization based on child prefixes. For all others, count child IP addresses.
+        "container", calculate utilization based on child prefixes. For all others, count child IP addresses. The
+        utilization is aggregated within the database; the cached value is available as `utilization`.
         """
         if self.mark_utilized:
             return 100
 
         if self.status == PrefixStatusChoices.STATUS_CONTAINER:
-            queryset = Prefix.objects.filter(
-                prefix__net_contained=str(self.prefix),
-                vrf=self.vrf
-            )
-            child_prefixes = netaddr.IPSet([p.prefix for p in queryset])
-            utilization = float(child_prefixes.size) / self.prefix.size * 100
+            # Sum the address space of all child prefixes
+            child_space = self._get_child_space(PREFIX_CHILD_SPACE_SQL)
+            utilization = float(child_space) / self.prefix.size * 100
         else:
-            # Compile an IPSet to avoid counting duplicate IPs
-            child_ips = netaddr.IPSet(
-                [_.range for _ in self.get_child_ranges()] + [_.address.ip for _ in self.get_child_ips()]
-            )
+            # Count distinct child IPs (including those within child ranges)
+            child_ips = self._get_child_space(PREFIX_CHILD_IPS_SQL)
 
             prefix_size = self.prefix.size
             if self.prefix.version == 4 and self.prefix.prefixlen < 31 and not self.is_pool:
                 prefix_size -= 2
-            utilization = float(child_ips.size) / prefix_size * 100
+            utilization = float(child_ips) / prefix_size * 100
 
         return min(utilization, 100)
 
@@ -613,6 +679,13 @@ class IPRange(NetBoxModel):
         verbose_name = 'IP range'
         verbose_name_plural = 'IP ranges'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Cache the original start address and VRF so we can check if they have changed on post_save
+        self._start_address = self.start_address
+        self._vrf_id = self.vrf_id
+
     def __str__(self):
         return self.name
 
@@ -719,6 +792,18 @@ class IPRange(NetBoxModel):
             vrf=self.vrf
         )
 
+    def iter_available_ips(self):
+        """
+        Yield each available IP within this range (as an IPAddress) in order. Child IPs are streamed from the database
+        in order (see IPAddressManager).
+        """
+        child_ips = (
+            (ip.ip.value, ip.ip.value) for ip in self.get_child_ips().values_list('address', flat=True).iterator()
+        )
+        for first, last in iter_gaps(self.start_address.ip.value, self.end_address.ip.value, child_ips):
+            for value in range(first, last + 1):
+                yield netaddr.IPAddress(value, self.family)
+
     def get_available_ips(self):
         """
         Return all available IPs within this range as an IPSet.
@@ -733,11 +818,11 @@ class IPRange(NetBoxModel):
         """
         Return the first available IP within the range (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        available_ip = next(self.iter_available_ips(), None)
+        if available_ip is None:
             return None
 
-        return '{}/{}'.format(next(available_ips.__iter__()), self.start_address.prefixlen)
+        return '{}/{}'.format(available_ip, self.start_address.prefixlen)
 
     @cached_property
     def utilization(self):
@@ -841,6 +926,13 @@ class IPAddress(NetBoxModel):
         verbose_name = 'IP address'
         verbose_name_plural = 'IP addresses'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Cache the original address and VRF so we can check if they have changed on post_save
+        self._address = self.address
+        self._vrf_id = self.vrf_id
+
     def __str__(self):
         return str(self.address)
 
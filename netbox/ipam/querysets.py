@@ -3,6 +3,84 @@ from django.db.models import Q
 from django.db.models.expressions import RawSQL
 
 from utilities.querysets import RestrictedQuerySet
+from .choices import PrefixStatusChoices
+
+# Number of addresses within a prefix
+PREFIX_SIZE_SQL = 'POWER(2::numeric, (CASE FAMILY({prefix}) WHEN 4 THEN 32 ELSE 128 END) - MASKLEN({prefix}))'
+
+# Amount of address space covered by the child prefixes of a prefix (within its VRF). Only the outermost child
+# prefixes are counted, so that nested and duplicate prefixes are not counted more than once.
+PREFIX_CHILD_SPACE_SQL = (
+    'SELECT COALESCE(SUM(' + PREFIX_SIZE_SQL.format(prefix='U0."prefix"') + '), 0) '
+    'FROM ('
+    'SELECT DISTINCT U1."prefix" FROM "ipam_prefix" U1 '
+    'WHERE U1."prefix" << "ipam_prefix"."prefix" '
+    'AND COALESCE(U1."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0) '
+    'AND NOT EXISTS ('
+    'SELECT 1 FROM "ipam_prefix" U2 '
+    'WHERE U2."prefix" << "ipam_prefix"."prefix" AND U2."prefix" >> U1."prefix" '
+    'AND COALESCE(U2."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0)'
+    ')'
+    ') U0'
+)
+
+# Numeric value of an IP address, computed from its binary representation (as subtracting one address from another
+# yields a bigint, which may overflow for IPv6)
+IP_VALUE_SQL = (
+    '(SELECT SUM(GET_BYTE(V0."b", 4 + V1."j")::numeric * POWER(256::numeric, GET_BYTE(V0."b", 3) - 1 - V1."j")) '
+    'FROM (SELECT INET_SEND({address}) AS "b") V0, GENERATE_SERIES(0, GET_BYTE(V0."b", 3) - 1) AS V1("j"))'
+)
+
+# Number of distinct addresses within a prefix (and its VRF) which are assigned to an IP address or IP range.
+# Overlapping ranges are merged, and IP addresses falling within a range are not counted again.
+PREFIX_CHILD_IPS_SQL = (
+    'WITH ranges AS ('
+    'SELECT CAST(HOST(U0."start_address") AS INET) AS "first", CAST(HOST(U0."end_address") AS INET) AS "last" '
+    'FROM "ipam_iprange" U0 '
+    'WHERE COALESCE(U0."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0) '
+    'AND CAST(HOST(U0."start_address") AS INET) <<= "ipam_prefix"."prefix" '
+    'AND CAST(HOST(U0."end_address") AS INET) <<= "ipam_prefix"."prefix"'
+    '), islands AS ('
+    'SELECT "first", "last", SUM(CASE WHEN "prev_last" IS NULL OR "first" > "prev_last" THEN 1 ELSE 0 END) '
+    'OVER (ORDER BY "first", "last") AS "island" '
+    'FROM ('
+    'SELECT "first", "last", '
+    'MAX("last") OVER (ORDER BY "first", "last" ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS "prev_last" '
+    'FROM ranges'
+    ') U1'
+    ') '
+    'SELECT ('
+    'SELECT COALESCE(SUM("size"), 0) FROM ('
+    'SELECT ' + IP_VALUE_SQL.format(address='U2."last"') + ' - ' + IP_VALUE_SQL.format(address='U2."first"') +
+    ' + 1 AS "size" FROM ('
+    'SELECT MIN("first") AS "first", MAX("last") AS "last" FROM islands GROUP BY "island"'
+    ') U2'
+    ') U4'
+    ') + ('
+    'SELECT COUNT(DISTINCT CAST(HOST(U3."address") AS INET)) FROM "ipam_ipaddress" U3 '
+    'WHERE COALESCE(U3."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0) '
+    'AND CAST(HOST(U3."address") AS INET) <<= "ipam_prefix"."prefix" '
+    'AND NOT EXISTS ('
+    'SELECT 1 FROM ranges WHERE CAST(HOST(U3."address") AS INET) BETWEEN ranges."first" AND ranges."last"'
+    ')'
+    ')'
+)
+
+# Utilization of a prefix as a percentage (mirrors Prefix.get_utilization())
+PREFIX_UTILIZATION_SQL = (
+    'CAST(CASE '
+    'WHEN "ipam_prefix"."mark_utilized" THEN 100 '
+    'WHEN "ipam_prefix"."status" = \'{container}\' THEN LEAST(100, 100 * ({child_space}) / {size}) '
+    'ELSE LEAST(100, 100 * ({child_ips}) / GREATEST({size} - CASE '
+    'WHEN FAMILY("ipam_prefix"."prefix") = 4 AND MASKLEN("ipam_prefix"."prefix") < 31 '
+    'AND NOT "ipam_prefix"."is_pool" THEN 2 ELSE 0 END, 1)) '
+    'END AS DOUBLE PRECISION)'
+).format(
+    container=PrefixStatusChoices.STATUS_CONTAINER,
+    child_space=PREFIX_CHILD_SPACE_SQL,
+    child_ips=PREFIX_CHILD_IPS_SQL,
+    size=PREFIX_SIZE_SQL.format(prefix='"ipam_prefix"."prefix"')
+)
 
 
 class PrefixQuerySet(RestrictedQuerySet):
@@ -29,6 +107,12 @@ class PrefixQuerySet(RestrictedQuerySet):
             )
         )
 
+    def update_utilization(self):
+        """
+        Recalculate the cached utilization of each Prefix within the database.
+        """
+        return self.update(_utilization=RawSQL(PREFIX_UTILIZATION_SQL, ()))
+
 
 class VLANQuerySet(RestrictedQuerySet):
 
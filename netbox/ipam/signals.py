@@ -1,29 +1,65 @@
+import netaddr
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
 from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from dcim.models import Device
 from virtualization.models import VirtualMachine
-from .models import IPAddress, Prefix
+from .choices import PrefixStatusChoices
+from .models import IPAddress, IPRange, Prefix
 
 
-def update_parents_children(prefix):
+def add_to_hierarchy(prefix):
     """
-    Update depth on prefix & containing prefixes
+    Account for a new (or moved) prefix in the depth & children counts of its parents and children, and compute its
+    own position within the hierarchy.
     """
-    parents = prefix.get_parents(include_self=True).annotate_hierarchy()
-    for parent in parents:
-        parent._children = parent.hierarchy_children
-    Prefix.objects.bulk_update(parents, ['_children'], batch_size=100)
+    # Increment the children count on all parents
+    prefix.get_parents().exclude(pk=prefix.pk).update(_children=F('_children') + 1)
 
+    # Increment the depth of all children, unless a duplicate of this prefix was already counted as a parent
+    if not prefix.get_duplicates().exists():
+        prefix.get_children().exclude(pk=prefix.pk).update(_depth=F('_depth') + 1)
 
-def update_children_depth(prefix):
+    prefix._depth = prefix.get_parents().exclude(pk=prefix.pk).values('prefix').order_by().distinct().count()
+    prefix._children = prefix.get_children().exclude(pk=prefix.pk).count()
+    Prefix.objects.filter(pk=prefix.pk).update(_depth=prefix._depth, _children=prefix._children)
+
+
+def remove_from_hierarchy(prefix, pk=None):
+    """
+    Remove a deleted (or moved) prefix from the depth & children counts of its former parents and children.
+    """
+    # Decrement the children count on all parents
+    prefix.get_parents().exclude(pk=pk).update(_children=Greatest(F('_children') - 1, 0))
+
+    # Decrement the depth of all children, unless a duplicate of this prefix remains
+    if not prefix.get_duplicates().exclude(pk=pk).exists():
+        prefix.get_children().exclude(pk=pk).update(_depth=Greatest(F('_depth') - 1, 0))
+
+
+def update_utilization(vrf_id, *addresses):
+    """
+    Recalculate the cached utilization of all non-container prefixes within the VRF which contain any of the given
+    IP addresses.
+    """
+    query = Q()
+    for address in addresses:
+        if address:
+            query |= Q(prefix__net_contains_or_equals=str(netaddr.IPNetwork(address).ip))
+    if not query:
+        return
+    Prefix.objects.filter(query, vrf_id=vrf_id).exclude(
+        status=PrefixStatusChoices.STATUS_CONTAINER
+    ).update_utilization()
+
+
+def update_parents_utilization(prefix):
     """
-    Update children count on prefix & contained prefixes
+    Recalculate the cached utilization of all container prefixes which contain the given prefix.
     """
-    children = prefix.get_children(include_self=True).annotate_hierarchy()
-    for child in children:
-        child._depth = child.hierarchy_depth
-    Prefix.objects.bulk_update(children, ['_depth'], batch_size=100)
+    prefix.get_parents().filter(status=PrefixStatusChoices.STATUS_CONTAINER).update_utilization()
 
 
 @receiver(post_save, sender=Prefix)
@@ -32,21 +68,51 @@ def handle_prefix_saved(instance, created, **kwargs):
     # Prefix has changed (or new instance has been created)
     if created or instance.vrf != instance._vrf or instance.prefix != instance._prefix:
 
-        update_parents_children(instance)
-        update_children_depth(instance)
-
         # If this is not a new prefix, clean up parent/children of previous prefix
         if not created:
             old_prefix = Prefix(vrf=instance._vrf, prefix=instance._prefix)
-            update_parents_children(old_prefix)
-            update_children_depth(old_prefix)
+            remove_from_hierarchy(old_prefix, pk=instance.pk)
+            update_parents_utilization(old_prefix)
+
+        add_to_hierarchy(instance)
+        update_parents_utilization(instance)
+
+    # Status, pool & utilization flags affect the prefix's own utilization
+    Prefix.objects.filter(pk=instance.pk).update_utilization()
+    instance.refresh_from_db(fields=['_utilization'])
 
 
 @receiver(post_delete, sender=Prefix)
 def handle_prefix_deleted(instance, **kwargs):
 
-    update_parents_children(instance)
-    update_children_depth(instance)
+    remove_from_hierarchy(instance, pk=instance.pk)
+    update_parents_utilization(instance)
+
+
+@receiver(post_save, sender=IPAddress)
+@receiver(post_delete, sender=IPAddress)
+def handle_ipaddress_changed(instance, **kwargs):
+    """
+    Update the cached utilization of any prefixes containing a new, modified, or deleted IPAddress.
+    """
+    if instance._vrf_id != instance.vrf_id:
+        update_utilization(instance._vrf_id, instance._address)
+        update_utilization(instance.vrf_id, instance.address)
+    else:
+        update_utilization(instance.vrf_id, instance.address, instance._address)
+
+
+@receiver(post_save, sender=IPRange)
+@receiver(post_delete, sender=IPRange)
+def handle_iprange_changed(instance, **kwargs):
+    """
+    Update the cached utilization of any prefixes containing a new, modified, or deleted IPRange.
+    """
+    if instance._vrf_id != instance.vrf_id:
+        update_utilization(instance._vrf_id, instance._start_address)
+        update_utilization(instance.vrf_id, instance.start_address)
+    else:
+        update_utilization(instance.vrf_id, instance.start_address, instance._start_address)
 
 
 @receiver(pre_delete, sender=IPAddress)
@@ -278,8 +278,8 @@ class PrefixTable(NetBoxTable):
         verbose_name='Marked Utilized'
     )
     utilization = PrefixUtilizationColumn(
-        accessor='get_utilization',
-        orderable=False
+        accessor=Accessor('_utilization'),
+        verbose_name='Utilization'
     )
     tags = columns.TagColumn(
         url_name='ipam:prefix_list'
@@ -4,6 +4,7 @@ from django.test import TestCase, override_settings
 
 from ipam.choices import IPAddressRoleChoices, PrefixStatusChoices
 from ipam.models import Aggregate, IPAddress, IPRange, Prefix, RIR, VLAN, VLANGroup, VRF
+from ipam.utils import rebuild_prefixes
 
 
 class TestAggregate(TestCase):
@@ -159,6 +160,24 @@ class TestPrefix(TestCase):
 
         self.assertEqual(available_ips, missing_ips)
 
+    def test_iter_available_ips(self):
+
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/28'))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('10.0.0.1/26')),
+            IPAddress(address=IPNetwork('10.0.0.3/26')),
+            IPAddress(address=IPNetwork('10.0.0.10/26')),
+        ))
+        IPRange.objects.create(
+            start_address=IPNetwork('10.0.0.5/26'),
+            end_address=IPNetwork('10.0.0.11/26')
+        )
+        available_ips = parent_prefix.iter_available_ips()
+
+        self.assertEqual(str(next(available_ips)), '10.0.0.2')
+        self.assertEqual(str(next(available_ips)), '10.0.0.4')
+        self.assertListEqual([str(ip) for ip in available_ips], ['10.0.0.12', '10.0.0.13', '10.0.0.14'])
+
     def test_get_first_available_prefix(self):
 
         prefixes = Prefix.objects.bulk_create((
@@ -210,6 +229,42 @@ class TestPrefix(TestCase):
         IPRange.objects.create(start_address=IPNetwork('10.0.0.33/24'), end_address=IPNetwork('10.0.0.64/24'))
         self.assertEqual(prefix.get_utilization(), 64 / 254 * 100)  # ~25% utilization
 
+    def test_cached_utilization(self):
+        container = Prefix.objects.create(
+            prefix=IPNetwork('10.0.0.0/16'),
+            status=PrefixStatusChoices.STATUS_CONTAINER
+        )
+        prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'))
+        container.refresh_from_db()
+        self.assertEqual(container.utilization, 1 / 256 * 100)
+        self.assertEqual(prefix.utilization, 0)
+
+        # Create an IP, and a range which overlaps it
+        IPAddress.objects.create(address=IPNetwork('10.0.0.1/24'))
+        iprange = IPRange.objects.create(
+            start_address=IPNetwork('10.0.0.1/24'),
+            end_address=IPNetwork('10.0.0.127/24')
+        )
+        prefix.refresh_from_db()
+        self.assertAlmostEqual(prefix.utilization, 127 / 254 * 100)
+        self.assertAlmostEqual(prefix.utilization, prefix.get_utilization())
+
+        # Move the range to another VRF
+        iprange.vrf = VRF.objects.create(name='VRF 1')
+        iprange.save()
+        prefix.refresh_from_db()
+        self.assertAlmostEqual(prefix.utilization, 1 / 254 * 100)
+
+        # Mark the prefix as fully utilized
+        prefix.mark_utilized = True
+        prefix.save()
+        self.assertEqual(prefix.utilization, 100)
+
+        # Deleting the child prefix should update the container
+        prefix.delete()
+        container.refresh_from_db()
+        self.assertEqual(container.utilization, 0)
+
     #
     # Uniqueness enforcement tests
     #
@@ -436,6 +491,33 @@ class TestPrefixHierarchy(TestCase):
         self.assertEqual(prefixes[3]._depth, 2)
         self.assertEqual(prefixes[3]._children, 0)
 
+    def test_rebuild_prefixes(self):
+        # Duplicate 10.0.0.0/16 and reset all counts
+        Prefix(prefix='10.0.0.0/16').save()
+        Prefix.objects.update(_depth=0, _children=0)
+
+        rebuild_prefixes(None)
+
+        prefixes = Prefix.objects.filter(prefix__family=4)
+        self.assertEqual(prefixes[0].prefix, IPNetwork('10.0.0.0/8'))
+        self.assertEqual(prefixes[0]._depth, 0)
+        self.assertEqual(prefixes[0]._children, 3)
+        self.assertEqual(prefixes[1].prefix, IPNetwork('10.0.0.0/16'))
+        self.assertEqual(prefixes[1]._depth, 1)
+        self.assertEqual(prefixes[1]._children, 1)
+        self.assertEqual(prefixes[2].prefix, IPNetwork('10.0.0.0/16'))
+        self.assertEqual(prefixes[2]._depth, 1)
+        self.assertEqual(prefixes[2]._children, 1)
+        self.assertEqual(prefixes[3].prefix, IPNetwork('10.0.0.0/24'))
+        self.assertEqual(prefixes[3]._depth, 2)
+        self.assertEqual(prefixes[3]._children, 0)
+
+        prefixes = Prefix.objects.filter(prefix__family=6)
+        self.assertEqual(prefixes[0]._depth, 0)
+        self.assertEqual(prefixes[0]._children, 2)
+        self.assertEqual(prefixes[2]._depth, 2)
+        self.assertEqual(prefixes[2]._children, 0)
+
 
 class TestIPAddress(TestCase):
 
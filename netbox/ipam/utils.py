@@ -1,4 +1,5 @@
 import netaddr
+from django.db import connection
 
 from .constants import *
 from .models import Prefix, VLAN
@@ -128,7 +129,8 @@ def add_available_vlans(vlans, vlan_group=None):
 
 def rebuild_prefixes(vrf):
     """
-    Rebuild the prefix hierarchy for all prefixes in the specified VRF (or global table).
+    Rebuild the prefix hierarchy for all prefixes in the specified VRF (or global table). The hierarchy is computed in
+    a single ordered pass over the VRF's prefixes, and the results are written using a single UPDATE statement.
     """
     def contains(parent, child):
         return child in parent and child != parent
@@ -143,44 +145,49 @@ def rebuild_prefixes(vrf):
             'children': 0,
         })
 
+    def pop_from_stack():
+        node = stack.pop()
+        for pk in node['pk']:
+            pks.append(pk)
+            depths.append(len(stack))
+            children.append(node['children'])
+
     stack = []
-    update_queue = []
-    prefixes = Prefix.objects.filter(vrf=vrf).values('pk', 'prefix')
+    pks = []
+    depths = []
+    children = []
+    prefixes = Prefix.objects.filter(vrf=vrf).order_by('prefix', 'pk').values('pk', 'prefix')
 
     # Iterate through all Prefixes in the VRF, growing and shrinking the stack as we go
-    for i, p in enumerate(prefixes):
+    for p in prefixes.iterator():
 
         # Grow the stack if this is a child of the most recent prefix
         if not stack or contains(stack[-1]['prefix'], p['prefix']):
             push_to_stack(p)
 
-        # Handle duplicate prefixes
+        # Handle duplicate prefixes (each of which counts as a child of its parents)
         elif stack[-1]['prefix'] == p['prefix']:
             stack[-1]['pk'].append(p['pk'])
+            for n in stack[:-1]:
+                n['children'] += 1
 
         # If this is a sibling or parent of the most recent prefix, pop nodes from the
         # stack until we reach a parent prefix (or the root)
         else:
             while stack and not contains(stack[-1]['prefix'], p['prefix']):
-                node = stack.pop()
-                for pk in node['pk']:
-                    update_queue.append(
-                        Prefix(pk=pk, _depth=len(stack), _children=node['children'])
-                    )
+                pop_from_stack()
             push_to_stack(p)
 
-        # Flush the update queue once it reaches 100 Prefixes
-        if len(update_queue) >= 100:
-            Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
-            update_queue = []
-
     # Clear out any prefixes remaining in the stack
     while stack:
-        node = stack.pop()
-        for pk in node['pk']:
-            update_queue.append(
-                Prefix(pk=pk, _depth=len(stack), _children=node['children'])
+        pop_from_stack()
+
+    # Write the depth & children count of every Prefix in a single query
+    if pks:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE "{Prefix._meta.db_table}" AS p SET "_depth" = h.depth, "_children" = h.children '
+                f'FROM unnest(%s::bigint[], %s::smallint[], %s::bigint[]) AS h(id, depth, children) '
+                f'WHERE p.id = h.id',
+                [pks, depths, children]
             )
-
-    # Final flush of any remaining Prefixes
-    Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
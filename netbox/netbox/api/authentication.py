@@ -1,10 +1,37 @@
+import django_rq
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework import authentication, exceptions
 from rest_framework.permissions import BasePermission, DjangoObjectPermissions, SAFE_METHODS
 
+from users.constants import TOKEN_CACHE_TIMEOUT, TOKEN_LAST_USED_INTERVAL
 from users.models import Token
 
 
+def update_last_used(token_id, timestamp):
+    """
+    Record the time at which a Token was last used. Called asynchronously by record_token_use().
+    """
+    Token.objects.filter(
+        Q(last_used__isnull=True) | Q(last_used__lt=timestamp),
+        pk=token_id
+    ).update(last_used=timestamp)
+
+
+def record_token_use(token):
+    """
+    Schedule an update of a Token's last used time. To avoid writing to the database on every request, the time is
+    updated at most once per TOKEN_LAST_USED_INTERVAL (across all processes) by a background worker.
+    """
+    now = timezone.now()
+    if token.last_used and (now - token.last_used).total_seconds() < TOKEN_LAST_USED_INTERVAL:
+        return
+    if cache.add(f'api_token_used:{token.pk}', True, TOKEN_LAST_USED_INTERVAL):
+        django_rq.get_queue('low').enqueue(update_last_used, token.pk, now)
+
+
 class TokenAuthentication(authentication.TokenAuthentication):
     """
     A custom authentication scheme which enforces Token expiration times.
@@ -13,18 +40,28 @@ class TokenAuthentication(authentication.TokenAuthentication):
 
     def authenticate_credentials(self, key):
         model = self.get_model()
-        try:
-            token = model.objects.prefetch_related('user').get(key=key)
-        except model.DoesNotExist:
-            raise exceptions.AuthenticationFailed("Invalid token")
 
-        # Enforce the Token's expiration time, if one has been set.
+        # Retrieve the Token and its User from the cache, if available. Cached Tokens are evicted whenever the Token or
+        # its User is modified.
+        cache_key = model.get_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed("Invalid token")
+            cache.set(cache_key, token, TOKEN_CACHE_TIMEOUT)
+
+        # Enforce the Token's expiration time, if one has been set. This is evaluated on every request, as the Token
+        # may have expired since it was cached.
         if token.is_expired:
             raise exceptions.AuthenticationFailed("Token expired")
 
         if not token.user.is_active:
             raise exceptions.AuthenticationFailed("User inactive")
 
+        record_token_use(token)
+
         # When LDAP authentication is active try to load user data from LDAP directory
         if settings.REMOTE_AUTH_BACKEND == 'netbox.authentication.LDAPBackend':
             from netbox.authentication import LDAPBackend
@@ -1,7 +1,11 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db.models import QuerySet
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from netbox.config import get_config
+from utilities.utils import estimate_count
 
 
 class OptionalLimitOffsetPagination(LimitOffsetPagination):
@@ -9,12 +13,23 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
     Override the stock paginator to allow setting limit=0 to disable pagination for a request. This returns all objects
     matching a query, but retains the same format as a paginated request. The limit can only be disabled if
     MAX_PAGE_SIZE has been set to 0 or None.
+
+    Keyset pagination may be selected instead by passing `after_id` (which may be empty to begin with the first
+    object). Objects are then returned in order of their IDs, beginning after the specified ID, and the link to the
+    next page indicates the last ID on the current page. This avoids both counting all matching objects and skipping
+    past the objects on prior pages, which become very expensive for large tables. The count is estimated.
     """
+    after_id_query_param = 'after_id'
+
     def __init__(self):
         self.default_limit = get_config().PAGINATE_COUNT
+        self.keyset = False
 
     def paginate_queryset(self, queryset, request, view=None):
 
+        if isinstance(queryset, QuerySet) and self.after_id_query_param in request.query_params:
+            return self.paginate_queryset_by_keyset(queryset, request)
+
         if isinstance(queryset, QuerySet):
             self.count = queryset.count()
         else:
@@ -36,6 +51,40 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         else:
             return list(queryset[self.offset:])
 
+    def paginate_queryset_by_keyset(self, queryset, request):
+        self.keyset = True
+        self.count = estimate_count(queryset)
+        self.limit = self.get_limit(request)
+        self.offset = 0
+        self.request = request
+        self.next_id = None
+
+        # Order by primary key (ignoring any other ordering) so that the index on it is used to find each page
+        queryset = queryset.order_by('pk')
+        after_id = self.get_after_id(request, queryset.model)
+        if after_id is not None:
+            queryset = queryset.filter(pk__gt=after_id)
+
+        if not self.limit:
+            return list(queryset)
+
+        # Retrieve one additional object to determine whether a next page exists
+        results = list(queryset[:self.limit + 1])
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_id = results[-1].pk
+
+        return results
+
+    def get_after_id(self, request, model):
+        value = request.query_params[self.after_id_query_param]
+        if not value:
+            return None
+        try:
+            return model._meta.pk.to_python(value)
+        except DjangoValidationError:
+            raise ValidationError({self.after_id_query_param: f"Invalid object ID: {value}"})
+
     def get_limit(self, request):
         if self.limit_query_param:
             try:
@@ -58,12 +107,18 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         if not self.limit:
             return None
 
+        if self.keyset:
+            if self.next_id is None:
+                return None
+            url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+            return replace_query_param(url, self.after_id_query_param, self.next_id)
+
         return super().get_next_link()
 
     def get_previous_link(self):
 
-        # Pagination has been disabled
-        if not self.limit:
+        # Pagination has been disabled (or keyset pagination, which proceeds only forward, is in use)
+        if not self.limit or self.keyset:
             return None
 
         return super().get_previous_link()
@@ -5,12 +5,17 @@ from django import __version__ as DJANGO_VERSION
 from django.apps import apps
 from django.conf import settings
 from django_rq.queues import get_connection
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 from rq.worker import Worker
 
+from extras.search import get_indexed_fields, remove_stale_values, search
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
+from netbox.api.pagination import OptionalLimitOffsetPagination
+from utilities.api import get_serializer_for_model
+from utilities.utils import content_type_identifier
 
 
 class APIRootView(APIView):
@@ -32,6 +37,7 @@ class APIRootView(APIView):
             ('extras', reverse('extras-api:api-root', request=request, format=format)),
             ('ipam', reverse('ipam-api:api-root', request=request, format=format)),
             ('plugins', reverse('plugins-api:api-root', request=request, format=format)),
+            ('search', reverse('api-search', request=request, format=format)),
             ('status', reverse('api-status', request=request, format=format)),
             ('tenancy', reverse('tenancy-api:api-root', request=request, format=format)),
             ('users', reverse('users-api:api-root', request=request, format=format)),
@@ -74,3 +80,50 @@ class StatusView(APIView):
             'python-version': platform.python_version(),
             'rq-workers-running': Worker.count(get_connection('default')),
         })
+
+
+class SearchView(APIView):
+    """
+    Search objects of all types using the global search index. Results are ordered by relevance. The search may be
+    limited to specific object types by passing one or more `type` parameters (e.g. `?q=foo&type=dcim.site`).
+    """
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+    pagination_class = OptionalLimitOffsetPagination
+
+    def _get_object_types(self, request):
+        object_types = []
+        for label in request.query_params.getlist('type'):
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                raise ValidationError({'type': f"Invalid object type: {label}"})
+            if not get_indexed_fields(model):
+                raise ValidationError({'type': f"Object type {label} is not searchable"})
+            object_types.append(model)
+        return object_types
+
+    def get(self, request):
+        queryset = search(
+            request.query_params.get('q', ''),
+            request.user,
+            object_types=self._get_object_types(request)
+        ).prefetch_related('object_type', 'object')
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        context = {'request': request}
+
+        # Omit (and prune from the index) any stale results for objects which no longer exist
+        stale = [result for result in page if result.object is None]
+        if stale:
+            remove_stale_values(stale)
+
+        return paginator.get_paginated_response([
+            {
+                'object_type': content_type_identifier(result.object_type),
+                'object_id': result.object_id,
+                'object': get_serializer_for_model(result.object, prefix='Nested')(result.object, context=context).data,
+                'field': result.field,
+                'value': result.value,
+            } for result in page if result.object is not None
+        ])
@@ -1,9 +1,14 @@
-from django.core.exceptions import ObjectDoesNotExist
+import logging
+
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
 from django.db import transaction
 from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from rest_framework.serializers import ModelSerializer
 
-from netbox.api.serializers import BulkOperationSerializer
+from netbox.api.serializers import BulkOperationSerializer, TaggableModelSerializer
+from netbox.bulk import bulk_update_objects, supports_bulk_update
 
 __all__ = (
     'BulkUpdateModelMixin',
@@ -49,17 +54,83 @@ class BulkUpdateModelMixin:
 
     def perform_bulk_update(self, objects, update_data, partial):
         with transaction.atomic():
-            data_list = []
+            serializers = []
             for obj in objects:
                 data = update_data.get(obj.id)
                 if hasattr(obj, 'snapshot'):
                     obj.snapshot()
                 serializer = self.get_serializer(obj, data=data, partial=partial)
                 serializer.is_valid(raise_exception=True)
-                self.perform_update(serializer)
-                data_list.append(serializer.data)
+                serializers.append(serializer)
+
+            # Write all changes at once if none of them rely on save() being called for each object
+            if serializers and self._use_bulk_update(serializers):
+                self._bulk_update(serializers)
+            else:
+                for serializer in serializers:
+                    self.perform_update(serializer)
 
-            return data_list
+            return [serializer.data for serializer in serializers]
+
+    def _use_bulk_update(self, serializers):
+        """
+        Determine whether the validated changes can be written using bulk_update_objects(). This requires that the
+        serializer does not customize update(), and that only concrete fields (along with tags) are being modified.
+        """
+        model = self.queryset.model
+        if type(serializers[0]).update not in (TaggableModelSerializer.update, ModelSerializer.update):
+            return False
+
+        fields = set()
+        for serializer in serializers:
+            for name in serializer.validated_data:
+                if name == 'tags':
+                    continue
+                try:
+                    field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    return False
+                if not field.concrete or field.many_to_many:
+                    return False
+                fields.add(name)
+
+        return supports_bulk_update(model, fields)
+
+    def _bulk_update(self, serializers):
+        """
+        Apply the validated data of each serializer to its instance and write all instances using
+        bulk_update_objects(). Each serializer's instance is replaced with the updated object.
+        """
+        model = self.queryset.model
+        logger = logging.getLogger('netbox.api.views.ModelViewSet')
+        logger.info(f"Updating {len(serializers)} {model._meta.verbose_name_plural}")
+
+        instances = []
+        fields = set()
+        tag_changes = {}
+        for serializer in serializers:
+            instance = serializer.instance
+            validated_data = dict(serializer.validated_data)
+            tags = validated_data.pop('tags', None)
+            for name, value in validated_data.items():
+                setattr(instance, name, value)
+            fields.update(validated_data)
+            if tags is not None:
+                current_tags = set(instance.tags.all())
+                tag_changes[instance.pk] = (set(tags) - current_tags, current_tags - set(tags))
+            instances.append(instance)
+
+        # Enforce object-level permissions
+        try:
+            with transaction.atomic():
+                updated_objects = bulk_update_objects(instances, fields, tag_changes=tag_changes)
+                self._validate_objects(updated_objects)
+        except ObjectDoesNotExist:
+            raise PermissionDenied()
+
+        updated_objects = {obj.pk: obj for obj in updated_objects}
+        for serializer in serializers:
+            serializer.instance = updated_objects[serializer.instance.pk]
 
     def bulk_partial_update(self, request, *args, **kwargs):
         kwargs['partial'] = True
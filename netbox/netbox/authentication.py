@@ -1,3 +1,4 @@
+import hashlib
 import logging
 from collections import defaultdict
 
@@ -9,7 +10,9 @@ from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Q
 
 from users.models import ObjectPermission
-from utilities.permissions import permission_is_exempt, resolve_permission, resolve_permission_ct
+from utilities.permissions import (
+    object_permission_cache, permission_is_exempt, resolve_permission, resolve_permission_ct,
+)
 
 UserModel = get_user_model()
 
@@ -58,12 +61,22 @@ class ObjectPermissionMixin:
         if not user_obj.is_active or user_obj.is_anonymous:
             return dict()
         if not hasattr(user_obj, '_object_perm_cache'):
-            user_obj._object_perm_cache = self.get_object_permissions(user_obj)
+            user_obj._object_perm_cache = object_permission_cache.get(
+                self.get_permission_cache_key(user_obj),
+                lambda: self.get_object_permissions(user_obj)
+            )
         return user_obj._object_perm_cache
 
     def get_permission_filter(self, user_obj):
         return Q(users=user_obj) | Q(groups__user=user_obj)
 
+    def get_permission_cache_key(self, user_obj):
+        """
+        Return a string identifying the user's cached permissions. This must reflect any input to get_permission_filter()
+        which is not stored in the database (and thus not covered by the cache's invalidation).
+        """
+        return str(user_obj.pk)
+
     def get_object_permissions(self, user_obj):
         """
         Return all permissions granted to the user by an ObjectPermission.
@@ -113,16 +126,8 @@ class ObjectPermissionMixin:
         if model._meta.label_lower != '.'.join((app_label, model_name)):
             raise ValueError(f"Invalid permission {perm} for model {model}")
 
-        # Compile a query filter that matches all instances of the specified model
-        obj_perm_constraints = self.get_all_permissions(user_obj)[perm]
-        constraints = Q()
-        for perm_constraints in obj_perm_constraints:
-            if perm_constraints:
-                constraints |= Q(**perm_constraints)
-            else:
-                # Found ObjectPermission with null constraints; allow model-level access
-                constraints = Q()
-                break
+        # Retrieve the (memoized) query filter that matches all permitted instances of the specified model
+        constraints = self.get_all_permissions(user_obj).get_filter(perm)
 
         # Permission to perform the requested action on the object depends on whether the specified object matches
         # the specified constraints. Note that this check is made against the *database* record representing the object,
@@ -300,6 +305,16 @@ try:
                     hasattr(user_obj.ldap_user, "group_names")):
                 permission_filter = permission_filter | Q(groups__name__in=user_obj.ldap_user.group_names)
             return permission_filter
+
+        def get_permission_cache_key(self, user_obj):
+            cache_key = super().get_permission_cache_key(user_obj)
+            if (self.settings.FIND_GROUP_PERMS and
+                    hasattr(user_obj, "ldap_user") and
+                    hasattr(user_obj.ldap_user, "group_names")):
+                # Permissions granted via LDAP groups depend on the user's current group memberships
+                group_names = ','.join(sorted(user_obj.ldap_user.group_names))
+                cache_key = f'{cache_key}:{hashlib.sha256(group_names.encode()).hexdigest()}'
+            return cache_key
 except ModuleNotFoundError:
     pass
 
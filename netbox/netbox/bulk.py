@@ -0,0 +1,245 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import post_save, pre_save
+from django.dispatch.dispatcher import _make_id
+from django.utils import timezone
+from django_prometheus.models import model_inserts, model_updates
+
+from extras.choices import ObjectChangeActionChoices
+from extras.models import CachedValue, TaggedItem
+from extras.search import get_cached_values, get_indexed_fields
+from extras.utils import is_taggable
+from extras.webhooks import enqueue_object
+from netbox import thread_locals
+from netbox.request_context import get_request
+from utilities.fields import NaturalOrderingField
+
+__all__ = (
+    'BULK_BATCH_SIZE',
+    'bulk_create_objects',
+    'bulk_update_objects',
+    'supports_bulk_create',
+    'supports_bulk_update',
+)
+
+# Maximum number of objects validated and written together when creating or updating objects in bulk
+BULK_BATCH_SIZE = 500
+
+
+def _has_receivers(signal, sender):
+    """
+    Return True if any receivers have been connected to the signal specifically for the given sender.
+    """
+    sender_id = _make_id(sender)
+    return any(lookup_key[1] == sender_id for lookup_key, _ in signal.receivers)
+
+
+def supports_bulk_update(model, fields):
+    """
+    Return True if changes to the specified fields of the model's instances can be written by bulk_update_objects()
+    rather than by calling save() on each instance. This is the case unless the model overrides save() or has pre/post
+    save receivers of its own, since these might implement side effects which would be bypassed. A model which overrides
+    save() may declare the fields on which its side effects depend as `bulk_update_unsafe_fields`; changes to any other
+    fields may then be written in bulk.
+
+    :param model: The model being updated
+    :param fields: The names of the fields being modified
+    """
+    # Identify the class which implements save()
+    save_class = next(cls for cls in model.__mro__ if 'save' in cls.__dict__)
+    if save_class is not models.Model:
+        unsafe_fields = getattr(model, 'bulk_update_unsafe_fields', None)
+        if unsafe_fields is None or set(fields) & set(unsafe_fields):
+            return False
+
+    return not (_has_receivers(pre_save, model) or _has_receivers(post_save, model))
+
+
+def supports_bulk_create(model, fields):
+    """
+    Return True if new instances of the model, populated with values for the specified fields, can be created by
+    bulk_create_objects() rather than by calling save() on each instance. The same conditions apply as for
+    supports_bulk_update().
+
+    :param model: The model being created
+    :param fields: The names of the fields for which values are being provided
+    """
+    return supports_bulk_update(model, fields)
+
+
+def _update_fields(instances, fields):
+    """
+    Write the specified fields of each instance to the database. Fields which hold the same value for every instance
+    are written with a single UPDATE; any others are written using bulk_update().
+    """
+    model = instances[0]._meta.model
+    uniform_values = {}
+    varying_fields = []
+    for name in fields:
+        attname = model._meta.get_field(name).attname
+        values = [getattr(instance, attname) for instance in instances]
+        if all(value == values[0] for value in values):
+            uniform_values[attname] = values[0]
+        else:
+            varying_fields.append(name)
+
+    if uniform_values:
+        model.objects.filter(pk__in=[instance.pk for instance in instances]).update(**uniform_values)
+    if varying_fields:
+        model.objects.bulk_update(instances, varying_fields)
+
+
+def _update_tags(instances, tag_changes):
+    """
+    Assign and remove tags for many objects at once, using a single INSERT and one DELETE per tag removed.
+
+    :param instances: The objects being updated
+    :param tag_changes: A dictionary mapping object PKs to a tuple of the tags to be added and removed
+    """
+    content_type = ContentType.objects.get_for_model(instances[0])
+    pks = [instance.pk for instance in instances if instance.pk in tag_changes]
+    existing = set(
+        TaggedItem.objects.filter(content_type=content_type, object_id__in=pks).values_list('object_id', 'tag_id')
+    )
+
+    to_create = []
+    to_delete = defaultdict(set)
+    for pk in pks:
+        add_tags, remove_tags = tag_changes[pk]
+        for tag in add_tags or []:
+            if (pk, tag.pk) not in existing:
+                to_create.append(TaggedItem(content_type=content_type, object_id=pk, tag=tag))
+                existing.add((pk, tag.pk))
+        for tag in remove_tags or []:
+            if (pk, tag.pk) in existing:
+                to_delete[tag.pk].add(pk)
+
+    TaggedItem.objects.bulk_create(to_create)
+    for tag_id, object_ids in to_delete.items():
+        TaggedItem.objects.filter(content_type=content_type, object_id__in=object_ids, tag_id=tag_id).delete()
+
+
+def _record_changes(instances, action):
+    """
+    Record an ObjectChange and enqueue webhooks for each created or updated object, as handle_changed_object() would do
+    upon saving it. This has no effect unless change logging is enabled (i.e. within the change_logging context
+    manager).
+    """
+    changelog_buffer = getattr(thread_locals, 'changelog_buffer', None)
+    if changelog_buffer is None or not hasattr(instances[0], 'to_objectchange'):
+        return
+    request = get_request()
+    webhook_queue = thread_locals.webhook_queue
+
+    for instance in instances:
+        objectchange = instance.to_objectchange(action)
+        objectchange.user = request.user
+        objectchange.request_id = request.id
+        changelog_buffer.append(objectchange)
+        enqueue_object(webhook_queue, instance, request.user, request.id, action)
+
+    if action == ObjectChangeActionChoices.ACTION_CREATE:
+        model_inserts.labels(instances[0]._meta.model_name).inc(len(instances))
+    else:
+        model_updates.labels(instances[0]._meta.model_name).inc(len(instances))
+
+
+def _update_search_index(instances, created=False):
+    """
+    Replace the cached search values of the updated objects (or add those of newly created objects).
+    """
+    content_type = ContentType.objects.get_for_model(instances[0])
+    if not created:
+        CachedValue.objects.filter(object_type=content_type, object_id__in=[obj.pk for obj in instances]).delete()
+    CachedValue.objects.bulk_create([
+        value for instance in instances for value in get_cached_values(instance, content_type)
+    ])
+
+
+def bulk_update_objects(instances, fields, tag_changes=None):
+    """
+    Write changes made to a list of objects (all of the same model) in bulk, without calling save() on each. The
+    objects must already have been validated, and should have been snapshotted (where supported) before being
+    modified. The effects of saving each object are replicated in bulk: The last_updated time of each object is set,
+    an ObjectChange is recorded and webhooks are enqueued for each, and the search index is updated.
+
+    Returns a list of the updated objects, freshly retrieved from the database.
+
+    :param instances: The modified objects
+    :param fields: The names of the concrete fields which have been modified
+    :param tag_changes: A dictionary mapping object PKs to a tuple of the tags to be added and removed (optional)
+    """
+    if not instances:
+        return []
+    model = instances[0]._meta.model
+    fields = list(fields)
+
+    # Neither update() nor bulk_update() calls Field.pre_save(), so replicate the naturalization of any fields on
+    # which NaturalOrderingFields depend
+    for field in model._meta.concrete_fields:
+        if isinstance(field, NaturalOrderingField) and field.target_field in fields and field.name not in fields:
+            for instance in instances:
+                field.pre_save(instance, False)
+            fields.append(field.name)
+
+    # Replicate auto_now, which is applied only by save()
+    if hasattr(model, 'last_updated'):
+        now = timezone.now()
+        for instance in instances:
+            instance.last_updated = now
+        fields.append('last_updated')
+
+    if fields:
+        _update_fields(instances, fields)
+    if tag_changes:
+        _update_tags(instances, tag_changes)
+
+    # Retrieve the updated objects (along with their tags) for change logging and indexing
+    updated_objects = model.objects.filter(pk__in=[instance.pk for instance in instances])
+    if is_taggable(instances[0]):
+        updated_objects = updated_objects.prefetch_related('tags')
+    snapshots = {instance.pk: getattr(instance, '_prechange_snapshot', None) for instance in instances}
+    updated_objects = list(updated_objects)
+    for obj in updated_objects:
+        if snapshots[obj.pk] is not None:
+            obj._prechange_snapshot = snapshots[obj.pk]
+
+    _record_changes(updated_objects, ObjectChangeActionChoices.ACTION_UPDATE)
+    if get_indexed_fields(model):
+        _update_search_index(updated_objects)
+
+    return updated_objects
+
+
+def bulk_create_objects(instances, tags=None):
+    """
+    Create a list of new objects (all of the same model) using bulk_create(), without calling save() on each. The
+    objects must already have been validated. An ObjectChange is recorded and webhooks are enqueued for each object,
+    and the objects are added to the search index, as would be done upon saving each.
+
+    Returns the list of created objects, with their primary keys assigned.
+
+    :param instances: The new objects
+    :param tags: A list of the tags to be assigned to each object, in the same order as the objects (optional)
+    """
+    if not instances:
+        return []
+    model = instances[0]._meta.model
+    instances = model.objects.bulk_create(instances, batch_size=BULK_BATCH_SIZE)
+    if tags:
+        _update_tags(instances, {
+            instance.pk: (instance_tags, None) for instance, instance_tags in zip(instances, tags)
+        })
+
+    # Prefetch any tags to avoid a query per object when recording changes
+    if is_taggable(instances[0]):
+        prefetch_related_objects(instances, 'tags')
+
+    _record_changes(instances, ObjectChangeActionChoices.ACTION_CREATE)
+    if get_indexed_fields(model):
+        _update_search_index(instances, created=True)
+
+    return instances
@@ -1,9 +1,12 @@
 import logging
 import threading
+import time
 
 from django.conf import settings
 from django.core.cache import cache
+from django.core.signals import setting_changed
 from django.db.utils import DatabaseError
+from django.dispatch import receiver
 
 from .parameters import PARAMS
 
@@ -12,32 +15,80 @@ __all__ = (
     'ConfigItem',
     'get_config',
     'PARAMS',
+    'reset_config',
 )
 
+# Maximum number of seconds for which a process will use its current configuration before checking for a new revision
+CONFIG_CHECK_INTERVAL = 5
+
 _thread_locals = threading.local()
 
+# The configuration shared by all threads within the process, and the time at which its version was last checked
+_config = None
+_config_checked = 0
+
 logger = logging.getLogger('netbox.config')
 
 
 def get_config():
     """
-    Return the current NetBox configuration, pulling it from cache if not already loaded in memory.
+    Return the current NetBox configuration. Once retrieved, the configuration is pinned to the current thread (e.g. for
+    the duration of a request) until clear_config() is called.
     """
     if not hasattr(_thread_locals, 'config'):
-        _thread_locals.config = Config()
-        logger.debug("Initialized configuration")
+        _thread_locals.config = _get_process_config()
     return _thread_locals.config
 
 
+def _get_process_config():
+    """
+    Return the process-wide configuration, replacing it if its version has changed. The cached version is checked at
+    most once every CONFIG_CHECK_INTERVAL seconds.
+    """
+    global _config, _config_checked
+
+    now = time.monotonic()
+    if _config is None:
+        _config = Config()
+        _config_checked = now
+        logger.debug("Initialized configuration")
+    elif now - _config_checked >= CONFIG_CHECK_INTERVAL:
+        _config_checked = now
+        if cache.get('config_version') != _config.version:
+            _config = Config()
+            logger.debug("Reloaded configuration")
+
+    return _config
+
+
 def clear_config():
     """
-    Delete the currently loaded configuration, if any.
+    Unpin the configuration from the current thread, if any. The process-wide configuration is retained.
     """
     if hasattr(_thread_locals, 'config'):
         del _thread_locals.config
         logger.debug("Cleared configuration")
 
 
+def reset_config():
+    """
+    Discard the process-wide configuration (e.g. because a new revision has been activated), forcing it to be reloaded
+    from the cache when next requested.
+    """
+    global _config
+    _config = None
+    clear_config()
+
+
+@receiver(setting_changed)
+def handle_setting_changed(**kwargs):
+    """
+    Discard the current configuration when a setting is changed (e.g. by override_settings() in tests), as parameters
+    defined in settings take precedence over dynamic configuration.
+    """
+    reset_config()
+
+
 class Config:
     """
     Fetch and store in memory the current NetBox configuration. This class must be instantiated prior to access, and
@@ -49,20 +100,22 @@ class Config:
             self._populate_from_db()
         self.defaults = {param.name: param.default for param in PARAMS}
 
+        # Resolve the value of each parameter in order of precedence: hard-coded configuration in settings.py, then the
+        # cached config, then the parameter's default value
+        self.params = {**self.defaults, **self.config}
+        for name in self.params:
+            if hasattr(settings, name):
+                self.params[name] = getattr(settings, name)
+
     def __getattr__(self, item):
+        params = self.__dict__.get('params', {})
+        if item in params:
+            return params[item]
 
         # Check for hard-coded configuration in settings.py
         if hasattr(settings, item):
             return getattr(settings, item)
 
-        # Return config value from cache
-        if item in self.config:
-            return self.config[item]
-
-        # Fall back to the parameter's default value
-        if item in self.defaults:
-            return self.defaults[item]
-
         raise AttributeError(f"Invalid configuration parameter: {item}")
 
     def _populate_from_cache(self):
@@ -108,6 +108,13 @@ PARAMS = (
         default=1000,
         field=forms.IntegerField
     ),
+    ConfigParam(
+        name='PAGINATE_ESTIMATE_THRESHOLD',
+        label='Estimated count threshold',
+        default=100000,
+        description="Lists of objects estimated to exceed this size are not counted exactly (0 to disable)",
+        field=forms.IntegerField
+    ),
 
     # Validation
     ConfigParam(
@@ -28,14 +28,21 @@ from virtualization.filtersets import ClusterFilterSet, VirtualMachineFilterSet
 from virtualization.models import Cluster, VirtualMachine
 from virtualization.tables import ClusterTable, VirtualMachineTable
 
-SEARCH_MAX_RESULTS = 15
-
+# Each search type defines the fields to be included in the global search index, along with their weights (a lower
+# weight indicates a more relevant match).
 CIRCUIT_TYPES = OrderedDict(
     (
         ('provider', {
             'queryset': Provider.objects.annotate(
                 count_circuits=count_related(Circuit, 'provider')
             ),
+            'fields': (
+                ('name', 100),
+                ('account', 200),
+                ('noc_contact', 500),
+                ('admin_contact', 500),
+                ('comments', 5000),
+            ),
             'filterset': ProviderFilterSet,
             'table': ProviderTable,
             'url': 'circuits:provider_list',
@@ -44,12 +51,14 @@ CIRCUIT_TYPES = OrderedDict(
             'queryset': Circuit.objects.prefetch_related(
                 'type', 'provider', 'tenant', 'terminations__site'
             ),
+            'fields': (('cid', 100), ('description', 500), ('comments', 5000)),
             'filterset': CircuitFilterSet,
             'table': CircuitTable,
             'url': 'circuits:circuit_list',
         }),
         ('providernetwork', {
             'queryset': ProviderNetwork.objects.prefetch_related('provider'),
+            'fields': (('name', 100), ('service_id', 200), ('description', 500), ('comments', 5000)),
             'filterset': ProviderNetworkFilterSet,
             'table': ProviderNetworkTable,
             'url': 'circuits:providernetwork_list',
@@ -62,6 +71,14 @@ DCIM_TYPES = OrderedDict(
     (
         ('site', {
             'queryset': Site.objects.prefetch_related('region', 'tenant'),
+            'fields': (
+                ('name', 100),
+                ('facility', 100),
+                ('description', 500),
+                ('physical_address', 2000),
+                ('shipping_address', 2000),
+                ('comments', 5000),
+            ),
             'filterset': SiteFilterSet,
             'table': SiteTable,
             'url': 'dcim:site_list',
@@ -70,12 +87,14 @@ DCIM_TYPES = OrderedDict(
             'queryset': Rack.objects.prefetch_related('site', 'location', 'tenant', 'role').annotate(
                 device_count=count_related(Device, 'rack')
             ),
+            'fields': (('name', 100), ('facility_id', 100), ('serial', 200), ('asset_tag', 200), ('comments', 5000)),
             'filterset': RackFilterSet,
             'table': RackTable,
             'url': 'dcim:rack_list',
         }),
         ('rackreservation', {
             'queryset': RackReservation.objects.prefetch_related('site', 'rack', 'user'),
+            'fields': (('description', 500),),
             'filterset': RackReservationFilterSet,
             'table': RackReservationTable,
             'url': 'dcim:rackreservation_list',
@@ -94,6 +113,7 @@ DCIM_TYPES = OrderedDict(
                 'rack_count',
                 cumulative=True
             ).prefetch_related('site'),
+            'fields': (('name', 100), ('description', 500)),
             'filterset': LocationFilterSet,
             'table': LocationTable,
             'url': 'dcim:location_list',
@@ -102,6 +122,7 @@ DCIM_TYPES = OrderedDict(
             'queryset': DeviceType.objects.prefetch_related('manufacturer').annotate(
                 instance_count=count_related(Device, 'device_type')
             ),
+            'fields': (('model', 100), ('part_number', 200), ('comments', 5000)),
             'filterset': DeviceTypeFilterSet,
             'table': DeviceTypeTable,
             'url': 'dcim:devicetype_list',
@@ -110,6 +131,7 @@ DCIM_TYPES = OrderedDict(
             'queryset': Device.objects.prefetch_related(
                 'device_type__manufacturer', 'device_role', 'tenant', 'site', 'rack', 'primary_ip4', 'primary_ip6',
             ),
+            'fields': (('name', 100), ('serial', 200), ('asset_tag', 200), ('comments', 5000)),
             'filterset': DeviceFilterSet,
             'table': DeviceTable,
             'url': 'dcim:device_list',
@@ -118,6 +140,7 @@ DCIM_TYPES = OrderedDict(
             'queryset': ModuleType.objects.prefetch_related('manufacturer').annotate(
                 instance_count=count_related(Module, 'module_type')
             ),
+            'fields': (('model', 100), ('part_number', 200), ('comments', 5000)),
             'filterset': ModuleTypeFilterSet,
             'table': ModuleTypeTable,
             'url': 'dcim:moduletype_list',
@@ -126,6 +149,7 @@ DCIM_TYPES = OrderedDict(
             'queryset': Module.objects.prefetch_related(
                 'module_type__manufacturer', 'device', 'module_bay',
             ),
+            'fields': (('serial', 200), ('asset_tag', 200), ('comments', 5000)),
             'filterset': ModuleFilterSet,
             'table': ModuleTable,
             'url': 'dcim:module_list',
@@ -134,18 +158,21 @@ DCIM_TYPES = OrderedDict(
             'queryset': VirtualChassis.objects.prefetch_related('master').annotate(
                 member_count=count_related(Device, 'virtual_chassis')
             ),
+            'fields': (('name', 100), ('domain', 300)),
             'filterset': VirtualChassisFilterSet,
             'table': VirtualChassisTable,
             'url': 'dcim:virtualchassis_list',
         }),
         ('cable', {
             'queryset': Cable.objects.all(),
+            'fields': (('label', 100),),
             'filterset': CableFilterSet,
             'table': CableTable,
             'url': 'dcim:cable_list',
         }),
         ('powerfeed', {
             'queryset': PowerFeed.objects.all(),
+            'fields': (('name', 100), ('comments', 5000)),
             'filterset': PowerFeedFilterSet,
             'table': PowerFeedTable,
             'url': 'dcim:powerfeed_list',
@@ -157,36 +184,42 @@ IPAM_TYPES = OrderedDict(
     (
         ('vrf', {
             'queryset': VRF.objects.prefetch_related('tenant'),
+            'fields': (('name', 100), ('rd', 200), ('description', 500)),
             'filterset': VRFFilterSet,
             'table': VRFTable,
             'url': 'ipam:vrf_list',
         }),
         ('aggregate', {
             'queryset': Aggregate.objects.prefetch_related('rir'),
+            'fields': (('prefix', 100), ('description', 500)),
             'filterset': AggregateFilterSet,
             'table': AggregateTable,
             'url': 'ipam:aggregate_list',
         }),
         ('prefix', {
             'queryset': Prefix.objects.prefetch_related('site', 'vrf__tenant', 'tenant', 'vlan', 'role'),
+            'fields': (('prefix', 100), ('description', 500)),
             'filterset': PrefixFilterSet,
             'table': PrefixTable,
             'url': 'ipam:prefix_list',
         }),
         ('ipaddress', {
             'queryset': IPAddress.objects.prefetch_related('vrf__tenant', 'tenant'),
+            'fields': (('address', 100), ('dns_name', 300), ('description', 500)),
             'filterset': IPAddressFilterSet,
             'table': IPAddressTable,
             'url': 'ipam:ipaddress_list',
         }),
         ('vlan', {
             'queryset': VLAN.objects.prefetch_related('site', 'group', 'tenant', 'role'),
+            'fields': (('vid', 100), ('name', 100), ('description', 500)),
             'filterset': VLANFilterSet,
             'table': VLANTable,
             'url': 'ipam:vlan_list',
         }),
         ('asn', {
             'queryset': ASN.objects.prefetch_related('rir', 'tenant'),
+            'fields': (('asn', 100), ('description', 500)),
             'filterset': ASNFilterSet,
             'table': ASNTable,
             'url': 'ipam:asn_list',
@@ -198,6 +231,7 @@ TENANCY_TYPES = OrderedDict(
     (
         ('tenant', {
             'queryset': Tenant.objects.prefetch_related('group'),
+            'fields': (('name', 100), ('slug', 110), ('description', 500), ('comments', 5000)),
             'filterset': TenantFilterSet,
             'table': TenantTable,
             'url': 'tenancy:tenant_list',
@@ -205,6 +239,15 @@ TENANCY_TYPES = OrderedDict(
         ('contact', {
             'queryset': Contact.objects.prefetch_related('group', 'assignments').annotate(
                 assignment_count=count_related(ContactAssignment, 'contact')),
+            'fields': (
+                ('name', 100),
+                ('title', 300),
+                ('phone', 300),
+                ('email', 300),
+                ('link', 300),
+                ('address', 2000),
+                ('comments', 5000),
+            ),
             'filterset': ContactFilterSet,
             'table': ContactTable,
             'url': 'tenancy:contact_list',
@@ -219,6 +262,7 @@ VIRTUALIZATION_TYPES = OrderedDict(
                 device_count=count_related(Device, 'cluster'),
                 vm_count=count_related(VirtualMachine, 'cluster')
             ),
+            'fields': (('name', 100), ('comments', 5000)),
             'filterset': ClusterFilterSet,
             'table': ClusterTable,
             'url': 'virtualization:cluster_list',
@@ -227,6 +271,7 @@ VIRTUALIZATION_TYPES = OrderedDict(
             'queryset': VirtualMachine.objects.prefetch_related(
                 'cluster', 'tenant', 'platform', 'primary_ip4', 'primary_ip6',
             ),
+            'fields': (('name', 100), ('comments', 5000)),
             'filterset': VirtualMachineFilterSet,
             'table': VirtualMachineTable,
             'url': 'virtualization:virtualmachine_list',
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import time
+
+import django_rq
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import BigIntegerField, F, Func
+
+from circuits.models import Circuit, Provider
+from dcim.models import (
+    Cable, ConsolePort, Device, DeviceType, Interface, PowerPanel, PowerFeed, PowerPort, Rack, Site,
+)
+from ipam.models import Aggregate, IPAddress, IPRange, Prefix, VLAN, VRF
+from tenancy.models import Tenant
+from utilities.permissions import PermissionSet, permission_is_exempt
+from virtualization.models import Cluster, VirtualMachine
+from wireless.models import WirelessLAN, WirelessLink
+
+__all__ = (
+    'get_stats',
+)
+
+# Number of seconds after which cached statistics are refreshed in the background
+STATS_CACHE_TIMEOUT = 60
+
+# Number of seconds for which stale statistics may be displayed while they are being refreshed
+STATS_CACHE_MAX_AGE = 60 * 60 * 24
+
+# The statistics displayed on the home page, arranged by section. Each item is defined as a permission name, a label,
+# and a function returning the queryset to be counted.
+STATS_SECTIONS = (
+    ("Organization", "domain", (
+        ("dcim.view_site", "Sites", Site.objects.all),
+        ("tenancy.view_tenant", "Tenants", Tenant.objects.all),
+    )),
+    ("IPAM", "counter", (
+        ("ipam.view_vrf", "VRFs", VRF.objects.all),
+        ("ipam.view_aggregate", "Aggregates", Aggregate.objects.all),
+        ("ipam.view_prefix", "Prefixes", Prefix.objects.all),
+        ("ipam.view_iprange", "IP Ranges", IPRange.objects.all),
+        ("ipam.view_ipaddress", "IP Addresses", IPAddress.objects.all),
+        ("ipam.view_vlan", "VLANs", VLAN.objects.all),
+    )),
+    ("Virtualization", "monitor", (
+        ("virtualization.view_cluster", "Clusters", Cluster.objects.all),
+        ("virtualization.view_virtualmachine", "Virtual Machines", VirtualMachine.objects.all),
+    )),
+    ("Inventory", "server", (
+        ("dcim.view_rack", "Racks", Rack.objects.all),
+        ("dcim.view_devicetype", "Device Types", DeviceType.objects.all),
+        ("dcim.view_device", "Devices", Device.objects.all),
+    )),
+    ("Circuits", "transit-connection-variant", (
+        ("circuits.view_provider", "Providers", Provider.objects.all),
+        ("circuits.view_circuit", "Circuits", Circuit.objects.all),
+    )),
+    ("Connections", "cable-data", (
+        ("dcim.view_cable", "Cables", Cable.objects.all),
+        ("dcim.view_consoleport", "Console", lambda: ConsolePort.objects.filter(
+            _path__destination_id__isnull=False
+        )),
+        ("dcim.view_interface", "Interfaces", lambda: Interface.objects.filter(
+            _path__destination_id__isnull=False,
+            pk__lt=F('_path__destination_id')
+        )),
+        ("dcim.view_powerport", "Power Connections", lambda: PowerPort.objects.filter(
+            _path__destination_id__isnull=False
+        )),
+    )),
+    ("Power", "flash", (
+        ("dcim.view_powerpanel", "Power Panels", PowerPanel.objects.all),
+        ("dcim.view_powerfeed", "Power Feeds", PowerFeed.objects.all),
+    )),
+    ("Wireless", "wifi", (
+        ("wireless.view_wirelesslan", "Wireless LANs", WirelessLAN.objects.all),
+        ("wireless.view_wirelesslink", "Wireless Links", WirelessLink.objects.all),
+    )),
+)
+
+
+def get_permission_scope(user):
+    """
+    Return a mapping of each statistic's permission which has been granted to the user to the constraints under which
+    it has been granted (or None if it is unconstrained). Users with identical scopes are shown the same statistics.
+    """
+    scope = {}
+    for section_label, icon_class, section_items in STATS_SECTIONS:
+        for perm, item_label, get_queryset in section_items:
+            if not user.has_perm(perm):
+                continue
+            if user.is_superuser or permission_is_exempt(perm) or not user._object_perm_cache.get_filter(perm):
+                scope[perm] = None
+            else:
+                scope[perm] = user._object_perm_cache[perm]
+
+    return scope
+
+
+def get_cache_key(scope):
+    digest = hashlib.sha256(json.dumps(scope, sort_keys=True, default=str).encode()).hexdigest()
+    return f'homepage_stats:{digest}'
+
+
+def count_stats(scope):
+    """
+    Count the objects for each statistic within the permission scope, using a single query. Returns a dictionary
+    mapping permission names to counts.
+    """
+    querysets = {}
+    for section_label, icon_class, section_items in STATS_SECTIONS:
+        for perm, item_label, get_queryset in section_items:
+            if perm not in scope:
+                continue
+            queryset = get_queryset()
+            if scope[perm] is not None:
+                # Apply the permission's constraints in the same manner as RestrictedQuerySet.restrict()
+                attrs = PermissionSet(scope).get_filter(perm)
+                queryset = queryset.filter(pk__in=queryset.model.objects.filter(attrs))
+            querysets[perm] = queryset
+
+    if not querysets:
+        return {}
+
+    # Combine a COUNT subquery for each statistic into a single SELECT
+    sql, params = [], []
+    for queryset in querysets.values():
+        subquery = queryset.order_by().annotate(
+            _count=Func(F('pk'), function='COUNT', output_field=BigIntegerField())
+        ).values('_count')
+        subquery_sql, subquery_params = subquery.query.sql_with_params()
+        sql.append(f'({subquery_sql})')
+        params.extend(subquery_params)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {', '.join(sql)}", params)
+        counts = cursor.fetchone()
+
+    return dict(zip(querysets.keys(), counts))
+
+
+def refresh_stats(scope):
+    """
+    Count and cache the statistics for the given permission scope.
+    """
+    counts = count_stats(scope)
+    cache.set(get_cache_key(scope), {'counts': counts, 'updated': time.time()}, STATS_CACHE_MAX_AGE)
+
+    return counts
+
+
+def get_counts(scope):
+    """
+    Return the cached statistics for the given permission scope. Statistics which have not yet been cached are counted
+    immediately; those which are older than STATS_CACHE_TIMEOUT are returned as-is and refreshed in the background.
+    """
+    cache_key = get_cache_key(scope)
+    cached = cache.get(cache_key)
+    if cached is None:
+        return refresh_stats(scope)
+
+    # Enqueue only a single refresh for each scope at a time
+    if time.time() - cached['updated'] > STATS_CACHE_TIMEOUT and cache.add(f'{cache_key}:refresh', True, STATS_CACHE_TIMEOUT):
+        django_rq.get_queue('low').enqueue(refresh_stats, scope)
+
+    return cached['counts']
+
+
+def get_stats(user):
+    """
+    Return the statistics displayed on the home page for the given user, as a list of (section label, items, icon)
+    tuples.
+    """
+    scope = get_permission_scope(user)
+    counts = get_counts(scope)
+
+    stats = []
+    for section_label, icon_class, section_items in STATS_SECTIONS:
+        items = []
+        for perm, item_label, get_queryset in section_items:
+            app, scope_name = perm.split(".")
+            items.append({
+                "label": item_label,
+                "count": counts.get(perm),
+                "url": ":".join((app, scope_name.replace("view_", "") + "_list")),
+                "disabled": perm not in scope,
+                "icon": icon_class,
+            })
+        stats.append((section_label, items, icon_class))
+
+    return stats
@@ -368,7 +368,24 @@ class CustomFieldColumn(tables.Column):
             return f'<a href="{item.get_absolute_url()}">{item}</a>'
         return item
 
-    def render(self, value):
+    def prefetch_objects(self, records):
+        """
+        Retrieve the objects referenced by an object or multi-object field for all the given records at once.
+        """
+        if self.customfield.type in (CustomFieldTypeChoices.TYPE_OBJECT, CustomFieldTypeChoices.TYPE_MULTIOBJECT):
+            self.customfield.prefetch_objects(
+                (getattr(record, 'custom_field_data', None) or {}).get(self.customfield.name) for record in records
+            )
+        self._objects_prefetched = True
+
+    def _deserialize(self, value, table):
+        # Upon rendering the first row, retrieve the referenced objects for the table's current page of rows
+        if not hasattr(self, '_objects_prefetched'):
+            page = getattr(table, 'page', None)
+            self.prefetch_objects([row.record for row in page.object_list] if page else table.data)
+        return self.customfield.deserialize(value)
+
+    def render(self, value, table):
         if self.customfield.type == CustomFieldTypeChoices.TYPE_BOOLEAN and value is True:
             return mark_safe('<i class="mdi mdi-check-bold text-success"></i>')
         if self.customfield.type == CustomFieldTypeChoices.TYPE_BOOLEAN and value is False:
@@ -379,18 +396,18 @@ class CustomFieldColumn(tables.Column):
             return ', '.join(v for v in value)
         if self.customfield.type == CustomFieldTypeChoices.TYPE_MULTIOBJECT:
             return mark_safe(', '.join([
-                self._likify_item(obj) for obj in self.customfield.deserialize(value)
+                self._likify_item(obj) for obj in self._deserialize(value, table)
             ]))
         if value is not None:
-            obj = self.customfield.deserialize(value)
+            obj = self._deserialize(value, table)
             return mark_safe(self._likify_item(obj))
         return self.default
 
-    def value(self, value):
+    def value(self, value, table):
         if isinstance(value, list):
-            return ','.join(str(v) for v in self.customfield.deserialize(value))
+            return ','.join(str(v) for v in self._deserialize(value, table))
         if value is not None:
-            return self.customfield.deserialize(value)
+            return self._deserialize(value, table)
         return self.default
 
 
@@ -1,20 +1,31 @@
+from itertools import islice
+
 import django_tables2 as tables
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist
 from django.db.models.fields.related import RelatedField
+from django.utils.encoding import force_str
+from django.utils.text import Truncator
 from django_tables2.data import TableQuerysetData
+from django_tables2.rows import BoundRow
 
-from extras.models import CustomField, CustomLink
+from extras.models import CachedValue, CustomField, CustomLink
+from netbox.config import get_config
 from netbox.tables import columns
-from utilities.paginator import EnhancedPaginator, get_paginate_count
+from utilities.paginator import EnhancedPaginator, EstimatedCountPaginator, get_paginate_count
+from utilities.utils import estimate_count, iterate_in_chunks
 
 __all__ = (
     'BaseTable',
     'NetBoxTable',
+    'SearchTable',
 )
 
+# Number of objects retrieved at a time when iterating over a table's data for export
+EXPORT_CHUNK_SIZE = 1000
+
 
 class BaseTable(tables.Table):
     """
@@ -114,6 +125,33 @@ class BaseTable(tables.Table):
     def selected_columns(self):
         return self._get_columns(visible=True)
 
+    def iter_values(self, exclude_columns=None):
+        """
+        Return a row iterator of the table data, the first row being the table headers (as with as_values()). The
+        underlying objects are retrieved in chunks, so that the entire table need not be held in memory at once.
+        """
+        exclude_columns = exclude_columns or ()
+        export_columns = [
+            column for column in self.columns.iterall()
+            if not (column.column.exclude_from_export or column.name in exclude_columns)
+        ]
+
+        yield [force_str(column.header, strings_only=True) for column in export_columns]
+
+        custom_field_columns = [
+            column.column for column in export_columns if isinstance(column.column, columns.CustomFieldColumn)
+        ]
+        records = iterate_in_chunks(self.data.data, chunk_size=EXPORT_CHUNK_SIZE)
+        while chunk := list(islice(records, EXPORT_CHUNK_SIZE)):
+            # Resolve any objects referenced by custom fields for the entire chunk at once
+            for column in custom_field_columns:
+                column.prefetch_objects(chunk)
+            for record in chunk:
+                row = BoundRow(record, table=self)
+                yield [
+                    force_str(row.get_cell_value(column.name), strings_only=True) for column in export_columns
+                ]
+
     @property
     def objects_count(self):
         """
@@ -124,6 +162,17 @@ class BaseTable(tables.Table):
             self._objects_count = sum(1 for obj in self.data if hasattr(obj, 'pk'))
         return self._objects_count
 
+    def get_ordering(self, request):
+        """
+        Return the ordering specified as a query parameter or, failing that, the user's preferred ordering for the
+        table (if any).
+        """
+        if self.prefixed_order_by_field in request.GET:
+            return request.GET.getlist(self.prefixed_order_by_field)
+        if request.user.is_authenticated:
+            return request.user.config.get(f'tables.{self.__class__.__name__}.ordering')
+        return None
+
     def configure(self, request):
         """
         Configure the table for a specific request context. This performs pagination and records
@@ -136,7 +185,8 @@ class BaseTable(tables.Table):
                 # If an ordering has been specified as a query parameter, save it as the
                 # user's preferred ordering for this table.
                 ordering = request.GET.getlist(self.prefixed_order_by_field)
-                request.user.config.set(f'tables.{table_name}.ordering', ordering, commit=True)
+                if request.user.config.set(f'tables.{table_name}.ordering', ordering):
+                    request.user.config.save_deferred()
             elif ordering := request.user.config.get(f'tables.{table_name}.ordering'):
                 # If no ordering has been specified, set the preferred ordering (if any).
                 self.order_by = ordering
@@ -146,8 +196,26 @@ class BaseTable(tables.Table):
             'paginator_class': EnhancedPaginator,
             'per_page': get_paginate_count(request)
         }
+        if count := self._get_estimated_count(request):
+            paginate.update({
+                'paginator_class': EstimatedCountPaginator,
+                'count': count,
+            })
         tables.RequestConfig(request, paginate).configure(self)
 
+    def _get_estimated_count(self, request):
+        """
+        Return the estimated number of objects in the table if it exceeds PAGINATE_ESTIMATE_THRESHOLD, in which case
+        the objects are not counted exactly (unless requested by passing `count=exact`).
+        """
+        threshold = get_config().PAGINATE_ESTIMATE_THRESHOLD
+        if not threshold or not isinstance(self.data, TableQuerysetData) or request.GET.get('count') == 'exact':
+            return None
+        count = estimate_count(self.data.data)
+        if count is None or count <= threshold:
+            return None
+        return count
+
 
 class NetBoxTable(BaseTable):
     """
@@ -188,3 +256,34 @@ class NetBoxTable(BaseTable):
         ])
 
         super().__init__(*args, extra_columns=extra_columns, **kwargs)
+
+
+class SearchTable(BaseTable):
+    """
+    Display the results of a global search: each row represents the most relevant match for an object.
+    """
+    object_type = columns.ContentTypeColumn(
+        verbose_name='Type'
+    )
+    object = tables.Column(
+        linkify=True
+    )
+    field = tables.Column()
+    value = tables.Column(
+        verbose_name='Match'
+    )
+
+    class Meta(BaseTable.Meta):
+        model = CachedValue
+        fields = ('object_type', 'object', 'field', 'value')
+        orderable = False
+        empty_text = 'No results found'
+
+    def render_field(self, value, record):
+        try:
+            return record.object_type.model_class()._meta.get_field(value).verbose_name
+        except (AttributeError, FieldDoesNotExist):
+            return value
+
+    def render_value(self, value):
+        return Truncator(value).chars(100)
@@ -1,5 +1,8 @@
+from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
 
+from dcim.models import Site
+from extras.models import CachedValue
 from utilities.testing import APITestCase
 
 
@@ -16,3 +19,27 @@ class AppTest(APITestCase):
         response = self.client.get('{}?format=api'.format(url), **self.header)
 
         self.assertEqual(response.status_code, 200)
+
+
+class SearchTest(APITestCase):
+
+    def test_search_stale_results(self):
+        site = Site.objects.create(name='Site Foo', slug='site-foo')
+        self.add_permissions('dcim.view_site')
+
+        # Index an object which no longer exists
+        CachedValue.objects.create(
+            object_type=ContentType.objects.get_for_model(Site),
+            object_id=site.pk + 1,
+            field='name',
+            value='site foo',
+            weight=100
+        )
+
+        url = reverse('api-search')
+        response = self.client.get(f'{url}?q=foo', **self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['object_id'] for result in response.data['results']], [site.pk])
+
+        # The stale result should have been removed from the index
+        self.assertFalse(CachedValue.objects.filter(object_id=site.pk + 1).exists())
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.contrib.auth.models import Group, User
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.test import Client
 from django.test.utils import override_settings
 from django.urls import reverse
@@ -455,3 +456,59 @@ class ObjectPermissionAPIViewTestCase(TestCase):
                       kwargs={'pk': self.prefixes[0].pk})
         response = self.client.delete(url, format='json', **self.header)
         self.assertEqual(response.status_code, 204)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_cached_permissions_invalidated(self):
+        url = reverse('ipam-api:prefix-list')
+
+        # Assign object permission
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints={'site__name': 'Site 1'},
+            actions=['view']
+        )
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Prefix))
+
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {prefix['id'] for prefix in response.data['results']},
+            {prefix.pk for prefix in self.prefixes[:3]}
+        )
+
+        # Modify the permission's constraints
+        obj_perm.constraints = {'site__name': 'Site 2'}
+        obj_perm.save()
+        response = self.client.get(url, **self.header)
+        self.assertEqual(
+            {prefix['id'] for prefix in response.data['results']},
+            {prefix.pk for prefix in self.prefixes[3:6]}
+        )
+
+        # Unassign the permission from the user
+        obj_perm.users.remove(self.user)
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 403)
+
+        # Assign the permission to a group of which the user is a member
+        group = Group.objects.create(name='Group 1')
+        obj_perm.groups.add(group)
+        self.user.groups.add(group)
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_cached_permissions_invalidated_on_commit(self):
+        """
+        Permissions must be invalidated again once the transaction has been committed, in case a concurrent request has
+        cached them in the meantime.
+        """
+        with self.captureOnCommitCallbacks() as callbacks:
+            ObjectPermission.objects.create(name='Test permission', actions=['view'])
+        version = cache.get('object_permissions_version')
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(cache.get('object_permissions_version'), version)
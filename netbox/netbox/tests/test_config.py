@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.conf import settings
 from django.core.cache import cache
 from django.test import override_settings, TestCase
@@ -66,3 +68,25 @@ class ConfigTestCase(TestCase):
         self.assertEqual(config.version, configrevision.pk)
 
         clear_config()
+
+    @override_settings(CACHES=CACHES)
+    def test_config_reload(self):
+        cache.clear()
+
+        configrevision = ConfigRevision.objects.create(data={'BANNER_TOP': 'A'})
+        configrevision.activate()
+        self.assertEqual(get_config().BANNER_TOP, 'A')
+        clear_config()
+
+        # Simulate the activation of a new revision by another process
+        cache.set('config', {'BANNER_TOP': 'B'}, None)
+        cache.set('config_version', configrevision.pk + 1, None)
+
+        # The new revision should not be detected until the check interval has elapsed
+        with patch('netbox.config.CONFIG_CHECK_INTERVAL', 3600):
+            self.assertEqual(get_config().BANNER_TOP, 'A')
+            clear_config()
+        with patch('netbox.config.CONFIG_CHECK_INTERVAL', 0):
+            self.assertEqual(get_config().BANNER_TOP, 'B')
+            self.assertEqual(get_config().version, configrevision.pk + 1)
+            clear_config()
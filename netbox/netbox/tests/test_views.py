@@ -1,8 +1,15 @@
 import urllib.parse
 
-from utilities.testing import TestCase
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.urls import reverse
 
+from dcim.models import Site
+from extras.models import CachedValue
+from netbox.stats import get_cache_key, get_permission_scope, get_stats
+from users.models import ObjectPermission
+from utilities.testing import TestCase
+
 
 class HomeViewTestCase(TestCase):
 
@@ -13,6 +20,38 @@ class HomeViewTestCase(TestCase):
         response = self.client.get(url)
         self.assertHttpStatus(response, 200)
 
+    def test_home_stats(self):
+        Site.objects.bulk_create((
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+            Site(name='Site 3', slug='site-3'),
+        ))
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints={'name__in': ['Site 1', 'Site 2']},
+            actions=['view']
+        )
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+        cache.delete(get_cache_key(get_permission_scope(self.user)))
+
+        def get_item(label):
+            for section, items, icon in get_stats(self.user):
+                for item in items:
+                    if item['label'] == label:
+                        return item
+
+        # Statistics are limited to the objects the user is permitted to view
+        self.assertEqual(get_item('Sites')['count'], 2)
+        self.assertFalse(get_item('Sites')['disabled'])
+        self.assertIsNone(get_item('Tenants')['count'])
+        self.assertTrue(get_item('Tenants')['disabled'])
+
+        # Statistics are cached
+        Site.objects.filter(name='Site 1').delete()
+        self.assertEqual(get_item('Sites')['count'], 2)
+
     def test_search(self):
 
         url = reverse('search')
@@ -22,3 +61,25 @@ class HomeViewTestCase(TestCase):
 
         response = self.client.get('{}?{}'.format(url, urllib.parse.urlencode(params)))
         self.assertHttpStatus(response, 200)
+
+    def test_search_stale_results(self):
+        site = Site.objects.create(name='Site Foo', slug='site-foo')
+        self.add_permissions('dcim.view_site')
+
+        # Index an object which no longer exists
+        CachedValue.objects.create(
+            object_type=ContentType.objects.get_for_model(Site),
+            object_id=site.pk + 1,
+            field='name',
+            value='site foo',
+            weight=100
+        )
+
+        response = self.client.get(f"{reverse('search')}?q=foo")
+        self.assertHttpStatus(response, 200)
+        self.assertEqual([row.record for row in response.context['table'].paginated_rows], [
+            CachedValue.objects.get(object_id=site.pk, field='name'),
+        ])
+
+        # The stale result should have been removed from the index
+        self.assertFalse(CachedValue.objects.filter(object_id=site.pk + 1).exists())
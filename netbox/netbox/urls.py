@@ -7,7 +7,7 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 
 from extras.plugins.urls import plugin_admin_patterns, plugin_patterns, plugin_api_patterns
-from netbox.api.views import APIRootView, StatusView
+from netbox.api.views import APIRootView, SearchView as APISearchView, StatusView
 from netbox.graphql.schema import schema
 from netbox.graphql.views import GraphQLView
 from netbox.views import HomeView, StaticMediaFailureView, SearchView
@@ -61,6 +61,7 @@ _patterns = [
     path('api/users/', include('users.api.urls')),
     path('api/virtualization/', include('virtualization.api.urls')),
     path('api/wireless/', include('wireless.api.urls')),
+    path('api/search/', APISearchView.as_view(), name='api-search'),
     path('api/status/', StatusView.as_view(), name='api-status'),
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=86400), name='api_docs'),
     path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=86400), name='api_redocs'),
@@ -8,17 +8,24 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db import transaction, IntegrityError
 from django.db.models import ManyToManyField, ProtectedError
-from django.forms import Form, ModelMultipleChoiceField, MultipleHiddenInput
-from django.http import HttpResponse
+from django.forms import Form, ModelForm, ModelMultipleChoiceField, MultipleHiddenInput
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django_tables2.export import TableExport
+from django_rq.queues import get_connection
+from rq import Worker
 
-from extras.models import ExportTemplate
+from extras.exports import get_export_kwargs, render_table_csv, render_yaml, run_export
+from extras.models import ExportTemplate, JobResult
 from extras.signals import clear_webhooks
+from extras.utils import is_taggable
+from netbox.bulk import (
+    BULK_BATCH_SIZE, bulk_create_objects, bulk_update_objects, supports_bulk_create, supports_bulk_update,
+)
 from utilities.error_handlers import handle_protectederror
 from utilities.exceptions import PermissionsViolation
 from utilities.forms import (
-    BootstrapMixin, BulkRenameForm, ConfirmationForm, CSVDataField, CSVFileField, restrict_form_fields,
+    BootstrapMixin, BulkRenameForm, ConfirmationForm, CSVDataField, CSVFileField, resolve_csv_references,
+    restrict_form_fields,
 )
 from utilities.htmx import is_htmx
 from utilities.permissions import get_permission_for_model
@@ -81,15 +88,13 @@ class ObjectListView(BaseMultiObjectView):
 
     def export_yaml(self):
         """
-        Export the queryset of objects as concatenated YAML documents.
+        Export the queryset of objects as concatenated YAML documents. Returns a generator yielding each document.
         """
-        yaml_data = [obj.to_yaml() for obj in self.queryset]
-
-        return '---\n'.join(yaml_data)
+        return render_yaml(self.queryset)
 
     def export_table(self, table, columns=None, filename=None):
         """
-        Export all table data in CSV format.
+        Export all table data in CSV format. The data is streamed to the client one row at a time.
 
         Args:
             table: The Table instance to export
@@ -97,20 +102,11 @@ class ObjectListView(BaseMultiObjectView):
             filename: The name of the file attachment sent to the client. If None, will be determined automatically
                 from the queryset model name.
         """
-        exclude_columns = {'pk', 'actions'}
-        if columns:
-            all_columns = [col_name for col_name, _ in table.selected_columns + table.available_columns]
-            exclude_columns.update({
-                col for col in all_columns if col not in columns
-            })
-        exporter = TableExport(
-            export_format=TableExport.CSV,
-            table=table,
-            exclude_columns=exclude_columns
-        )
-        return exporter.response(
-            filename=filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
-        )
+        response = StreamingHttpResponse(render_table_csv(table, columns), content_type='text/csv; charset=utf-8')
+        filename = filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        return response
 
     def export_template(self, template, request):
         """
@@ -129,6 +125,40 @@ class ObjectListView(BaseMultiObjectView):
             query_params.pop('export')
             return redirect(f'{request.path}?{query_params.urlencode()}')
 
+    def export_background(self, request, filename, **kwargs):
+        """
+        Enqueue a background job to export the current queryset to a file, and redirect the user to its result.
+
+        Args:
+            request: The current request
+            filename: The name of the file to be exported
+            kwargs: Additional arguments passed to run_export() (e.g. the table class or export template)
+        """
+        # Background exports are available only to authenticated users, and only if an RQ worker process is running
+        if not request.user.is_authenticated:
+            error = "Background exports are available only to authenticated users."
+        elif not Worker.count(get_connection('default')):
+            error = "Unable to run export: RQ worker process not running."
+        else:
+            error = None
+        if error:
+            messages.error(request, error)
+            query_params = request.GET.copy()
+            query_params.pop('export')
+            query_params.pop('background')
+            return redirect(f'{request.path}?{query_params.urlencode()}')
+
+        job_result = JobResult.enqueue_job(
+            run_export,
+            filename,
+            ContentType.objects.get_for_model(self.queryset.model),
+            request.user,
+            **get_export_kwargs(self.queryset),
+            **kwargs
+        )
+
+        return redirect('extras:export_result', job_result_pk=job_result.pk)
+
     #
     # Request handlers
     #
@@ -156,27 +186,42 @@ class ObjectListView(BaseMultiObjectView):
         has_bulk_actions = any([a.startswith('bulk_') for a in actions])
 
         if 'export' in request.GET:
+            background = 'background' in request.GET
+            csv_filename = f'netbox_{model._meta.verbose_name_plural}.csv'
 
             # Export the current table view
             if request.GET['export'] == 'table':
                 table = self.get_table(request, has_bulk_actions)
                 columns = [name for name, _ in table.selected_columns]
+                ordering = table.get_ordering(request)
+                if background:
+                    return self.export_background(
+                        request, csv_filename, table_class=self.table, columns=columns, ordering=ordering
+                    )
+                if ordering:
+                    table.order_by = ordering
                 return self.export_table(table, columns)
 
             # Render an ExportTemplate
             elif request.GET['export']:
                 template = get_object_or_404(ExportTemplate, content_type=content_type, name=request.GET['export'])
+                if background:
+                    return self.export_background(request, template.get_filename(model), export_template=template)
                 return self.export_template(template, request)
 
             # Check for YAML export support on the model
             elif hasattr(model, 'to_yaml'):
-                response = HttpResponse(self.export_yaml(), content_type='text/yaml')
                 filename = 'netbox_{}.yaml'.format(self.queryset.model._meta.verbose_name_plural)
+                if background:
+                    return self.export_background(request, filename)
+                response = StreamingHttpResponse(self.export_yaml(), content_type='text/yaml')
                 response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
                 return response
 
             # Fall back to default table/YAML export
             else:
+                if background:
+                    return self.export_background(request, csv_filename, table_class=self.table)
                 table = self.get_table(request, has_bulk_actions)
                 return self.export_table(table)
 
@@ -344,24 +389,84 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
 
         return ImportForm(*args, **kwargs)
 
+    def _get_object_forms(self, headers, records, start, request):
+        """
+        Bind a batch of CSV records to model form instances, resolving the related objects they reference in bulk.
+        Returns a list of (row number, form) tuples.
+        """
+        obj_forms = []
+        for row, data in enumerate(records, start=start):
+            obj_form = self.model_form(data, headers=headers)
+            restrict_form_fields(obj_form, request.user)
+            obj_forms.append((row, obj_form))
+        resolve_csv_references([obj_form for row, obj_form in obj_forms])
+
+        return obj_forms
+
+    def _use_bulk_create(self, headers):
+        """
+        Determine whether validated objects can be created using bulk_create_objects() (see
+        netbox.bulk.supports_bulk_create()), rather than by saving each object individually. This is not possible if
+        the form or view customizes how objects are saved, or if any many-to-many fields are being populated.
+        """
+        model = self.queryset.model
+        if self.model_form.save is not ModelForm.save or type(self)._save_obj is not BulkImportView._save_obj:
+            return False
+        fields = []
+        for name in headers:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_many:
+                return False
+            fields.append(name)
+
+        return supports_bulk_create(model, fields)
+
+    def _bulk_create_objects(self, obj_forms):
+        """
+        Validate all forms within a batch before creating their objects together. Returns the list of created objects,
+        or None if any row is invalid or the objects could not be created.
+        """
+        if not all(obj_form.is_valid() for row, obj_form in obj_forms):
+            return None
+        try:
+            with transaction.atomic():
+                return bulk_create_objects([obj_form.save(commit=False) for row, obj_form in obj_forms])
+        except IntegrityError:
+            # Objects within the batch conflict with one another
+            return None
+
     def _create_objects(self, form, request):
         new_objs = []
         if request.FILES:
             headers, records = form.cleaned_data['csv_file']
         else:
             headers, records = form.cleaned_data['csv']
-
-        for row, data in enumerate(records, start=1):
-            obj_form = self.model_form(data, headers=headers)
-            restrict_form_fields(obj_form, request.user)
-
-            if obj_form.is_valid():
-                obj = self._save_obj(obj_form, request)
-                new_objs.append(obj)
-            else:
-                for field, err in obj_form.errors.items():
-                    form.add_error('csv', f'Row {row} {field}: {err[0]}')
-                raise ValidationError("")
+        use_bulk_create = self._use_bulk_create(headers)
+
+        for i in range(0, len(records), BULK_BATCH_SIZE):
+            batch = records[i:i + BULK_BATCH_SIZE]
+            obj_forms = self._get_object_forms(headers, batch, i + 1, request)
+
+            if use_bulk_create:
+                objects = self._bulk_create_objects(obj_forms)
+                if objects is not None:
+                    new_objs.extend(objects)
+                    continue
+                # Rows may be invalid only in relation to one another (e.g. referencing an object created by an
+                # earlier row), so process the batch again one row at a time to identify any errors.
+                obj_forms = self._get_object_forms(headers, batch, i + 1, request)
+
+            for row, obj_form in obj_forms:
+                if obj_form.is_valid():
+                    obj = self._save_obj(obj_form, request)
+                    new_objs.append(obj)
+                else:
+                    for field, err in obj_form.errors.items():
+                        form.add_error('csv', f'Row {row} {field}: {err[0]}')
+                    raise ValidationError("")
 
         return new_objs
 
@@ -453,62 +558,129 @@ class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
     def get_required_permission(self):
         return get_permission_for_model(self.queryset.model, 'change')
 
-    def _update_objects(self, form, request):
+    def _get_changes(self, form, request):
+        """
+        Return the changes to be applied to each object, as a tuple of three dictionaries mapping field names to
+        values: one each for standard fields, many-to-many fields, and custom fields.
+        """
         custom_fields = getattr(form, 'custom_fields', [])
         standard_fields = [
-            field for field in form.fields if field not in list(custom_fields) + ['pk']
+            field for field in form.fields if field not in list(custom_fields) + ['pk', 'add_tags', 'remove_tags']
         ]
         nullified_fields = request.POST.getlist('_nullify')
+        field_values = {}
+        m2m_values = {}
+        custom_field_values = {}
+
+        # Update standard fields. If a field is listed in _nullify, delete its value.
+        for name in standard_fields:
+
+            try:
+                model_field = self.queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                # This form field is used to modify a field rather than set its value directly
+                model_field = None
+
+            # Handle nullification
+            if name in form.nullable_fields and name in nullified_fields:
+                if isinstance(model_field, ManyToManyField):
+                    m2m_values[name] = []
+                else:
+                    field_values[name] = None if model_field.null else ''
+
+            # ManyToManyFields
+            elif isinstance(model_field, ManyToManyField):
+                if form.cleaned_data[name]:
+                    m2m_values[name] = form.cleaned_data[name]
+            # Normal fields
+            elif name in form.changed_data:
+                field_values[name] = form.cleaned_data[name]
+
+        # Update custom fields
+        for name in custom_fields:
+            assert name.startswith('cf_')
+            cf_name = name[3:]  # Strip cf_ prefix
+            if name in form.nullable_fields and name in nullified_fields:
+                custom_field_values[cf_name] = None
+            elif name in form.changed_data:
+                custom_field_values[cf_name] = form.fields[name].prepare_value(form.cleaned_data[name])
+
+        return field_values, m2m_values, custom_field_values
+
+    def _use_bulk_update(self, field_values, m2m_values):
+        """
+        Determine whether the changes can be written in bulk (see netbox.bulk.supports_bulk_update()), rather than by
+        saving each object individually. Changes to many-to-many fields, or to form fields which do not map directly to
+        concrete model fields, require each object to be saved.
+        """
+        if m2m_values:
+            return False
+        model = self.queryset.model
+        for name in field_values:
+            try:
+                if not model._meta.get_field(name).concrete:
+                    return False
+            except FieldDoesNotExist:
+                return False
+
+        return supports_bulk_update(model, field_values)
+
+    def _update_objects(self, form, request):
+        field_values, m2m_values, custom_field_values = self._get_changes(form, request)
+        add_tags = form.cleaned_data.get('add_tags', None)
+        remove_tags = form.cleaned_data.get('remove_tags', None)
+        objects = self.queryset.filter(pk__in=form.cleaned_data['pk'])
+
+        # Validate and write objects in batches, bypassing save() where possible
+        if self._use_bulk_update(field_values, m2m_values):
+            fields = list(field_values)
+            if custom_field_values:
+                fields.append('custom_field_data')
+            if is_taggable(self.queryset.model()):
+                objects = objects.prefetch_related('tags')
+            pk_list = list(objects.values_list('pk', flat=True))
+            updated_objects = []
+
+            for i in range(0, len(pk_list), BULK_BATCH_SIZE):
+                batch = list(objects.filter(pk__in=pk_list[i:i + BULK_BATCH_SIZE]))
+                for obj in batch:
+                    if hasattr(obj, 'snapshot'):
+                        obj.snapshot()
+                    for name, value in field_values.items():
+                        setattr(obj, name, value)
+                    obj.custom_field_data.update(custom_field_values)
+                    obj.full_clean()
+                tag_changes = {
+                    obj.pk: (add_tags, remove_tags) for obj in batch
+                } if add_tags or remove_tags else None
+                updated_objects.extend(bulk_update_objects(batch, fields, tag_changes=tag_changes))
+
+            return updated_objects
+
         updated_objects = []
 
-        for obj in self.queryset.filter(pk__in=form.cleaned_data['pk']):
+        for obj in objects:
 
             # Take a snapshot of change-logged models
             if hasattr(obj, 'snapshot'):
                 obj.snapshot()
 
-            # Update standard fields. If a field is listed in _nullify, delete its value.
-            for name in standard_fields:
-
-                try:
-                    model_field = self.queryset.model._meta.get_field(name)
-                except FieldDoesNotExist:
-                    # This form field is used to modify a field rather than set its value directly
-                    model_field = None
-
-                # Handle nullification
-                if name in form.nullable_fields and name in nullified_fields:
-                    if isinstance(model_field, ManyToManyField):
-                        getattr(obj, name).set([])
-                    else:
-                        setattr(obj, name, None if model_field.null else '')
-
-                # ManyToManyFields
-                elif isinstance(model_field, ManyToManyField):
-                    if form.cleaned_data[name]:
-                        getattr(obj, name).set(form.cleaned_data[name])
-                # Normal fields
-                elif name in form.changed_data:
-                    setattr(obj, name, form.cleaned_data[name])
-
-            # Update custom fields
-            for name in custom_fields:
-                assert name.startswith('cf_')
-                cf_name = name[3:]  # Strip cf_ prefix
-                if name in form.nullable_fields and name in nullified_fields:
-                    obj.custom_field_data[cf_name] = None
-                elif name in form.changed_data:
-                    obj.custom_field_data[cf_name] = form.fields[name].prepare_value(form.cleaned_data[name])
+            for name, value in field_values.items():
+                setattr(obj, name, value)
+            for name, value in m2m_values.items():
+                getattr(obj, name).set(value)
+            if custom_field_values:
+                obj.custom_field_data.update(custom_field_values)
 
             obj.full_clean()
             obj.save()
             updated_objects.append(obj)
 
             # Add/remove tags
-            if form.cleaned_data.get('add_tags', None):
-                obj.tags.add(*form.cleaned_data['add_tags'])
-            if form.cleaned_data.get('remove_tags', None):
-                obj.tags.remove(*form.cleaned_data['remove_tags'])
+            if add_tags:
+                obj.tags.add(*add_tags)
+            if remove_tags:
+                obj.tags.remove(*remove_tags)
 
         return updated_objects
 
@@ -6,3 +6,15 @@ OBJECTPERMISSION_OBJECT_TYPES = Q(
     Q(app_label='auth', model__in=['group', 'user']) |
     Q(app_label='users', model__in=['objectpermission', 'token'])
 )
+
+# Number of seconds for which an authenticated API token (and its user) is cached
+TOKEN_CACHE_TIMEOUT = 60
+
+# Minimum number of seconds between updates to an API token's last used time
+TOKEN_LAST_USED_INTERVAL = 60
+
+# Minimum number of seconds between writes of a user's preferences to the database when saving is deferred
+USERCONFIG_SAVE_INTERVAL = 60
+
+# Number of seconds for which deferred changes to a user's preferences are held in the cache before being discarded
+USERCONFIG_PENDING_TIMEOUT = 60 * 60 * 24 * 7
@@ -1,16 +1,20 @@
 import binascii
+import hashlib
 import os
 
 from django.contrib.auth.models import Group, User
+from django.contrib.auth.signals import user_logged_out
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
+from django.core.cache import cache
 from django.core.validators import MinLengthValidator
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
 from netbox.config import get_config
+from utilities.permissions import object_permission_cache
 from utilities.querysets import RestrictedQuerySet
 from utilities.utils import flatten_dict
 from .constants import *
@@ -66,6 +70,48 @@ class UserConfig(models.Model):
         ordering = ['user']
         verbose_name = verbose_name_plural = 'User Preferences'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # Apply any changes which have not yet been written to the database (see save_deferred())
+        if 'data' in field_names:
+            pending = cache.get(instance._get_cache_key('pending'))
+            if pending is not None:
+                instance.data = pending
+
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete(self._get_cache_key('pending'))
+
+    def _get_cache_key(self, name):
+        return f'userconfig:{self.pk}:{name}'
+
+    def save_deferred(self):
+        """
+        Save the UserConfig, coalescing frequent changes (e.g. those made while navigating through lists of objects).
+        The data is written to the database at most once every USERCONFIG_SAVE_INTERVAL seconds; changes made in the
+        meantime are held in the cache, where they take effect immediately, until they are written by a subsequent
+        save, upon logout, or by the housekeeping task.
+        """
+        if cache.add(self._get_cache_key('saved'), True, USERCONFIG_SAVE_INTERVAL):
+            self.save()
+        else:
+            cache.set(self._get_cache_key('pending'), self.data, USERCONFIG_PENDING_TIMEOUT)
+
+    def flush(self):
+        """
+        Write any changes deferred by save_deferred() to the database. Returns True if any changes were written.
+        """
+        pending = cache.get(self._get_cache_key('pending'))
+        if pending is None:
+            return False
+        self.data = pending
+        self.save()
+        return True
+
     def get(self, path, default=None):
         """
         Retrieve a configuration parameter specified by its dotted path. Example:
@@ -118,7 +164,10 @@ class UserConfig(models.Model):
 
         :param path: Dotted path to the configuration key. For example, 'foo.bar' sets self.data['foo']['bar'].
         :param value: The value to be written. This can be any type supported by JSON.
-        :param commit: If true, the UserConfig instance will be saved once the new value has been applied.
+        :param commit: If true, the UserConfig instance will be saved once the new value has been applied (unless the
+            value is unchanged).
+
+        Returns True if the value has been changed.
         """
         d = self.data
         keys = path.split('.')
@@ -138,12 +187,16 @@ class UserConfig(models.Model):
         key = keys[-1]
         if key in d and type(d[key]) is dict:
             raise TypeError(f"Key '{path}' has child keys; cannot assign a value")
+        elif key in d and d[key] == value:
+            return False
         else:
             d[key] = value
 
         if commit:
             self.save()
 
+        return True
+
     def clear(self, path, commit=False):
         """
         Delete a configuration parameter specified by its dotted path. The key and any child keys will be deleted.
@@ -172,6 +225,15 @@ class UserConfig(models.Model):
             self.save()
 
 
+@receiver(user_logged_out)
+def flush_userconfig(user, **kwargs):
+    """
+    Write any deferred changes to a user's preferences upon logout.
+    """
+    if user is not None and hasattr(user, 'config'):
+        user.config.flush()
+
+
 @receiver(post_save, sender=User)
 def create_userconfig(instance, created, raw=False, **kwargs):
     """
@@ -203,6 +265,11 @@ class Token(models.Model):
         blank=True,
         null=True
     )
+    last_used = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
     key = models.CharField(
         max_length=40,
         unique=True,
@@ -234,6 +301,11 @@ class Token(models.Model):
         # Generate a random 160-bit key expressed in hexadecimal.
         return binascii.hexlify(os.urandom(20)).decode()
 
+    @staticmethod
+    def get_cache_key(key):
+        # Identify the cached Token by a hash of its key, so that keys are not exposed in the cache
+        return f'api_token:{hashlib.sha256(key.encode()).hexdigest()}'
+
     @property
     def is_expired(self):
         if self.expires is None or timezone.now() < self.expires:
@@ -241,6 +313,44 @@ class Token(models.Model):
         return True
 
 
+def evict_tokens(keys):
+    """
+    Remove the specified Tokens from the authentication cache, both immediately and once the current transaction has
+    been committed (to discard any copy cached by a concurrent request in the meantime).
+    """
+    cache_keys = [Token.get_cache_key(key) for key in keys if key]
+    if cache_keys:
+        cache.delete_many(cache_keys)
+        transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+@receiver(pre_save, sender=Token)
+def record_token_key(instance, **kwargs):
+    """
+    Record a Token's current key prior to saving it, in case the key is being changed.
+    """
+    if instance.pk:
+        instance._original_key = Token.objects.filter(pk=instance.pk).values_list('key', flat=True).first()
+
+
+@receiver((post_save, post_delete), sender=Token)
+def invalidate_token_cache(instance, **kwargs):
+    """
+    Evict a Token from the authentication cache whenever it is modified or deleted.
+    """
+    evict_tokens({instance.key, getattr(instance, '_original_key', None)})
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_token_cache(instance, update_fields=None, **kwargs):
+    """
+    Evict a User's Tokens from the authentication cache whenever the User is modified, except when only recording a
+    login.
+    """
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        evict_tokens(instance.tokens.values_list('key', flat=True))
+
+
 #
 # Permissions
 #
@@ -301,3 +411,26 @@ class ObjectPermission(models.Model):
         if type(self.constraints) is not list:
             return [self.constraints]
         return self.constraints
+
+
+@receiver((post_save, post_delete), sender=ObjectPermission)
+@receiver((post_save, post_delete), sender=Group)
+@receiver(m2m_changed, sender=ObjectPermission.object_types.through)
+@receiver(m2m_changed, sender=ObjectPermission.groups.through)
+@receiver(m2m_changed, sender=ObjectPermission.users.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_object_permission_cache(**kwargs):
+    """
+    Invalidate all cached user permissions whenever an ObjectPermission or group (or an assignment of either) is
+    modified.
+    """
+    object_permission_cache.invalidate()
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_user_permission_cache(update_fields=None, **kwargs):
+    """
+    Invalidate all cached user permissions whenever a user is modified, except when only recording a login.
+    """
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        object_permission_cache.invalidate()
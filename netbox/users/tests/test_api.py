@@ -1,6 +1,7 @@
 from django.contrib.auth.models import Group, User
 from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
+from django.utils import timezone
 
 from users.models import ObjectPermission, Token
 from utilities.testing import APIViewTestCases, APITestCase
@@ -144,6 +145,40 @@ class TokenTest(
         response = self.client.post(url, **self.header, data=data)
         self.assertEqual(response.status_code, 403)
 
+    def test_modified_token_not_cached(self):
+        """
+        Test that changes to a token (or its user) take effect immediately, even though the token has been cached.
+        """
+        url = reverse('users-api:token-list')
+        self.add_permissions('users.view_token')
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, 200)
+
+        # Expire the token
+        self.token.expires = timezone.now()
+        self.token.save()
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, 403)
+
+        # Restore the token, but deactivate its user
+        self.token.expires = None
+        self.token.save()
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, 403)
+
+        # Reactivate the user, and change the token's key
+        self.user.is_active = True
+        self.user.save()
+        old_key = self.token.key
+        self.token.key = Token.generate_key()
+        self.token.save()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {old_key}')
+        self.assertHttpStatus(response, 403)
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertHttpStatus(response, 200)
+
 
 class ObjectPermissionTest(
     # No GraphQL support for ObjectPermission
@@ -1,6 +1,9 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
+from users.models import UserConfig
+
 
 class UserConfigTest(TestCase):
 
@@ -92,6 +95,39 @@ class UserConfigTest(TestCase):
         with self.assertRaises(TypeError):
             userconfig.set('a.x', 1)
 
+    def test_set_unchanged(self):
+        userconfig = self.userconfig
+
+        # Setting an unchanged value should not write to the database
+        with self.assertNumQueries(0):
+            self.assertFalse(userconfig.set('b.foo', 101, commit=True))
+        self.assertTrue(userconfig.set('b.foo', 102))
+
+    def test_save_deferred(self):
+        userconfig = self.userconfig
+        cache.delete(userconfig._get_cache_key('saved'))
+
+        def get_saved_data():
+            return UserConfig.objects.filter(pk=userconfig.pk).values_list('data', flat=True).get()
+
+        # The first change is written immediately
+        userconfig.set('a', 'abc')
+        userconfig.save_deferred()
+        self.assertEqual(get_saved_data()['a'], 'abc')
+
+        # Subsequent changes are held in the cache, but take effect immediately
+        userconfig.set('a', 'def')
+        userconfig.save_deferred()
+        self.assertEqual(get_saved_data()['a'], 'abc')
+        self.assertEqual(UserConfig.objects.get(pk=userconfig.pk).data['a'], 'def')
+
+        # Write the deferred changes
+        self.assertTrue(userconfig.flush())
+        self.assertEqual(get_saved_data()['a'], 'def')
+        self.assertFalse(userconfig.flush())
+
+        cache.delete(userconfig._get_cache_key('saved'))
+
     def test_clear(self):
         userconfig = self.userconfig
 
@@ -67,3 +67,11 @@ HTTP_REQUEST_META_SAFE_COPY = [
     'SERVER_NAME',
     'SERVER_PORT',
 ]
+
+
+#
+# Jinja2 templates
+#
+
+# Maximum number of compiled Jinja2 templates retained by each process (see utilities.utils.Jinja2TemplateCache)
+JINJA2_TEMPLATE_CACHE_SIZE = 1000
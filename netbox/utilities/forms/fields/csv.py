@@ -144,8 +144,20 @@ class CSVModelChoiceField(forms.ModelChoiceField):
     default_error_messages = {
         'invalid_choice': 'Object not found.',
     }
+    # Objects prefetched for a batch of CSV rows (see resolve_csv_references()), mapping each value to a list of the
+    # objects which match it
+    lookup = None
 
     def to_python(self, value):
+        # Resolve the value from the prefetched objects, if possible. Objects which were not found might have been
+        # created since they were prefetched (e.g. by an earlier row), so we fall back to querying for them.
+        if self.lookup is not None and value not in self.empty_values and str(value) in self.lookup:
+            objects = self.lookup[str(value)]
+            if len(objects) > 1:
+                raise forms.ValidationError(
+                    f'"{value}" is not a unique value for this field; multiple objects were found'
+                )
+            return objects[0]
         try:
             return super().to_python(value)
         except MultipleObjectsReturned:
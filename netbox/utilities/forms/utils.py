@@ -1,7 +1,10 @@
 import re
+from collections import defaultdict
 
 from django import forms
 from django.conf import settings
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db.models.constants import LOOKUP_SEP
 from django.forms.models import fields_for_model
 
 from utilities.choices import unpack_grouped_choices
@@ -16,6 +19,7 @@ __all__ = (
     'get_selected_values',
     'parse_alphanumeric_range',
     'parse_numeric_range',
+    'resolve_csv_references',
     'restrict_form_fields',
     'parse_csv',
     'validate_csv',
@@ -183,6 +187,46 @@ def restrict_form_fields(form, user, action='view'):
             field.queryset = field.queryset.restrict(user, action)
 
 
+def resolve_csv_references(forms):
+    """
+    Prefetch the related objects referenced by the CSVModelChoiceFields of a set of bound CSV import forms, using a
+    single query per related queryset rather than one per form. Each field then resolves its value from the prefetched
+    objects when the form is validated.
+    """
+    from .fields import CSVModelChoiceField
+
+    references = {}
+    for form in forms:
+        for name, field in form.fields.items():
+            # Skip fields which resolve their values by other means (e.g. CSVContentTypeField)
+            if type(field).to_python is not CSVModelChoiceField.to_python:
+                continue
+            to_field = field.to_field_name or 'pk'
+            value = field.widget.value_from_datadict(form.data, form.files, form.add_prefix(name))
+            if value in field.empty_values or LOOKUP_SEP in to_field:
+                continue
+
+            # Fields are grouped by their querysets, which may be limited according to each row's data
+            try:
+                key = (to_field, str(field.queryset.query))
+            except EmptyResultSet:
+                continue
+            queryset, values, fields = references.setdefault(key, (field.queryset, set(), []))
+            values.add(str(value))
+            fields.append(field)
+
+    for (to_field, _), (queryset, values, fields) in references.items():
+        lookup = defaultdict(list)
+        try:
+            for obj in queryset.filter(**{f'{to_field}__in': values}):
+                lookup[str(getattr(obj, to_field))].append(obj)
+        except (TypeError, ValueError, ValidationError):
+            # Invalid values will be reported when each form is validated
+            continue
+        for field in fields:
+            field.lookup = lookup
+
+
 def parse_csv(reader):
     """
     Parse a csv_reader object into a headers dictionary and a list of records dictionaries. Raise an error
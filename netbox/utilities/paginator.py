@@ -1,4 +1,4 @@
-from django.core.paginator import Paginator, Page
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator, Page
 
 from netbox.config import get_config
 
@@ -7,6 +7,8 @@ class EnhancedPaginator(Paginator):
     default_page_lengths = (
         25, 50, 100, 250, 500, 1000
     )
+    # Indicates whether the count of objects is an estimate
+    estimated = False
 
     def __init__(self, object_list, per_page, orphans=None, **kwargs):
 
@@ -56,6 +58,74 @@ class EnhancedPage(Page):
         return page_list
 
 
+class EstimatedCountPaginator(EnhancedPaginator):
+    """
+    A paginator for very large lists of objects, which are not counted exactly. Instead, the count is estimated (e.g.
+    from database statistics), and is replaced by the exact count once the final page has been reached. Because the
+    number of pages is not known, only the next and previous pages are navigable from each page.
+
+    :param count: The estimated number of objects
+    """
+    estimated = True
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, orphans=0, **kwargs)
+        self.count = count
+
+    def _get_page(self, *args, **kwargs):
+        return EstimatedCountPage(*args, **kwargs)
+
+    def validate_number(self, number):
+        # The estimated count may be too low, so page numbers are not validated against it
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+
+        # Retrieve one additional object to determine whether a next page exists
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        has_next = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+
+        # Upon reaching the final page, the exact count is known
+        if not has_next and (object_list or number == 1):
+            self.count = bottom + len(object_list)
+            self.estimated = False
+
+        return self._get_page(object_list, number, self, has_next=has_next)
+
+
+class EstimatedCountPage(EnhancedPage):
+
+    def __init__(self, *args, has_next, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return (self.number - 1) * self.paginator.per_page + len(self.object_list)
+
+    def smart_pages(self):
+        # The number of pages is unknown, so only the current page is listed (between the previous & next links)
+        return [self.number]
+
+
 def get_paginate_count(request):
     """
     Determine the desired length of a page, using the following in order:
@@ -77,7 +147,8 @@ def get_paginate_count(request):
         try:
             per_page = int(request.GET.get('per_page'))
             if request.user.is_authenticated:
-                request.user.config.set('pagination.per_page', per_page, commit=True)
+                if request.user.config.set('pagination.per_page', per_page):
+                    request.user.config.save_deferred()
             return _max_allowed(per_page)
         except ValueError:
             pass
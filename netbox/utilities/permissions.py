@@ -1,5 +1,20 @@
+import threading
+import uuid
+from collections import OrderedDict
+
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from netbox.request_context import get_request
+
+# Maximum number of users whose permissions are held in each process's local cache
+OBJECT_PERMISSION_CACHE_SIZE = 1000
+
+# Number of seconds for which a user's permissions are held in the shared cache
+OBJECT_PERMISSION_CACHE_TIMEOUT = 60 * 60
 
 
 def get_permission_for_model(model, action):
@@ -69,3 +84,103 @@ def permission_is_exempt(name):
             return True
 
     return False
+
+
+class PermissionSet(dict):
+    """
+    A mapping of permission names to the lists of constraints under which they have been granted to a user. The query
+    filter compiled for each permission is memoized.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._filters = {}
+
+    def get_filter(self, name):
+        """
+        Return a Q object matching all instances of a model on which the named permission has been granted. An empty Q
+        object indicates that the permission has been granted without constraints.
+        """
+        if name not in self._filters:
+            constraints = Q()
+            for perm_constraints in self.get(name, []):
+                if type(perm_constraints) is list:
+                    for p in perm_constraints:
+                        constraints |= Q(**p)
+                elif perm_constraints:
+                    constraints |= Q(**perm_constraints)
+                else:
+                    # Any permission with null constraints grants access to _all_ instances
+                    constraints = Q()
+                    break
+            self._filters[name] = constraints
+
+        return self._filters[name]
+
+
+class ObjectPermissionCache:
+    """
+    Caches the permissions granted to each user by ObjectPermissions, so that they need not be retrieved from the
+    database for every request. Permissions are stored in the shared cache, and recently used entries are also held in
+    a process-local LRU. Both are keyed by the user's identity and a version which is changed whenever an
+    ObjectPermission, user, or group is modified. Each process checks the version at most once per request.
+    """
+    def __init__(self, maxsize=OBJECT_PERMISSION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.version = None
+        self.request_id = None
+
+    def invalidate(self):
+        """
+        Discard the local cache and signal other processes to do the same, both immediately and once the current
+        transaction has been committed (to discard any permissions cached by a concurrent request in the meantime).
+        """
+        self._invalidate()
+        transaction.on_commit(self._invalidate)
+
+    def _invalidate(self):
+        with self.lock:
+            self.entries.clear()
+        cache.set('object_permissions_version', uuid.uuid4().hex, None)
+
+    def _get_version(self):
+        request = get_request()
+        request_id = getattr(request, 'id', None)
+        if request_id is None or request_id != self.request_id:
+            self.request_id = request_id
+            version = cache.get_or_set('object_permissions_version', uuid.uuid4().hex, None)
+            if version != self.version:
+                with self.lock:
+                    self.entries.clear()
+                self.version = version
+
+        return self.version
+
+    def get(self, key, loader):
+        """
+        Return the PermissionSet identified by key (a string identifying the user and their groups), calling loader()
+        to retrieve a mapping of permission names to constraints if it has not been cached.
+        """
+        version = self._get_version()
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        cache_key = f'object_permissions:{version}:{key}'
+        perms = cache.get(cache_key)
+        if perms is None:
+            perms = dict(loader())
+            cache.set(cache_key, perms, OBJECT_PERMISSION_CACHE_TIMEOUT)
+        perms = PermissionSet(perms)
+
+        with self.lock:
+            self.entries[key] = perms
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+        return perms
+
+
+object_permission_cache = ObjectPermissionCache()
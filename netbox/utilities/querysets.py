@@ -28,20 +28,10 @@ class RestrictedQuerySet(QuerySet):
 
         # Filter the queryset to include only objects with allowed attributes
         else:
-            attrs = Q()
-            for perm_attrs in user._object_perm_cache[permission_required]:
-                if type(perm_attrs) is list:
-                    for p in perm_attrs:
-                        attrs |= Q(**p)
-                elif perm_attrs:
-                    attrs |= Q(**perm_attrs)
-                else:
-                    # Any permission with null constraints grants access to _all_ instances
-                    attrs = Q()
-                    break
-            else:
-                # for else, when no break
-                # avoid duplicates when JOIN on many-to-many fields without using DISTINCT.
+            attrs = user._object_perm_cache.get_filter(permission_required)
+            if attrs:
+                # Any permission with null constraints grants access to _all_ instances (an empty filter).
+                # Otherwise, avoid duplicates when JOIN on many-to-many fields without using DISTINCT.
                 # DISTINCT acts globally on the entire request, which may not be desirable.
                 allowed_objects = self.model.objects.filter(attrs)
                 attrs = Q(pk__in=allowed_objects)
@@ -91,6 +91,8 @@ def export_button(context, model):
         'url_params': context['request'].GET.urlencode() if context['request'].GET else '',
         'export_templates': export_templates,
         'data_format': data_format,
+        # Background exports are recorded against the user who requested them
+        'background_export': user.is_authenticated,
     }
 
 
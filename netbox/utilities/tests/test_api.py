@@ -175,6 +175,26 @@ class APIPaginationTestCase(APITestCase):
         self.assertIsNone(response.data['previous'])
         self.assertEqual(len(response.data['results']), 100)
 
+    def test_keyset_pagination(self):
+        pks = list(Site.objects.order_by('pk').values_list('pk', flat=True))
+
+        # First page
+        response = self.client.get(f'{self.url}?limit=10&after_id=', format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual([site['id'] for site in response.data['results']], pks[:10])
+        self.assertTrue(response.data['next'].endswith(f'?after_id={pks[9]}&limit=10'))
+        self.assertIsNone(response.data['previous'])
+
+        # Last page
+        response = self.client.get(f'{self.url}?limit=10&after_id={pks[89]}', format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual([site['id'] for site in response.data['results']], pks[90:])
+        self.assertIsNone(response.data['next'])
+
+    def test_keyset_pagination_invalid_id(self):
+        response = self.client.get(f'{self.url}?after_id=abc', format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
 
 class APIDocsTestCase(TestCase):
 
@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from utilities.paginator import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    """
+    Validate pagination using an estimated count of objects.
+    """
+    def test_estimate_too_low(self):
+        paginator = EstimatedCountPaginator(list(range(250)), 100, count=150)
+        self.assertTrue(paginator.estimated)
+        self.assertEqual(paginator.count, 150)
+
+        # Pages beyond the estimated count are reachable
+        page = paginator.page(2)
+        self.assertTrue(page.has_previous())
+        self.assertTrue(page.has_next())
+        self.assertEqual(list(page.object_list), list(range(100, 200)))
+        self.assertEqual((page.start_index(), page.end_index()), (101, 200))
+        self.assertEqual(page.next_page_number(), 3)
+        self.assertTrue(paginator.estimated)
+
+        # The exact count is determined upon reaching the final page
+        page = paginator.page(3)
+        self.assertFalse(page.has_next())
+        self.assertEqual((page.start_index(), page.end_index()), (201, 250))
+        self.assertFalse(paginator.estimated)
+        self.assertEqual(paginator.count, 250)
+
+    def test_estimate_too_high(self):
+        paginator = EstimatedCountPaginator(list(range(50)), 100, count=1000)
+        page = paginator.page(1)
+        self.assertFalse(page.has_next())
+        self.assertFalse(paginator.estimated)
+        self.assertEqual(paginator.count, 50)
@@ -1,7 +1,7 @@
 from django.http import QueryDict
 from django.test import TestCase
 
-from utilities.utils import deepmerge, dict_to_filter_params, normalize_querydict
+from utilities.utils import Jinja2TemplateCache, deepmerge, dict_to_filter_params, normalize_querydict
 
 
 class DictToFilterParamsTest(TestCase):
@@ -128,3 +128,36 @@ class DeepMergeTest(TestCase):
             deepmerge(dict1, dict2),
             merged
         )
+
+
+class Jinja2TemplateCacheTest(TestCase):
+    """
+    Validate the caching of compiled Jinja2 templates.
+    """
+    def test_cache_hits_and_misses(self):
+        cache = Jinja2TemplateCache()
+
+        template = cache.get('Hello {{ name }}')
+        self.assertEqual(template.render(name='World'), 'Hello World')
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        # The same source should return the same compiled template
+        self.assertIs(cache.get('Hello {{ name }}'), template)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Modified source should be compiled anew
+        self.assertEqual(cache.get('Goodbye {{ name }}').render(name='World'), 'Goodbye World')
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        cache = Jinja2TemplateCache(max_size=2)
+        cache.get('A')
+        cache.get('B')
+        cache.get('A')
+        cache.get('C')  # Evicts B, the least recently used
+
+        self.assertEqual(len(cache), 2)
+        cache.get('A')
+        self.assertEqual(cache.misses, 3)
+        cache.get('B')
+        self.assertEqual(cache.misses, 4)
@@ -1,20 +1,33 @@
 import datetime
+import hashlib
 import json
+import threading
 from collections import OrderedDict
 from decimal import Decimal
 from itertools import count, groupby
 
 from django.core.serializers import serialize
-from django.db.models import Count, OuterRef, Subquery
+from django.db import DatabaseError, connections
+from django.db.models import Count, OuterRef, QuerySet, Subquery
 from django.db.models.functions import Coalesce
 from django.http import QueryDict
 from jinja2.sandbox import SandboxedEnvironment
 from mptt.models import MPTTModel
+from prometheus_client import Counter
 
 from dcim.choices import CableLengthUnitChoices
 from extras.plugins import PluginConfig
 from extras.utils import is_taggable
-from utilities.constants import HTTP_REQUEST_META_SAFE_COPY
+from utilities.constants import HTTP_REQUEST_META_SAFE_COPY, JINJA2_TEMPLATE_CACHE_SIZE
+
+jinja2_cache_hits = Counter(
+    'netbox_jinja2_template_cache_hits',
+    'Number of Jinja2 templates rendered using a cached compiled template'
+)
+jinja2_cache_misses = Counter(
+    'netbox_jinja2_template_cache_misses',
+    'Number of Jinja2 templates compiled upon being rendered'
+)
 
 
 def get_viewname(model, action=None, rest_api=False):
@@ -253,11 +266,118 @@ def to_meters(length, unit):
     raise ValueError(f"Unknown unit {unit}. Must be 'km', 'm', 'cm', 'mi', 'ft', or 'in'.")
 
 
+class Jinja2TemplateCache:
+    """
+    A least-recently-used cache of compiled Jinja2 templates, all of which are compiled within a single shared sandboxed
+    environment. Templates are keyed by the hash of their source, so a template which has been edited is compiled anew;
+    the stale compiled template is eventually evicted (or removed immediately by clear()).
+
+    :param max_size: The maximum number of compiled templates to retain
+    """
+    def __init__(self, max_size=JINJA2_TEMPLATE_CACHE_SIZE):
+        self.max_size = max_size
+        self.environment = SandboxedEnvironment()
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get(self, template_code):
+        """
+        Return the compiled Template for the given source, compiling it if it has not been cached.
+        """
+        key = hashlib.sha256(template_code.encode()).hexdigest()
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                jinja2_cache_hits.inc()
+                return template
+
+        # Compile the template outside the lock
+        template = self.environment.from_string(source=template_code)
+        with self._lock:
+            self.misses += 1
+            jinja2_cache_misses.inc()
+            self._templates[key] = template
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+
+jinja2_cache = Jinja2TemplateCache()
+
+
 def render_jinja2(template_code, context):
     """
     Render a Jinja2 template with the provided context. Return the rendered content.
     """
-    return SandboxedEnvironment().from_string(source=template_code).render(**context)
+    return jinja2_cache.get(template_code).render(**context)
+
+
+def generate_jinja2(template_code, context):
+    """
+    Render a Jinja2 template with the provided context. Return a generator which yields the rendered content in
+    pieces, so that large outputs need not be held in memory.
+    """
+    return jinja2_cache.get(template_code).generate(**context)
+
+
+def iterate_in_chunks(queryset, chunk_size=1000):
+    """
+    Iterate over the objects in a QuerySet, retrieving them in chunks of the specified size. Unlike
+    QuerySet.iterator(), this preserves the QuerySet's ordering and any prefetched relations, while avoiding holding
+    the entire result set in memory. Iterables which are not QuerySets (or are sliced QuerySets) are iterated as-is.
+    """
+    if not isinstance(queryset, QuerySet) or queryset.query.is_sliced:
+        yield from queryset
+        return
+
+    # Retrieve the ordered PKs of all objects up front, then load the objects themselves one chunk at a time
+    pks = list(queryset.values_list('pk', flat=True))
+    for i in range(0, len(pks), chunk_size):
+        chunk = pks[i:i + chunk_size]
+        objects = {obj.pk: obj for obj in queryset.filter(pk__in=chunk)}
+        for pk in chunk:
+            if pk in objects:
+                yield objects[pk]
+
+
+def estimate_count(queryset):
+    """
+    Return the number of objects in a QuerySet as estimated by PostgreSQL, without counting them. The estimate for an
+    unfiltered QuerySet is taken from the statistics of the model's table (pg_class.reltuples); otherwise it is the
+    number of rows expected by the query planner. Returns None if no estimate is available.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    try:
+        if not queryset.query.has_filters():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [connection.ops.quote_name(queryset.model._meta.db_table)]
+                )
+                row = cursor.fetchone()
+            # reltuples is negative (or zero) if the table has not yet been analyzed
+            if row and row[0] > 0:
+                return row[0]
+
+        plan = json.loads(queryset.explain(format='json'))
+        return plan[0]['Plan']['Plan Rows']
+    except (DatabaseError, KeyError, IndexError, ValueError):
+        return None
 
 
 def prepare_cloned_fields(instance):
@@ -354,6 +474,15 @@ def content_type_identifier(ct):
 # Fake request object
 #
 
+class Echo:
+    """
+    A file-like object which returns the value written to it rather than buffering it. This allows the output of e.g.
+    csv.writer to be streamed one row at a time.
+    """
+    def write(self, value):
+        return value
+
+
 class NetBoxFakeRequest:
     """
     A fake request object which is explicitly defined at the module level so it is able to be pickled. It simply
@@ -363,7 +363,7 @@ class VirtualMachineInterfacesView(generic.ObjectChildrenView):
 
 
 class VirtualMachineConfigContextView(ObjectConfigContextView):
-    queryset = VirtualMachine.objects.annotate_config_context_data()
+    queryset = VirtualMachine.objects.all()
     base_template = 'virtualization/virtualmachine.html'
 
 
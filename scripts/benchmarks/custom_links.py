@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Benchmark the rendering of custom link columns for the device list.
+
+Compares the legacy approach, where a new sandboxed Jinja2 environment is created and each template is compiled anew
+for every row and custom link, with rendering from the shared cache of compiled templates. A database is not
+required; devices are instantiated in memory.
+
+Usage (from the NetBox root directory):
+
+    $ python scripts/benchmarks/custom_links.py [--links 5] [--objects 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'netbox'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'netbox.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from jinja2.sandbox import SandboxedEnvironment  # noqa: E402
+
+from dcim.models import Device  # noqa: E402
+from extras.models import CustomLink  # noqa: E402
+from netbox.tables.columns import CustomLinkColumn  # noqa: E402
+from utilities.utils import jinja2_cache  # noqa: E402
+
+
+def get_custom_links(count):
+    return [
+        CustomLink(
+            name=f'Link {i}',
+            link_text=f'{{% if object.name %}}Link {i} for {{{{ object.name }}}}{{% endif %}}',
+            link_url=f'https://example.com/devices/{{{{ object.name | urlencode }}}}/?link={i}',
+        ) for i in range(1, count + 1)
+    ]
+
+
+def get_devices(count):
+    return [Device(pk=i, name=f'device-{i}') for i in range(1, count + 1)]
+
+
+def legacy(custom_links, devices):
+    for device in devices:
+        context = {'object': device, 'obj': device}
+        for custom_link in custom_links:
+            text = SandboxedEnvironment().from_string(source=custom_link.link_text).render(**context)
+            if text:
+                SandboxedEnvironment().from_string(source=custom_link.link_url).render(**context)
+
+
+def current(custom_links, devices):
+    columns = [CustomLinkColumn(custom_link) for custom_link in custom_links]
+    for device in devices:
+        for column in columns:
+            column.render(device)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--links', type=int, default=5)
+    parser.add_argument('--objects', type=int, default=1000)
+    args = parser.parse_args()
+
+    custom_links = get_custom_links(args.links)
+    devices = get_devices(args.objects)
+    print(f"{args.links} custom links, {args.objects} devices")
+
+    for name, func in (('Legacy (compile per render)', legacy), ('Cached compiled templates', current)):
+        start = time.perf_counter()
+        func(custom_links, devices)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed:.2f}s")
+    print(f"Template cache: {jinja2_cache.hits} hits, {jinja2_cache.misses} misses")
+
+
+if __name__ == '__main__':
+    main()
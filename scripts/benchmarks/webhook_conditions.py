@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Benchmark the evaluation of conditional webhooks for a bulk update.
+
+Compares the legacy approach, where a job is serialized and queued for every (object, webhook) pair and a new
+ConditionSet is compiled by the worker for each job, with evaluating cached, pre-compiled conditions prior to queueing.
+A database and Redis are not required; queueing is approximated by pickling each job's arguments.
+
+Usage (from the NetBox root directory):
+
+    $ python scripts/benchmarks/webhook_conditions.py [--webhooks 50] [--objects 10000]
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'netbox'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'netbox.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from extras.conditions import ConditionSet  # noqa: E402
+from extras.models import Webhook  # noqa: E402
+from extras.webhooks import eval_conditions  # noqa: E402
+
+
+def get_webhooks(count):
+    return [
+        Webhook(
+            pk=i,
+            name=f'Webhook {i}',
+            type_update=True,
+            payload_url='http://localhost/',
+            last_updated=datetime.now(timezone.utc),
+            conditions={
+                'and': [
+                    {'attr': 'status.value', 'value': 'active'},
+                    {'attr': 'name', 'op': 'regex', 'value': rf'^interface-\d*{i % 10}$'},
+                ]
+            }
+        ) for i in range(1, count + 1)
+    ]
+
+
+def get_events(count):
+    return [
+        {
+            'id': i,
+            'name': f'interface-{i}',
+            'status': {'value': 'active' if i % 2 else 'planned', 'label': 'Active' if i % 2 else 'Planned'},
+            'description': 'x' * 100,
+        } for i in range(1, count + 1)
+    ]
+
+
+def legacy(webhooks, events):
+    delivered = 0
+    for data in events:
+        for webhook in webhooks:
+            # Enqueue & dequeue the job
+            job = pickle.loads(pickle.dumps({'webhook': webhook, 'data': data}))
+            # Evaluate conditions in the worker
+            if ConditionSet(job['webhook'].conditions).eval(job['data']):
+                delivered += 1
+    return len(webhooks) * len(events), delivered
+
+
+def current(webhooks, events):
+    queued = 0
+    for data in events:
+        for webhook in webhooks:
+            if eval_conditions(webhook, data):
+                pickle.loads(pickle.dumps({'webhook': webhook, 'data': data}))
+                queued += 1
+    return queued, queued
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--webhooks', type=int, default=50)
+    parser.add_argument('--objects', type=int, default=10000)
+    args = parser.parse_args()
+
+    webhooks = get_webhooks(args.webhooks)
+    events = get_events(args.objects)
+    print(f"{args.webhooks} conditional webhooks, {args.objects} updated objects")
+
+    for name, func in (('Legacy (evaluate in worker)', legacy), ('Pre-compiled (evaluate before queueing)', current)):
+        start = time.perf_counter()
+        queued, delivered = func(webhooks, events)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed:.2f}s, {queued} jobs queued, {delivered} delivered")
+
+
+if __name__ == '__main__':
+    main()
@@ -88,6 +88,11 @@ COMMAND="python3 netbox/manage.py trace_paths --no-input"
 echo "Checking for missing cable paths ($COMMAND)..."
 eval $COMMAND || exit 1
 
+# Build the global search index (lazily, only for object types which have not yet been indexed)
+COMMAND="python3 netbox/manage.py reindex --lazy"
+echo "Building search index ($COMMAND)..."
+eval $COMMAND || exit 1
+
 # Build the local documentation
 COMMAND="mkdocs build"
 echo "Building documentation ($COMMAND)..."